@@ -1,15 +1,28 @@
 import dash
 
-external_stylesheets = ["https://codepen.io/chriddyp/pen/bWLwgP.css"]
+# built assets, compression and caching headers of the server
+from apps import api, assets, httpcache, images, monitoring, profiling, theme
 
 # meta_tags are required for the app layout to be mobile responsive
 app = dash.Dash(
     __name__,
     title="COVID-19 Dashboard",
     suppress_callback_exceptions=True,
-    external_stylesheets=external_stylesheets,
+    assets_ignore=assets.ignored(),
+    compress=False,
     meta_tags=[
         {"name": "viewport", "content": "width=device-width, initial-scale=1.0"}
     ],
 )
+assets.init_app(app)
+# the figure templates, sent once with the page
+theme.init_app(app)
+# request metrics first, so that they see the compressed responses
+monitoring.init_app(app.server)
+httpcache.init_app(app.server)
+profiling.init_app(app.server)
+# figures as png/svg images, for the lite pages and for embedding
+images.init_app(app.server)
+# read-only data of the daily series, /api/series
+api.init_app(app.server)
 server = app.server
@@ -0,0 +1,231 @@
+import collections
+import hashlib
+import json
+import os
+import threading
+
+import flask
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from . import datastore, httpcache, series
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+except ImportError:  # pyarrow is optional, without it there is no arrow output
+    pyarrow = None
+
+# read-only data of the Πανδημία page at /api/series/<name>?from=&to=&resample=
+# &format=, sliced from the date index of each dataset (apps/series.py) and
+# cached per dataset version, with ETags
+URL = "/api/series"
+
+# name -> (dataset, date column, {api column: dataset column}, how the days of
+# a week or month are combined: "sum" for daily counts, "mean" for levels)
+SERIES = {
+    "cases": ("cases_dash", "date", {"new_cases": "new_cases"}, "sum"),
+    "deaths": ("deaths_dash", "date", {"new_deaths": "new_deaths"}, "sum"),
+    "icu": ("icu_dash", "Date", {"icu_admissions": "timi"}, "mean"),
+    "tests": (
+        "tests_dash",
+        "Ημερομηνία",
+        {"pcr_tests": "TEST/ ημέρα", "rapid_tests": "rapid per day"},
+        "sum",
+    ),
+    "positivity": (
+        "thetikotita_dash",
+        "Ημερομηνία",
+        {"positivity": "Θετικότητα ημέρας_1"},
+        "mean",
+    ),
+    "vaccinations": (
+        "vaccinations_dash",
+        "Ημερομηνία",
+        {"first_doses": "1η δόση (ημέρας)", "second_doses": "2η δόση (ημέρας)"},
+        "sum",
+    ),
+}
+
+# resample= values, as pandas rules (those of apps/resample.py)
+RULES = {"day": None, "week": "W-MON", "month": "MS"}
+FORMATS = {
+    "json": "application/json",
+    "csv": "text/csv; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# answers kept per worker, and how long clients may reuse one unchecked
+CACHE_SIZE = int(os.environ.get("API_CACHE_SIZE", 256))
+MAX_AGE = int(os.environ.get("API_MAX_AGE", 300))
+
+
+""" SERIES """
+
+
+# `start` and `end` narrowed to the whole `rule` periods between them, so no
+# week or month is summed over only the days of it that were asked for
+def whole_periods(rule, start, end):
+    offset = to_offset(rule)
+    if start is not None:
+        start = offset.rollforward(pd.Timestamp(start).ceil("D"))
+    if end is not None:
+        day = pd.Timedelta(days=1)
+        end = offset.rollback(pd.Timestamp(end).floor("D") + day) - day
+    return start, end
+
+
+# the rows of a series in [start, end] (None for open ends), as the sum or
+# mean of every week or month with a `rule`
+def frame(name, start=None, end=None, rule=None):
+    dataset, date_column, columns, how = SERIES[name]
+    index = series.table(dataset, date_column)
+    if rule is not None:
+        start, end = whole_periods(rule, start, end)
+    df = index.frame(
+        date_column, index.rows(start, end), rule, how, names=list(columns.values())
+    )
+    return df.rename(columns={date_column: "date", **_renames(columns)})
+
+
+def _renames(columns):
+    return {source: column for column, source in columns.items()}
+
+
+""" FORMATS """
+
+
+# the column holds whole numbers (daily counts), written without decimals
+def _integral(values):
+    present = values[~np.isnan(values)]
+    return np.array_equal(present, np.round(present))
+
+
+# JSON numbers of a column: integers stay integers, missing values are null
+def _json_values(values):
+    present = ~np.isnan(values)
+    if _integral(values):
+        numbers = values.astype(object)
+        numbers[present] = values[present].astype(np.int64)
+    else:
+        numbers = values.astype(object)
+    numbers[~present] = None
+    return numbers.tolist()
+
+
+def to_json(name, df):
+    data = {"date": df["date"].dt.strftime("%Y-%m-%d").tolist()}
+    for column in df.columns[1:]:
+        data[column] = _json_values(df[column].to_numpy())
+    body = {"series": name, "columns": list(df.columns), "data": data}
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def to_csv(name, df):
+    integers = [c for c in df.columns[1:] if _integral(df[c].to_numpy())]
+    df = df.astype({column: "Int64" for column in integers})
+    return df.to_csv(index=False, date_format="%Y-%m-%d").encode()
+
+
+def to_arrow(name, df):
+    arrow_table = pyarrow.Table.from_pandas(df, preserve_index=False)
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, arrow_table.schema) as writer:
+        writer.write_table(arrow_table)
+    return sink.getvalue().to_pybytes()
+
+
+ENCODERS = {"json": to_json, "csv": to_csv, "arrow": to_arrow}
+
+
+""" ENDPOINTS """
+
+_answers = collections.OrderedDict()
+_lock = threading.Lock()
+
+
+def _date(argument):
+    value = flask.request.args.get(argument)
+    if not value:
+        return None
+    try:
+        timestamp = pd.Timestamp(value)
+        # "nan" and "NaT" parse, as a missing date
+        if pd.isna(timestamp):
+            raise ValueError(value)
+        return np.datetime64(timestamp, "ns")
+    except (TypeError, ValueError):
+        flask.abort(400, "{} is not a date: {}".format(argument, value))
+
+
+def _choice(argument, choices, default):
+    value = flask.request.args.get(argument, default)
+    if value not in choices:
+        flask.abort(
+            400, "{} must be one of {}".format(argument, ", ".join(sorted(choices)))
+        )
+    return value
+
+
+# the encoded answer of a query, built once per dataset version
+def answer(key, name, start, end, rule, output):
+    with _lock:
+        body = _answers.get(key)
+        if body is not None:
+            _answers.move_to_end(key)
+            return body
+    body = ENCODERS[output](name, frame(name, start, end, rule))
+    with _lock:
+        _answers[key] = body
+        while len(_answers) > CACHE_SIZE:
+            _answers.popitem(last=False)
+    return body
+
+
+def serve_series(name):
+    if name not in SERIES:
+        flask.abort(404)
+    start, end = _date("from"), _date("to")
+    resample = _choice("resample", RULES, "day")
+    output = _choice("format", FORMATS, "json")
+    if output == "arrow" and pyarrow is None:
+        flask.abort(406, "arrow output needs pyarrow")
+    version = datastore.version(SERIES[name][0])
+    key = (name, version, str(start), str(end), resample, output)
+    # the answer only depends on the query and the dataset version, so the
+    # tag is known before anything is sliced or encoded
+    etag = hashlib.sha1(json.dumps(key).encode()).hexdigest()[:20]
+    response = flask.Response(mimetype=FORMATS[output])
+    response.headers["Cache-Control"] = "public, max-age={}".format(MAX_AGE)
+    response.set_etag(etag)
+    if httpcache.fresh(etag):
+        return httpcache.not_modified(response)
+    response.set_data(answer(key, name, start, end, RULES[resample], output))
+    if output == "csv":
+        response.headers["Content-Disposition"] = "inline; filename={}.csv".format(name)
+    return response
+
+
+# the series, their columns and date span, and the query parameters
+def serve_index():
+    listed = {}
+    for name, (dataset, date_column, columns, how) in SERIES.items():
+        index = series.table(dataset, date_column)
+        listed[name] = {
+            "url": "{}/{}".format(URL, name),
+            "columns": list(columns),
+            "from": index.first and index.first.strftime("%Y-%m-%d"),
+            "to": index.last and index.last.strftime("%Y-%m-%d"),
+            "resample": how,
+            "version": index.version,
+        }
+    formats = [output for output in FORMATS if output != "arrow" or pyarrow]
+    return flask.jsonify(
+        series=listed, resample=list(RULES), formats=formats, parameters=["from", "to"]
+    )
+
+
+def init_app(server):
+    server.add_url_rule(URL, "api_index", serve_index)
+    server.add_url_rule(URL + "/<name>", "api_series", serve_series)
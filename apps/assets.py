@@ -0,0 +1,192 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import pathlib
+import shutil
+import sys
+from io import BytesIO
+
+import dash_html_components as html
+import flask
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+ROOT = pathlib.Path(__file__).parent.joinpath("..").resolve()
+ASSETS_PATH = ROOT.joinpath("assets")
+BUILD_PATH = ROOT.joinpath("build", "assets")
+MANIFEST_PATH = BUILD_PATH.joinpath("manifest.json")
+
+# url prefix of the built files, served with long-lived cache headers
+URL_PREFIX = "/_assets/"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# images resized to the width (px) they are shown at, twice for hi-dpi screens
+IMAGES = {"auth.png": 160, "tmxa.png": 160}
+FAVICON = "favicon.ico"
+FAVICON_SIZES = [(16, 16), (32, 32), (48, 48)]
+STYLESHEETS = ["bWLwgP.css"]
+# formats of the image variants, avif is made when Pillow supports it; png is
+# the fallback of the browsers that take neither
+IMAGE_FORMATS = ["avif", "webp", "png"]
+COMPRESSIBLE = (".css", ".js", ".svg", ".json")
+
+
+""" BUILD """
+
+
+def fingerprinted(name, data):
+    path = pathlib.PurePath(name)
+    return "{}.{}{}".format(path.stem, hashlib.sha1(data).hexdigest()[:10], path.suffix)
+
+
+# write a fingerprinted file, with .gz/.br siblings for text-like formats
+def emit(name, data):
+    target = BUILD_PATH.joinpath(fingerprinted(name, data))
+    target.write_bytes(data)
+    if target.suffix in COMPRESSIBLE:
+        target.with_name(target.name + ".gz").write_bytes(gzip.compress(data, 9))
+        if brotli is not None:
+            target.with_name(target.name + ".br").write_bytes(brotli.compress(data))
+    return target.name
+
+
+def encode_image(image, image_format):
+    buffer = BytesIO()
+    if image_format == "png":
+        image.save(buffer, "PNG", optimize=True)
+    elif image_format == "webp":
+        image.save(buffer, "WEBP", lossless=True, method=6)
+    elif image_format == "avif":
+        image.convert("RGBA").save(buffer, "AVIF", quality=60)
+    else:
+        image.save(buffer, image_format.upper(), sizes=FAVICON_SIZES)
+    return buffer.getvalue()
+
+
+def build():
+    try:
+        from PIL import Image, features
+    except ImportError:
+        sys.exit("The asset build needs Pillow: pip install Pillow")
+
+    shutil.rmtree(BUILD_PATH, ignore_errors=True)
+    BUILD_PATH.mkdir(parents=True)
+    manifest = {}
+
+    for name, width in IMAGES.items():
+        image = Image.open(ASSETS_PATH.joinpath(name)).convert("RGBA")
+        height = round(image.height * width / image.width)
+        # the logos have few colours, a palette keeps them small in every format
+        image = image.resize((width, height), Image.LANCZOS).quantize(256)
+        encoded = {
+            image_format: encode_image(image, image_format)
+            for image_format in IMAGE_FORMATS
+            if image_format == "png" or features.check(image_format)
+        }
+        # smallest first, variants larger than the png are left out
+        manifest[name] = {
+            image_format: emit(
+                str(pathlib.PurePath(name).with_suffix("." + image_format)), data
+            )
+            for image_format, data in sorted(encoded.items(), key=lambda i: len(i[1]))
+            if len(data) < len(encoded["png"]) or image_format == "png"
+        }
+
+    favicon = Image.open(ASSETS_PATH.joinpath(FAVICON)).convert("RGBA")
+    manifest[FAVICON] = emit(FAVICON, encode_image(favicon, "ico"))
+
+    for name in STYLESHEETS:
+        manifest[name] = emit(name, ASSETS_PATH.joinpath(name).read_bytes())
+
+    MANIFEST_PATH.write_text(json.dumps(manifest, indent=2))
+    for path in sorted(BUILD_PATH.iterdir()):
+        print("{:>10}  {}".format(path.stat().st_size, path.name))
+
+
+""" SERVING """
+
+
+def load_manifest():
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+manifest = load_manifest()
+
+
+# url of a built asset, `default` when the asset build has not been run
+def url(name, default=None):
+    built = manifest.get(name)
+    if isinstance(built, dict):
+        built = built.get("png")
+    return URL_PREFIX + built if built else default
+
+
+# an image with its avif/webp variants for the browsers that accept them; the
+# <picture> takes the place (and style) of the <img>
+def picture(name, default, style):
+    variants = manifest.get(name) or {}
+    sources = [
+        html.Source(
+            srcSet=URL_PREFIX + variants[image_format], type="image/" + image_format
+        )
+        for image_format in variants
+        if image_format != "png"
+    ]
+    if not sources:
+        return html.Img(src=url(name, default), style=style)
+    image = html.Img(src=url(name, default), style={"width": "100%"})
+    return html.Picture(sources + [image], style=dict(style, display="block"))
+
+
+# send a built file, precompressed when the client accepts it
+def serve(filename):
+    path = BUILD_PATH.joinpath(filename).resolve()
+    if path.parent != BUILD_PATH or not path.is_file():
+        flask.abort(404)
+    mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    accepted = flask.request.accept_encodings
+    encoding = None
+    for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+        sibling = path.with_name(path.name + suffix)
+        if accepted[candidate] and sibling.is_file():
+            path, encoding = sibling, candidate
+            break
+    response = flask.send_file(path, mimetype=mimetype, conditional=True)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+
+# serve the built assets from `app`: the route, the built stylesheets in place
+# of the ones in assets/, and the small favicon
+def init_app(app):
+    app.server.add_url_rule(URL_PREFIX + "<path:filename>", "built_assets", serve)
+    if not manifest:
+        return
+    app.config.external_stylesheets.extend(url(name) for name in STYLESHEETS)
+    if manifest.get(FAVICON):
+        app.index_string = app.index_string.replace(
+            "{%favicon%}",
+            '<link rel="icon" type="image/x-icon" href="{}">'.format(url(FAVICON)),
+        )
+
+
+# dash serves everything under assets/, these are left out once built
+def ignored():
+    if not manifest:
+        return ""
+    return "|".join(name.replace(".", r"\.") + "$" for name in STYLESHEETS)
+
+
+# python -m apps.assets
+if __name__ == "__main__":
+    build()
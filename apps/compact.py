@@ -0,0 +1,169 @@
+import base64
+import datetime
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import theme
+
+# numeric trace arrays sent as base64 typed arrays ({"dtype", "bdata"}, as in
+# plotly.js >= 2.28) instead of one JSON number per point; dates become epoch
+# milliseconds on a date axis. assets/figure_decode.js, served with every
+# page, decodes them for the bundled plotly.js, so every client reads them;
+# there is no per-client negotiation. FIGURE_ENCODING=json sends plain JSON
+# lists to every client instead, e.g. for other consumers of the callbacks
+BINARY = os.environ.get("FIGURE_ENCODING", "binary") != "json"
+
+# shorter arrays are left as they are, base64 only pays off on long series
+MIN_LENGTH = int(os.environ.get("FIGURE_BINARY_MIN_LENGTH", 32))
+ARRAY_KEYS = ("x", "y", "z")
+
+# smallest integer type holding the values, by plotly.js dtype code
+INTEGER_TYPES = (
+    ("u1", np.uint8),
+    ("i1", np.int8),
+    ("u2", np.uint16),
+    ("i2", np.int16),
+    ("u4", np.uint32),
+    ("i4", np.int32),
+)
+
+
+def _is_date(value):
+    return isinstance(value, (datetime.date, np.datetime64))
+
+
+# the values as a 1-d numeric array and whether they were dates; None for
+# arrays that stay JSON (text, mixed, too short)
+def numeric(values):
+    if not isinstance(values, (np.ndarray, list, tuple, pd.Series)):
+        return None, False
+    values = np.asarray(values)
+    if values.ndim != 1 or len(values) < MIN_LENGTH:
+        return None, False
+    if values.dtype.kind == "O":
+        present = values[pd.notna(values)]
+        if len(present) == 0 or not all(_is_date(v) for v in present):
+            return None, False
+        values = pd.to_datetime(values).to_numpy()
+    if values.dtype.kind == "M":
+        dates = values.astype("datetime64[ms]")
+        result = dates.astype(np.int64).astype(np.float64)
+        result[np.isnat(dates)] = np.nan
+        return result, True
+    if values.dtype.kind in "biuf":
+        return values, False
+    return None, False
+
+
+def _bdata(values, dtype):
+    return base64.b64encode(values.astype(dtype).tobytes()).decode()
+
+
+# {"dtype", "bdata"} of a numeric array: integers in the smallest integer
+# type, floats as float32 when that is exact; None for other floats, whose
+# base64 float64 bytes compress worse (br, gzip) than their JSON digits
+def typed_array(values):
+    values = np.asarray(values, dtype=np.float64)
+    finite = np.isfinite(values)
+    if len(values) and finite.all() and np.array_equal(values, np.round(values)):
+        low, high = values.min(), values.max()
+        for code, dtype in INTEGER_TYPES:
+            info = np.iinfo(dtype)
+            if info.min <= low and high <= info.max:
+                return {
+                    "dtype": code,
+                    "bdata": _bdata(values, np.dtype(dtype).newbyteorder("<")),
+                }
+    if np.array_equal(values.astype(np.float32), values, equal_nan=True):
+        return {"dtype": "f4", "bdata": _bdata(values, "<f4")}
+    return None
+
+
+# per-point arrays of a trace other than x/y, which x0/dx would not keep
+def _other_arrays(trace, length):
+    values = list(trace.items()) + list((trace.get("marker") or {}).items())
+    return any(
+        key not in ("x", "y")
+        and isinstance(value, (np.ndarray, list, tuple))
+        and len(value) == length
+        for key, value in values
+    )
+
+
+# evenly spaced dates (a daily series) as x0/dx, the missing dates dropped
+# together with their points, which plotly would not draw anyway
+def regular_dates(trace, dates):
+    present = ~np.isnan(dates)
+    steps = np.diff(dates[present])
+    if len(steps) == 0 or not (steps == steps[0]).all() or steps[0] <= 0:
+        return False
+    if _other_arrays(trace, len(dates)):
+        return False
+    y = trace.get("y")
+    if y is not None:
+        if len(y) != len(dates):
+            return False
+        trace["y"] = np.asarray(y)[present]
+    start = pd.Timestamp(dates[present][0], unit="ms")
+    trace["x0"] = start.strftime("%Y-%m-%d %H:%M:%S")
+    trace["dx"] = float(steps[0])
+    del trace["x"]
+    return True
+
+
+def axis_name(reference, letter):
+    # "x" -> "xaxis", "x2" -> "xaxis2"
+    return "{}axis{}".format(letter, (reference or letter)[1:])
+
+
+# long numeric arrays of a trace as typed arrays; returns the axes that now
+# carry dates as numbers
+def encode_trace(trace):
+    date_axes = set()
+    for key in ARRAY_KEYS:
+        values, dates = numeric(trace.get(key))
+        if values is None:
+            continue
+        if dates and key == "x" and regular_dates(trace, values):
+            date_axes.add(axis_name(trace.get("xaxis"), "x"))
+            continue
+        encoded = typed_array(values)
+        if encoded is None:
+            continue
+        if dates and key in ("x", "y"):
+            date_axes.add(axis_name(trace.get(key + "axis"), key))
+        trace[key] = encoded
+    return date_axes
+
+
+# plotly JSON of `figure` with its long numeric arrays as typed arrays and
+# its template by name
+def encode_figure(figure):
+    if not hasattr(figure, "to_dict"):
+        return figure
+    figure = theme.reference(figure.to_dict())
+    if not BINARY:
+        return figure
+    date_axes = set()
+    for trace in figure.get("data", []):
+        date_axes |= encode_trace(trace)
+    layout = figure.setdefault("layout", {})
+    for axis in date_axes:
+        # numbers on an axis plotly would otherwise guess from date strings
+        layout.setdefault(axis, {}).setdefault("type", "date")
+    return figure
+
+
+# plain plotly JSON of an encoded figure (typed arrays as numpy arrays, the
+# template put back), for renderers without assets/figure_decode.js
+def decode_figure(figure):
+    figure = theme.resolve(figure)
+    for trace in figure.get("data", []):
+        for key in ARRAY_KEYS:
+            value = trace.get(key)
+            if isinstance(value, dict) and "bdata" in value:
+                dtype = np.dtype(value["dtype"]).newbyteorder("<")
+                trace[key] = np.frombuffer(base64.b64decode(value["bdata"]), dtype)
+    return figure
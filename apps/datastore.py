@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+import pathlib
+import re
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from . import profiling
+from .utils import DATA_PATH
+
+# columnar copies of the csv files, one .npy file per column
+STORE_PATH = pathlib.Path(
+    os.environ.get("DATASTORE_PATH", DATA_PATH.joinpath(".store"))
+).resolve()
+
+# date columns of the daily series, parsed when they hold unique ISO dates;
+# repeated dates are category labels (e.g. the year of a bar group) and stay text
+DATE_COLUMNS = ("date", "Date", "Ημερομηνία")
+ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# unnamed label columns given a proper name, per dataset
+RENAMES = {
+    "erwtisi_2": {"Unnamed: 0": "apantisi"},
+}
+
+
+def dataset_name(name):
+    return pathlib.Path(name).stem
+
+
+def source_path(name):
+    return DATA_PATH.joinpath(dataset_name(name) + ".csv")
+
+
+def file_hash(path):
+    return hashlib.sha1(pathlib.Path(path).read_bytes()).hexdigest()
+
+
+# read a csv and normalize it: stripped column names, no row-number column,
+# named label columns and parsed dates
+def read_source(name):
+    name = dataset_name(name)
+    df = pd.read_csv(source_path(name), encoding="utf-8-sig")
+    df.columns = [str(c).strip() for c in df.columns]
+    first = df.columns[0]
+    if first.startswith("Unnamed") and pd.api.types.is_integer_dtype(df[first]):
+        df = df.drop(columns=first)
+    df = df.rename(columns=RENAMES.get(name, {}))
+    for column in DATE_COLUMNS:
+        if column in df and df[column].dtype == object:
+            values = df[column].dropna().astype(str).str.strip()
+            if values.is_unique and len(values) and values.str.match(ISO_DATE).all():
+                df[column] = pd.to_datetime(df[column].str.strip())
+    return df
+
+
+def _meta_path(name):
+    return STORE_PATH.joinpath(name, "meta.json")
+
+
+def _read_meta(name):
+    try:
+        return json.loads(_meta_path(name).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+# convert one csv into the store; each version is written into its own
+# directory and published by atomically replacing meta.json
+def ingest(name):
+    name = dataset_name(name)
+    source = source_path(name)
+    stat = source.stat()
+    sha1 = file_hash(source)
+    df = read_source(name)
+
+    STORE_PATH.joinpath(name).mkdir(parents=True, exist_ok=True)
+    tmp_dir = pathlib.Path(tempfile.mkdtemp(prefix=".tmp-", dir=STORE_PATH / name))
+    columns = []
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        entry = {"name": column, "file": "c{}.npy".format(i)}
+        if values.dtype == object:
+            entry["mask"] = "c{}.mask.npy".format(i)
+            np.save(tmp_dir.joinpath(entry["mask"]), values.isna().to_numpy())
+            array = values.fillna("").astype(str).to_numpy().astype("U")
+        else:
+            array = values.to_numpy()
+        np.save(tmp_dir.joinpath(entry["file"]), array)
+        columns.append(entry)
+    try:
+        os.rename(tmp_dir, STORE_PATH.joinpath(name, sha1[:12]))
+    except OSError:  # another worker already wrote this version
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    meta = {
+        "source": {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": sha1},
+        "version": sha1[:12],
+        "rows": len(df),
+        "columns": columns,
+    }
+    _write_meta(name, meta)
+    _prune(name, meta["version"])
+    return meta
+
+
+def _write_meta(name, meta):
+    path = _meta_path(name)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+# remove older versions, leaving the current one, the one before it (other
+# workers may still be loading it) and any still being written
+def _prune(name, keep):
+    versions = [
+        path
+        for path in STORE_PATH.joinpath(name).iterdir()
+        if path.is_dir() and path.name != keep and not path.name.startswith(".")
+    ]
+    versions.sort(key=lambda path: path.stat().st_mtime_ns, reverse=True)
+    for path in versions[1:]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+# meta of the stored version, re-ingesting when the csv changed since
+def _current_meta(name):
+    meta = _read_meta(name)
+    stat = source_path(name).stat()
+    if meta is not None:
+        source = meta["source"]
+        if (source["mtime_ns"], source["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return meta
+        # touched but unchanged content keeps the stored version
+        if source["sha1"] == file_hash(source_path(name)):
+            source["mtime_ns"], source["size"] = stat.st_mtime_ns, stat.st_size
+            _write_meta(name, meta)
+            return meta
+    return ingest(name)
+
+
+# version of a dataset, the hash prefix of its csv
+def version(name):
+    name = dataset_name(name)
+    try:
+        return _current_meta(name)["version"]
+    except OSError:
+        return file_hash(source_path(name))[:12]
+
+
+# load a dataset; columns are memory-mapped from the store so nothing is
+# parsed, and the csv is read directly when the store cannot be written
+@profiling.timed("dataset", label=dataset_name)
+def load(name):
+    name = dataset_name(name)
+    try:
+        meta = _current_meta(name)
+    except OSError:
+        return read_source(name)
+    try:
+        return _load_version(name, meta)
+    except FileNotFoundError:  # pruned meanwhile, read the meta published since
+        return _load_version(name, _current_meta(name))
+
+
+def _load_version(name, meta):
+    version_dir = STORE_PATH.joinpath(name, meta["version"])
+    data = {}
+    for entry in meta["columns"]:
+        values = np.load(version_dir.joinpath(entry["file"]), mmap_mode="r")
+        if "mask" in entry:
+            values = values.astype(object)
+            values[np.load(version_dir.joinpath(entry["mask"]))] = np.nan
+        data[entry["name"]] = values
+    return pd.DataFrame(data, columns=[entry["name"] for entry in meta["columns"]])
+
+
+def ingest_all():
+    for source in sorted(DATA_PATH.glob("*.csv")):
+        meta = ingest(source.stem)
+        print("{}: {} rows -> {}".format(source.name, meta["rows"], meta["version"]))
+
+
+# python -m apps.datastore [dataset ...]
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for name in sys.argv[1:]:
+            ingest(name)
+    else:
+        ingest_all()
@@ -0,0 +1,152 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import datastore
+
+""" VECTORIZED METRICS """
+
+# all metrics take float arrays (NaN for missing days) and return an array of
+# the same length; windows follow pandas: NaN until `window` values are seen
+
+
+def _window_sums(values, window):
+    present = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(present)))
+    start = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+    end = np.arange(1, len(values) + 1)
+    return sums[end] - sums[start], counts[end] - counts[start]
+
+
+def rolling_sum(values, window=7):
+    sums, counts = _window_sums(values, window)
+    return np.where(counts >= window, sums, np.nan)
+
+
+def rolling_mean(values, window=7):
+    sums, counts = _window_sums(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(counts >= window, sums / counts, np.nan)
+
+
+# running total, missing days count as zero
+def cumulative(values, window=None):
+    return np.cumsum(np.where(np.isnan(values), 0.0, values))
+
+
+# share of the numerator in the denominator, e.g. positivity = cases / tests
+def ratio(numerator, denominator):
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+# change of the `window`-day total against the `window` days before it
+def week_over_week(values, window=7):
+    totals = rolling_sum(values, window)
+    previous = np.concatenate((np.full(window, np.nan), totals[:-window]))
+    return ratio(totals - previous, previous[: len(totals)])
+
+
+# metric -> (function, rows of history a new row depends on); None for the
+# running totals, which carry on from the last cached one
+METRICS = {
+    "rolling_sum": (rolling_sum, lambda window: window - 1),
+    "rolling_mean": (rolling_mean, lambda window: window - 1),
+    "cumulative": (cumulative, None),
+    "week_over_week": (week_over_week, lambda window: 2 * window - 1),
+}
+
+
+""" CACHE PER DATASET VERSION """
+
+
+# a computed metric of one dataset, with what is needed to extend it
+class Entry:
+    def __init__(self, version, dates, inputs, result):
+        self.version = version
+        self.dates = dates
+        self.inputs = inputs
+        self.result = result
+
+
+_cache = {}
+_lock = threading.Lock()
+
+
+# columns summed into one series (missing days as zero unless all are missing)
+def _inputs(df, columns):
+    values = df[list(columns)].astype(float)
+    return values.sum(axis=1, min_count=1).to_numpy()
+
+
+# the new version only appended days to the cached one: every cached row is
+# unchanged, a revised older day makes the whole result recomputed
+def _appended(entry, dates, inputs):
+    n = len(entry.dates)
+    if len(dates) < n or n == 0:
+        return False
+    return np.array_equal(dates[:n], entry.dates) and np.array_equal(
+        inputs[:, :n], entry.inputs, equal_nan=True
+    )
+
+
+def _compute(metric, inputs, window):
+    return METRICS[metric][0](inputs[0], window)
+
+
+# extend a cached result with the appended rows, recomputing only them and the
+# history they depend on
+def _extend(entry, metric, inputs, window):
+    n = len(entry.dates)
+    history = METRICS[metric][1]
+    if history is None:
+        return np.concatenate(
+            (entry.result, _compute(metric, [inputs[0][n:]], window) + entry.result[-1])
+        )
+    start = max(n - history(window), 0)
+    tail = _compute(metric, [values[start:] for values in inputs], window)
+    return np.concatenate((entry.result, tail[n - start :]))
+
+
+# metric over columns of a daily dataset, as a series indexed by date; each
+# argument of `columns` is a column name or a tuple of columns to add up;
+# results are cached per dataset version and extended when days are appended
+# to the csv
+def series(dataset, date_column, metric, *columns, window=7):
+    name = datastore.dataset_name(dataset)
+    key = (name, date_column, metric, columns, window)
+    version = datastore.version(name)
+    entry = _cache.get(key)
+    if entry is None or entry.version != version:
+        df = datastore.load(name)
+        dates = df[date_column].to_numpy()
+        inputs = [
+            _inputs(df, column if isinstance(column, tuple) else (column,))
+            for column in columns
+        ]
+        stacked = np.vstack(inputs)
+        if entry is not None and _appended(entry, dates, stacked):
+            result = _extend(entry, metric, inputs, window)
+        else:
+            result = _compute(metric, inputs, window)
+        entry = Entry(version, dates, stacked, result)
+        with _lock:
+            _cache[key] = entry
+    return pd.Series(entry.result, index=pd.Index(entry.dates, name=date_column))
+
+
+# positivity: new cases over the PCR and rapid tests of the same days, as
+# `window`-day totals
+def positivity(window=7):
+    cases = series("cases_dash", "date", "rolling_sum", "new_cases", window=window)
+    tests = series(
+        "tests_dash",
+        "Ημερομηνία",
+        "rolling_sum",
+        ("TEST/ ημέρα", "rapid per day"),
+        window=window,
+    )
+    cases, tests = cases.align(tests, join="inner")
+    return pd.Series(ratio(cases.to_numpy(), tests.to_numpy()), index=cases.index)
@@ -0,0 +1,316 @@
+import os
+import pathlib
+import re
+import sys
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import datastore
+from .utils import DATA_PATH
+
+# raw Eurostat bulk downloads (datasets/eurostat/<dataflow>.tsv[.gz] or the
+# SDMX-CSV <dataflow>.csv[.gz]) read into tidy tables: one row per series and
+# period, with the dimension columns, TIME_PERIOD, period, OBS_VALUE and
+# OBS_FLAG. Parsed tables are cached per file hash; the EXTRACTS below turn
+# them into the datasets of the Οικονομία page, so a new download dropped in
+# the folder is all an update takes
+SOURCE_PATH = pathlib.Path(
+    os.environ.get("EUROSTAT_PATH", DATA_PATH.joinpath("eurostat"))
+)
+CACHE_PATH = datastore.STORE_PATH.joinpath("eurostat")
+SUFFIXES = (".tsv", ".tsv.gz", ".csv", ".csv.gz")
+
+# columns of every tidy table besides the dimensions
+TIME, PERIOD, VALUE, FLAG = "TIME_PERIOD", "period", "OBS_VALUE", "OBS_FLAG"
+# SDMX-CSV columns that are not dimensions of the series
+SDMX_EXTRA = ("DATAFLOW", "LAST UPDATE", "STRUCTURE", "STRUCTURE_ID", "CONFIG")
+
+# a cell of the TSV format: the value (":" when missing) and its flags, e.g.
+# "45682.0", "1.2 p", ": c"
+CELL = r"^(\S*?)\s*([a-z]*)$"
+# periods: "2020", "2020-Q1" / "2020Q1", "2020-S1", "2020-03" / "2020M03"
+PERIOD_LABEL = r"^(\d{4})(?:-?([QSM]?)(\d{1,2}))?$"
+MONTHS_PER = {"Q": 3, "S": 6, "M": 1, "": 1}
+
+# months between a period and the one it is compared with
+LAGS = {"yoy": 12, "qoq": 3, "mom": 1}
+
+
+""" PARSING """
+
+
+# first day of every period label, each distinct label parsed once
+def period_start(labels):
+    labels = pd.Series(labels, dtype=object)
+    codes, uniques = pd.factorize(labels.astype(str).str.strip())
+    parts = pd.Series(uniques, dtype=object).str.extract(PERIOD_LABEL)
+    number = pd.to_numeric(parts[2]).fillna(1).astype(int)
+    kind = parts[1].fillna("")
+    month = (number - 1) * kind.map(MONTHS_PER).fillna(1).astype(int) + 1
+    starts = pd.to_datetime(
+        dict(year=pd.to_numeric(parts[0]), month=month, day=1), errors="coerce"
+    )
+    # daily periods are plain dates
+    days = starts.isna()
+    starts[days] = pd.to_datetime(pd.Series(uniques)[days], errors="coerce")
+    return pd.DatetimeIndex(starts.to_numpy()[codes])
+
+
+# values and flags of the cells, each distinct cell parsed once
+def split_cells(cells):
+    codes, uniques = pd.factorize(cells)
+    parts = pd.Series(uniques, dtype=object).str.strip().str.extract(CELL)
+    values = pd.to_numeric(parts[0].where(parts[0] != ":"), errors="coerce")
+    flags = pd.Categorical(parts[1].fillna(""))
+    return (
+        values.to_numpy(dtype=np.float64)[codes],
+        pd.Categorical.from_codes(flags.codes[codes], flags.categories),
+    )
+
+
+# the TSV format: one row per series, its dimensions joined in the first
+# column ("freq,unit,geo\TIME_PERIOD"), one column per period
+def read_tsv(path):
+    df = pd.read_csv(path, sep="\t", dtype=str, keep_default_na=False)
+    key = df.columns[0]
+    dimensions = re.split(r"[,;]", key.split("\\")[0].strip())
+    keys = df[key].str.split(r"[,;]", expand=True)
+    periods = [str(column).strip() for column in df.columns[1:]]
+    cells = df.iloc[:, 1:].to_numpy(dtype=object)
+    rows, width = cells.shape
+    data = {}
+    for i, dimension in enumerate(dimensions):
+        codes, uniques = pd.factorize(keys[i].str.strip())
+        data[dimension] = pd.Categorical.from_codes(np.repeat(codes, width), uniques)
+    data[TIME] = pd.Categorical.from_codes(
+        np.tile(np.arange(width), rows), pd.Index(periods)
+    )
+    data[PERIOD] = np.tile(period_start(periods).to_numpy(), rows)
+    data[VALUE], data[FLAG] = split_cells(cells.ravel())
+    return pd.DataFrame(data)
+
+
+# the SDMX-CSV format, already one row per observation
+def read_sdmx_csv(path):
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    df = df.drop(columns=[c for c in SDMX_EXTRA if c in df])
+    dimensions = [c for c in df.columns if c not in (TIME, VALUE, FLAG)]
+    data = {c: pd.Categorical(df[c].astype(str).str.strip()) for c in dimensions}
+    data[TIME] = pd.Categorical(df[TIME].astype(str).str.strip())
+    data[PERIOD] = period_start(data[TIME]).to_numpy()
+    data[VALUE] = pd.to_numeric(df[VALUE], errors="coerce").to_numpy()
+    flags = df[FLAG].astype(str).str.strip() if FLAG in df else ""
+    data[FLAG] = pd.Categorical(np.broadcast_to(flags, len(df)))
+    return pd.DataFrame(data)
+
+
+def parse(path):
+    path = pathlib.Path(path)
+    if path.name.endswith((".tsv", ".tsv.gz")):
+        return read_tsv(path)
+    return read_sdmx_csv(path)
+
+
+""" CACHE """
+
+# sha1 of each source per (mtime, size), so unchanged files are not read again
+_hashes = {}
+_lock = threading.Lock()
+
+
+def source_hash(path):
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        sha1 = _hashes.get(key)
+    if sha1 is None:
+        sha1 = datastore.file_hash(path)
+        with _lock:
+            _hashes[key] = sha1
+    return sha1
+
+
+# the downloaded file of a dataflow, e.g. "namq_10_gdp"
+def source(dataflow):
+    for suffix in SUFFIXES:
+        path = SOURCE_PATH.joinpath(dataflow + suffix)
+        if path.exists():
+            return path
+    return None
+
+
+def _cache_file(dataflow, sha1):
+    return CACHE_PATH.joinpath("{}-{}.pkl".format(dataflow, sha1[:12]))
+
+
+# the tidy table of a dataflow, parsed once per content of its file
+def read(dataflow):
+    path = source(dataflow)
+    if path is None:
+        raise FileNotFoundError(SOURCE_PATH.joinpath(dataflow + SUFFIXES[0]))
+    cached = _cache_file(dataflow, source_hash(path))
+    try:
+        return pd.read_pickle(cached)
+    except (OSError, ValueError, EOFError):
+        pass
+    df = parse(path)
+    try:
+        CACHE_PATH.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=CACHE_PATH, suffix=".tmp")
+        os.close(fd)
+        df.to_pickle(tmp)
+        os.replace(tmp, cached)
+        for path in CACHE_PATH.glob(dataflow + "-*.pkl"):
+            if path != cached:
+                path.unlink()
+    except OSError:  # a read-only store, parsed again next time
+        pass
+    return df
+
+
+""" TABLES """
+
+
+def dimensions(df):
+    return [c for c in df.columns if c not in (TIME, PERIOD, VALUE, FLAG)]
+
+
+# rows whose dimensions match `filters`, e.g. geo="EL" or age=["TOTAL", "Y_LT25"],
+# from the period `start` on
+def select(df, start=None, **filters):
+    mask = np.ones(len(df), dtype=bool)
+    for dimension, value in filters.items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        mask &= df[dimension].isin(values).to_numpy()
+    if start is not None:
+        mask &= (df[PERIOD] >= pd.Timestamp(start)).to_numpy()
+    df = df[mask].sort_values(dimensions(df) + [PERIOD], kind="stable")
+    for dimension in dimensions(df):
+        df[dimension] = df[dimension].cat.remove_unused_categories()
+    return df.reset_index(drop=True)
+
+
+# the series as columns (one per value of `columns`) by period
+def pivot(df, columns, index=PERIOD):
+    return df.pivot_table(
+        index=index, columns=columns, values=VALUE, aggfunc="first", observed=True
+    )
+
+
+# percent change of every row against the same series `lag` ("yoy", "qoq",
+# "mom") earlier, matched on the periods so gaps give NaN
+def change(df, lag="yoy"):
+    keys = dimensions(df)
+    previous = df[keys + [PERIOD, VALUE]].rename(columns={VALUE: "previous"})
+    previous[PERIOD] = previous[PERIOD] + pd.DateOffset(months=LAGS[lag])
+    merged = df[keys + [PERIOD, VALUE]].merge(previous, on=keys + [PERIOD], how="left")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        changes = (merged[VALUE] / merged["previous"] - 1) * 100
+    return pd.Series(changes.to_numpy(), index=df.index)
+
+
+# the dimensions of each row joined as in the key column, "M;RCH_A;CP00;EL"
+def series_key(df):
+    keys = [df[dimension].astype(str) for dimension in dimensions(df)]
+    return keys[0].str.cat(keys[1:], sep=";")
+
+
+""" EXTRACTS """
+
+
+# quarterly GDP by year, with the change against the same quarter a year before
+def gdp_quarters(df):
+    return pd.DataFrame(
+        {
+            "quarter": "Q" + ((df[PERIOD].dt.month - 1) // 3 + 1).astype(str),
+            "year": df[PERIOD].dt.strftime("%Y-01-01"),
+            "OBS_VALUE": df[VALUE],
+            "metavoli": change(df, "yoy").round(1),
+        }
+    )
+
+
+def monthly(label):
+    def extract(df):
+        return pd.DataFrame(
+            {
+                label: series_key(df),
+                "date": df[PERIOD].dt.strftime("%Y-%m"),
+                "index_value": df[VALUE],
+            }
+        )
+
+    return extract
+
+
+# page dataset -> (dataflow, filters of its rows, first period, page columns)
+EXTRACTS = {
+    "gdp_dash": (
+        "namq_10_gdp",
+        {"unit": "CP_MEUR", "s_adj": "SCA", "na_item": "B1GQ", "geo": "EL"},
+        "2019-01-01",
+        gdp_quarters,
+    ),
+    "hicp_dash": (
+        "prc_hicp_manr",
+        {"unit": "RCH_A", "coicop": "CP00", "geo": "EL"},
+        "2019-03-01",
+        monthly("country"),
+    ),
+    "unemployment_dash": (
+        "une_rt_m",
+        {
+            "s_adj": "SA",
+            "age": ["TOTAL", "Y25-74", "Y_LT25"],
+            "unit": "PC_ACT",
+            "sex": "T",
+            "geo": "EL",
+        },
+        "2019-01-01",
+        monthly("age"),
+    ),
+}
+
+
+# the page dataset of an extract, as the csv the page reads
+def extract(dataset):
+    dataflow, filters, start, columns = EXTRACTS[dataset]
+    df = select(read(dataflow), start, **filters)
+    return columns(df[df[VALUE].notna()].reset_index(drop=True))
+
+
+# hash of the download each page dataset was last written from
+_refreshed = {}
+
+
+# rewrite the page datasets whose download changed; the watcher (apps/watcher.py)
+# then rebuilds their figures like for any other csv
+def refresh(datasets=None):
+    written = []
+    for dataset in datasets or EXTRACTS:
+        path = source(EXTRACTS[dataset][0])
+        if path is None:
+            continue
+        sha1 = source_hash(path)
+        if _refreshed.get(dataset) == sha1:
+            continue
+        text = extract(dataset).to_csv()
+        _refreshed[dataset] = sha1
+        target = datastore.source_path(dataset)
+        if target.exists() and target.read_text(encoding="utf-8") == text:
+            continue
+        fd, tmp = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, target)
+        written.append(dataset)
+    return written
+
+
+# python -m apps.eurostat [dataset ...]
+if __name__ == "__main__":
+    written = refresh(sys.argv[1:])
+    print("written: {}".format(", ".join(written) or "none, the datasets are current"))
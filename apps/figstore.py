@@ -0,0 +1,169 @@
+import collections
+import gzip
+import hashlib
+import json
+import re
+import threading
+
+import flask
+from plotly.utils import PlotlyJSONEncoder
+
+from . import compact
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 9
+
+# placeholder left in a payload where a stored figure is spliced in
+REF = "__figstore:{}__"
+REF_PATTERN = re.compile(rb'"__figstore:([0-9a-f]+)__"')
+
+
+# a JSON document encoded once, with its compressed variants made on first use
+# (or given, when prebuilt); prebuilt data may be memoryviews of a mapped file,
+# with the `key` computed at build time
+class Blob:
+    def __init__(self, data, gzipped=None, brotlied=None, key=None):
+        self.json = data.encode("utf-8") if isinstance(data, str) else data
+        self.key = key or hashlib.sha1(self.json).hexdigest()[:20]
+        self._lock = threading.Lock()
+        self._gzip = gzipped
+        self._brotli = brotlied
+
+    @property
+    def ref(self):
+        return REF.format(self.key)
+
+    # decoded value, for the code paths that need a plain figure dict
+    @property
+    def value(self):
+        return json.loads(bytes(self.json))
+
+    @property
+    def gzip(self):
+        if self._gzip is None:
+            with self._lock:
+                if self._gzip is None:
+                    self._gzip = gzip.compress(self.json, GZIP_LEVEL)
+        return self._gzip
+
+    @property
+    def brotli(self):
+        if self._brotli is None and brotli is not None:
+            with self._lock:
+                if self._brotli is None:
+                    self._brotli = brotli.compress(self.json, quality=BROTLI_QUALITY)
+        return self._brotli
+
+    # best variant for `accept_encodings`, as (bytes, content encoding or None)
+    def encoded(self, accept_encodings):
+        if brotli is not None and accept_encodings["br"]:
+            return self.brotli, "br"
+        if accept_encodings["gzip"]:
+            return self.gzip, "gzip"
+        return self.json, None
+
+    # fill `response` for the current request and return the body to send
+    def respond(self, response):
+        body, encoding = self.encoded(flask.request.accept_encodings)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        # same content in every encoding, so a weak validator
+        response.set_etag(self.key, weak=True)
+        return body
+
+
+# figures by content hash, shared by every page of the worker, with the number
+# of page states holding each
+_store = {}
+_holders = collections.Counter()
+_lock = threading.Lock()
+
+
+def dumps(value):
+    return json.dumps(value, cls=PlotlyJSONEncoder, ensure_ascii=False)
+
+
+# serialize a figure once, long numeric series as typed arrays, and keep it
+# in the store
+def put(figure):
+    return add(Blob(dumps(compact.encode_figure(figure))))
+
+
+# keep an encoded figure in the store, returning the stored one
+def add(blob):
+    with _lock:
+        return _store.setdefault(blob.key, blob)
+
+
+def get(key):
+    return _store.get(key)
+
+
+# figures held by a new page state
+def retain(blobs):
+    with _lock:
+        _holders.update(blob.key for blob in blobs)
+
+
+# figures of a page state that was replaced, dropped once no state holds them
+def release(blobs):
+    with _lock:
+        for blob in blobs:
+            _holders[blob.key] -= 1
+            if _holders[blob.key] <= 0:
+                del _holders[blob.key]
+                _store.pop(blob.key, None)
+
+
+# encode a payload whose figures are left as `Blob.ref` placeholders, splicing
+# in the figure JSON instead of encoding the figures again; `blobs` are those
+# of the state being rendered, so a state replaced meanwhile still renders
+def render(payload, blobs=()):
+    blobs = {blob.key: blob for blob in blobs}
+    data = dumps(payload).encode("utf-8")
+
+    def splice(match):
+        key = match.group(1).decode()
+        blob = blobs.get(key) or _store[key]
+        return blob.json
+
+    return Blob(REF_PATTERN.sub(splice, data))
+
+
+# @app.callback for callbacks answered with a pre-encoded Blob: the decorated
+# function returns the Blob holding the full callback response, which is sent
+# as it is instead of being validated and encoded again by dash
+def encoded_callback(app, *args, **kwargs):
+    register = app.callback(*args, **kwargs)
+
+    def wrap(func):
+        wrapper = register(func)
+        callback_id = next(
+            key
+            for key, entry in app.callback_map.items()
+            if entry.get("callback") is wrapper
+        )
+
+        def dispatch(*args, **kwargs):
+            kwargs.pop("outputs_list", None)
+            return func(*args, **kwargs).respond(flask.g.dash_response)
+
+        app.callback_map[callback_id]["callback"] = dispatch
+        return func
+
+    return wrap
+
+
+# stored figure a placeholder stands for, None for any other value
+def from_ref(value):
+    if isinstance(value, str):
+        match = re.fullmatch(REF.format("([0-9a-f]+)"), value)
+        if match:
+            return get(match.group(1))
+    return None
@@ -0,0 +1,111 @@
+import hashlib
+import os
+
+import flask
+from flask_compress import Compress
+
+# responses smaller than this (bytes) are sent uncompressed
+COMPRESS_MIN_SIZE = int(os.environ.get("COMPRESS_MIN_SIZE", 1024))
+COMPRESS_ALGORITHM = os.environ.get("COMPRESS_ALGORITHM", "br,gzip")
+COMPRESS_LEVEL = int(os.environ.get("COMPRESS_LEVEL", 6))
+COMPRESS_BR_LEVEL = int(os.environ.get("COMPRESS_BR_LEVEL", 5))
+
+# flask-compress defaults plus the csv answers of the data api
+COMPRESS_MIMETYPES = [
+    "text/html",
+    "text/css",
+    "text/xml",
+    "text/csv",
+    "application/json",
+    "application/javascript",
+]
+
+# content-hash ETags and 304 answers, HTTP_ETAGS=0 disables them
+ETAGS = os.environ.get("HTTP_ETAGS", "1") != "0"
+ASSETS_MAX_AGE = int(os.environ.get("HTTP_ASSETS_MAX_AGE", 86400))
+
+# route prefix -> (Cache-Control, ETag), first match wins; None leaves the
+# headers the route sets itself
+ROUTES = (
+    ("/_dash-layout", ("no-cache", True)),
+    ("/_dash-dependencies", ("no-cache", True)),
+    ("/_dash-update-component", ("no-cache", True)),
+    ("/_dash-component-suites/", (None, False)),
+    ("/metrics", ("no-store", False)),
+    ("/_assets/", (None, False)),
+    ("/assets/", ("public, max-age={}".format(ASSETS_MAX_AGE), False)),
+    ("/img/", (None, True)),
+    ("/api/", (None, True)),
+    ("/", ("no-cache", True)),
+)
+
+# headers a 304 answer keeps from the full response
+KEPT_HEADERS = ("Cache-Control", "ETag", "Vary")
+# POST callbacks are answered with a 304 only when they carry this header,
+# sent by assets/etag_cache.js which keeps the full responses; other clients
+# and proxies never get a 304 to a POST
+REVALIDATE_HEADER = "X-Dash-Revalidate"
+
+
+def route(path):
+    for prefix, policy in ROUTES:
+        if path.startswith(prefix):
+            return policy
+    return None, False
+
+
+# the request already holds the current version of `etag`; compression adds
+# a ":br" / ":gzip" suffix to the tags the client sends back
+def fresh(etag):
+    return any(
+        tag.split(":")[0] == etag for tag in flask.request.if_none_match.as_set(True)
+    )
+
+
+# conditional answers: GET and HEAD as usual, POST only when asked for
+def conditional():
+    if flask.request.method in ("GET", "HEAD"):
+        return True
+    return flask.request.headers.get(REVALIDATE_HEADER) == "1"
+
+
+def not_modified(response):
+    headers = {
+        name: response.headers[name]
+        for name in KEPT_HEADERS
+        if name in response.headers
+    }
+    return flask.Response(status=304, headers=headers)
+
+
+def after_request(response):
+    cache_control, etag = route(flask.request.path)
+    if cache_control:
+        response.headers["Cache-Control"] = cache_control
+    if not (ETAGS and etag) or response.status_code != 200:
+        return response
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if "ETag" not in response.headers:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        response.set_etag(hashlib.sha1(data).hexdigest()[:20], weak=True)
+    if conditional() and fresh(response.get_etag()[0]):
+        return not_modified(response)
+    return response
+
+
+# compression and caching headers of the Flask `server`; dash's own compression
+# (gzip only) is turned off in favour of this one
+def init_app(server):
+    server.config.update(
+        COMPRESS_MIN_SIZE=COMPRESS_MIN_SIZE,
+        COMPRESS_ALGORITHM=COMPRESS_ALGORITHM,
+        COMPRESS_LEVEL=COMPRESS_LEVEL,
+        COMPRESS_BR_LEVEL=COMPRESS_BR_LEVEL,
+        COMPRESS_MIMETYPES=COMPRESS_MIMETYPES,
+    )
+    Compress(server)
+    # registered after compression so that it runs first, on the plain body
+    server.after_request(after_request)
@@ -0,0 +1,241 @@
+import functools
+import logging
+import os
+import pathlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+import dash_core_components as dcc
+import dash_html_components as html
+import flask
+import plotly.io as pio
+from dash.development.base_component import Component
+
+from . import compact
+
+try:
+    import kaleido
+except ImportError:  # kaleido is optional, without it there are no images
+    kaleido = None
+
+logger = logging.getLogger(__name__)
+
+ROOT = pathlib.Path(__file__).parent.joinpath("..").resolve()
+
+# figures rendered server-side at /img/<page>/<figure>.<png|svg>?w=&h=, cached
+# on disk by figure hash and size, least recently used files evicted first
+CACHE_PATH = pathlib.Path(
+    os.environ.get("IMAGE_CACHE_PATH", ROOT.joinpath("build", "images"))
+)
+CACHE_BYTES = int(os.environ.get("IMAGE_CACHE_MB", 200)) * 1024 * 1024
+# renders at a time, renders waiting at most, and how long (seconds) a request
+# waits for its render before answering 503 with Retry-After; the render goes
+# on and is cached, and the request thread is free again
+WORKERS = int(os.environ.get("IMAGE_WORKERS", 2))
+QUEUE = int(os.environ.get("IMAGE_QUEUE", 16))
+WAIT = float(os.environ.get("IMAGE_WAIT", 0.25))
+
+URL = "/img/"
+FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+# plotly's size for figures without their own, and the sizes allowed
+DEFAULT_SIZE = (700, 450)
+MIN_SIZE, MAX_SIZE = 100, 3000
+# urls carrying the figure hash (v=) never change content
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "public, max-age=300"
+
+AVAILABLE = kaleido is not None
+
+_pool = ThreadPoolExecutor(WORKERS, thread_name_prefix="image-render")
+_pending = {}
+_lock = threading.Lock()
+
+
+def cache_file(key, width, height, image_format):
+    return CACHE_PATH.joinpath("{}-{}x{}.{}".format(key, width, height, image_format))
+
+
+def render(blob, width, height, image_format):
+    figure = compact.decode_figure(blob.value)
+    return pio.to_image(
+        figure, format=image_format, width=width, height=height, engine="kaleido"
+    )
+
+
+# oldest files (by last use) removed until the cache fits in CACHE_BYTES
+def evict():
+    files = []
+    for path in CACHE_PATH.glob("*-*x*.*"):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= CACHE_BYTES:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def render_to_cache(blob, width, height, image_format):
+    path = cache_file(blob.key, width, height, image_format)
+    try:
+        data = render(blob, width, height, image_format)
+        CACHE_PATH.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(".{}.{}".format(path.name, threading.get_ident()))
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        evict()
+        return data
+    finally:
+        with _lock:
+            _pending.pop(path, None)
+
+
+# image bytes from the cache, or rendered in the pool; None when the pool is
+# busy or the render did not finish within WAIT seconds
+def image(blob, width, height, image_format):
+    path = cache_file(blob.key, width, height, image_format)
+    try:
+        data = path.read_bytes()
+        os.utime(path)  # last use, for the eviction
+        return data
+    except OSError:
+        pass
+    with _lock:
+        future = _pending.get(path)
+        if future is None:
+            if len(_pending) >= QUEUE:
+                return None
+            future = _pending[path] = _pool.submit(
+                render_to_cache, blob, width, height, image_format
+            )
+    try:
+        return future.result(timeout=WAIT)
+    except TimeoutError:
+        return None
+
+
+def size(value, default):
+    try:
+        return min(max(int(value), MIN_SIZE), MAX_SIZE)
+    except (TypeError, ValueError):
+        return default
+
+
+@functools.lru_cache(maxsize=256)
+def figure_size(blob):
+    layout = blob.value.get("layout", {})
+    return (
+        size(layout.get("width"), DEFAULT_SIZE[0]),
+        size(layout.get("height"), DEFAULT_SIZE[1]),
+    )
+
+
+def url(pathname, name, blob, image_format="png"):
+    width, height = figure_size(blob)
+    return "{}{}/{}.{}?w={}&h={}&v={}".format(
+        URL, pathname.rpartition("/")[2], name, image_format, width, height, blob.key
+    )
+
+
+""" ENDPOINT """
+
+
+def serve(page, filename):
+    from . import registry
+
+    name, _, image_format = filename.rpartition(".")
+    pathname = "/apps/" + page
+    if image_format not in FORMATS or pathname not in registry.PAGES:
+        flask.abort(404)
+    blob = registry.get_page(pathname).figures().get(name)
+    if blob is None:
+        flask.abort(404)
+    if not AVAILABLE:
+        flask.abort(503, "rendering images needs kaleido")
+    default_width, default_height = figure_size(blob)
+    width = size(flask.request.args.get("w"), default_width)
+    height = size(flask.request.args.get("h"), default_height)
+    data = image(blob, width, height, image_format)
+    if data is None:
+        response = flask.Response("rendering, retry shortly", status=503)
+        response.headers["Retry-After"] = "2"
+        return response
+    response = flask.Response(data, mimetype=FORMATS[image_format])
+    version = flask.request.args.get("v")
+    response.headers["Cache-Control"] = IMMUTABLE if version == blob.key else REVALIDATE
+    response.set_etag("{}-{}x{}".format(blob.key, width, height))
+    return response
+
+
+def init_app(server):
+    server.add_url_rule(URL + "<page>/<filename>", "figure_image", serve)
+    if not AVAILABLE:
+        logger.warning(
+            "kaleido is not installed: %s answers 503 and the <page>/lite "
+            "pages serve the interactive graphs",
+            URL,
+        )
+
+
+""" LITE LAYOUT """
+
+# components left out of the lite pages: the controls and the polls and stores
+# of callbacks whose graphs are images there
+CONTROLS = (
+    dcc.Interval,
+    dcc.Store,
+    dcc.DatePickerRange,
+    dcc.Dropdown,
+    dcc.RadioItems,
+    dcc.Checklist,
+    dcc.Slider,
+    dcc.RangeSlider,
+)
+
+
+def title_text(blob):
+    title = blob.value.get("layout", {}).get("title", {}).get("text") or ""
+    return re.sub(r"\s+", " ", re.sub(r"<[^>]+>", " ", title)).strip()
+
+
+# `component` (a page layout made from `figs`) with its graphs replaced by
+# images of the stored `figures` and its controls left out, graphs only drawn
+# by callbacks too; unchanged when images cannot be rendered
+def lite_layout(component, pathname, figs, figures):
+    if not AVAILABLE:
+        return component
+    names = {id(value): name for name, value in figs.items()}
+
+    def graph_image(graph):
+        graph_id = getattr(graph, "id", None)
+        if isinstance(graph_id, dict) and graph_id.get("name") in figures:
+            name = graph_id["name"]
+        else:
+            name = names.get(id(getattr(graph, "figure", None)))
+        if name is None:
+            return None
+        blob = figures[name]
+        style = dict(getattr(graph, "style", None) or {}, height="auto")
+        return html.Img(
+            src=url(pathname, name, blob), alt=title_text(blob), style=style
+        )
+
+    def walk(node):
+        if isinstance(node, dcc.Graph):
+            return graph_image(node)
+        if isinstance(node, CONTROLS):
+            return None
+        children = getattr(node, "children", None)
+        if isinstance(children, (list, tuple)):
+            children = [walk(child) for child in children]
+            node.children = [child for child in children if child is not None]
+        elif isinstance(children, Component):
+            node.children = walk(children)
+        return node
+
+    return walk(component)
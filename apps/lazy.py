@@ -0,0 +1,125 @@
+import functools
+
+import dash_core_components as dcc
+from dash._utils import stringify_id
+from dash.dependencies import ALL, ClientsideFunction, Input, Output, State
+from dash.exceptions import PreventUpdate
+
+from app import app
+from . import figstore, registry
+
+# graphs shipped as placeholders and filled in once they scroll near the
+# viewport: every POLL_INTERVAL ms assets/lazy_graph.js lists the placeholders
+# within a screen of the viewport, and one callback answers them as a batch
+POLL_INTERVAL = 250
+DEFAULT_HEIGHT = 450  # plotly's, for figures without a height of their own
+
+POLL_ID = "lazy-graph-poll"
+BATCH_ID = "lazy-graph-batch"
+REQUESTED_ID = "lazy-graph-requested"
+
+
+def graph_id(pathname, name):
+    return {"type": "lazy-graph", "page": pathname, "name": name}
+
+
+def is_lazy(value):
+    return isinstance(value, dict) and value.get("type") == "lazy-graph"
+
+
+# figure of `figs` (figstore ref or plain figure) as a plain figure
+def _figure(value):
+    blob = figstore.from_ref(value)
+    return blob.value if blob is not None else value
+
+
+# empty figure of the same height, so the page does not jump when it is filled
+def placeholder(value):
+    height = _figure(value).get("layout", {}).get("height") or DEFAULT_HEIGHT
+    return {
+        "data": [],
+        "layout": {
+            "height": height,
+            "xaxis": {"visible": False},
+            "yaxis": {"visible": False},
+            "plot_bgcolor": "white",
+            "annotations": [
+                {
+                    "text": "φόρτωση γραφήματος…",
+                    "showarrow": False,
+                    "xref": "paper",
+                    "yref": "paper",
+                    "font": {"color": "rgb(150,150,150)"},
+                }
+            ],
+        },
+    }
+
+
+# dcc.Graph for figs[name]; `eager` graphs (those above the fold) ship their
+# figure with the page
+def graph(pathname, figs, name, style, eager=False):
+    figure = figs[name] if eager else placeholder(figs[name])
+    return dcc.Graph(id=graph_id(pathname, name), figure=figure, style=style)
+
+
+# the poll and the stores of a page with lazy graphs; `eager` names are
+# known to be sent already
+def controls(eager=()):
+    return [
+        dcc.Interval(id=POLL_ID, interval=POLL_INTERVAL),
+        dcc.Store(id=BATCH_ID),
+        dcc.Store(id=REQUESTED_ID, data=list(eager)),
+    ]
+
+
+""" CALLBACKS """
+
+
+app.clientside_callback(
+    ClientsideFunction("lazy_graph", "visible"),
+    [
+        Output(BATCH_ID, "data"),
+        Output(REQUESTED_ID, "data"),
+        Output(POLL_ID, "disabled"),
+    ],
+    [Input(POLL_ID, "n_intervals")],
+    [State(graph_id(ALL, ALL), "id"), State(REQUESTED_ID, "data")],
+)
+
+
+# the response of a batch, from (graph id, stored figure) pairs; batches repeat
+# across visitors scrolling the same way, and a rebuild stores new figures
+@functools.lru_cache(maxsize=64)
+def _batch_response(entries):
+    response = {id_str: {"figure": blob.ref} for id_str, blob in entries}
+    blobs = [blob for _, blob in entries]
+    return figstore.render({"response": response, "multi": True}, blobs)
+
+
+# the stored figure a graph id names; None for pages or figures the registry
+# does not have, the ids coming from the client
+def _stored(value):
+    page = registry.pages.get(value.get("page"))
+    if page is None:
+        return None
+    return page.figures().get(value.get("name"))
+
+
+# batches are answered with the stored figures, not encoded again
+@figstore.encoded_callback(
+    app,
+    Output(graph_id(ALL, ALL), "figure"),
+    [Input(BATCH_ID, "data")],
+    [State(graph_id(ALL, ALL), "id")],
+    prevent_initial_call=True,
+)
+def fill_graphs(batch, graph_ids):
+    entries = []
+    for value in graph_ids:
+        blob = _stored(value) if value.get("name") in (batch or []) else None
+        if blob is not None:
+            entries.append((stringify_id(value), blob))
+    if not entries:
+        raise PreventUpdate
+    return _batch_response(tuple(entries))
@@ -0,0 +1,240 @@
+import bisect
+import os
+import resource
+import threading
+import time
+
+import flask
+
+from . import registry, routing
+
+# request metrics served at /metrics in the Prometheus text format; each worker
+# keeps its own, process_pid tells which one answered the scrape;
+# DASH_METRICS=0 disables them
+ENABLED = os.environ.get("DASH_METRICS", "1") != "0"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+CALLBACK_URL = "/_dash-update-component"
+DISPLAY_PAGE = "page-content.children"
+
+
+def escape(value):
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def label_text(names, values):
+    pairs = ['{}="{}"'.format(n, escape(v)) for n, v in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+# a metric family, samples keyed by their label values
+class Metric:
+    kind = None
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._samples = {}
+
+    def header(self):
+        return [
+            "# HELP {} {}".format(self.name, self.help),
+            "# TYPE {} {}".format(self.name, self.kind),
+        ]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *values, amount=1):
+        with self._lock:
+            self._samples[values] = self._samples.get(values, 0) + amount
+
+    def lines(self):
+        with self._lock:
+            samples = sorted(self._samples.items())
+        return self.header() + [
+            "{}{} {}".format(self.name, label_text(self.labels, values), count)
+            for values, count in samples
+        ]
+
+
+# a metric read when scraped: `read` returns the value, or a dict of values
+# by label values
+class Collected(Metric):
+    def __init__(self, name, help, read, labels=(), kind="gauge"):
+        super().__init__(name, help, labels)
+        self.read = read
+        self.kind = kind
+
+    def lines(self):
+        values = self.read()
+        if not isinstance(values, dict):
+            values = {(): values}
+        return self.header() + [
+            "{}{} {}".format(self.name, label_text(self.labels, labels), value)
+            for labels, value in sorted(values.items())
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    # counts per bucket (not cumulative, the last one is +Inf), sum
+    def observe(self, value, *values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._samples.get(values)
+            if sample is None:
+                sample = self._samples[values] = [[0] * (len(self.buckets) + 1), 0]
+            sample[0][index] += 1
+            sample[1] += value
+
+    def lines(self):
+        with self._lock:
+            samples = sorted((v, (list(c), s)) for v, (c, s) in self._samples.items())
+        lines = self.header()
+        names = self.labels + ("le",)
+        for values, (counts, total) in samples:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(
+                    "{}_bucket{} {}".format(
+                        self.name, label_text(names, values + (bound,)), cumulative
+                    )
+                )
+            labels = label_text(self.labels, values)
+            lines.append("{}_sum{} {}".format(self.name, labels, round(total, 6)))
+            lines.append("{}_count{} {}".format(self.name, labels, cumulative))
+        return lines
+
+
+""" METRICS """
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except OSError:  # not linux: peak instead of current
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+REQUEST_LATENCY = Histogram(
+    "dash_request_duration_seconds", "Request latency by route.", ["route", "method"]
+)
+REQUEST_BYTES = Histogram(
+    "dash_response_bytes",
+    "Response body bytes (as sent) by route.",
+    ["route", "method"],
+    BYTES_BUCKETS,
+)
+REQUESTS = Counter(
+    "dash_requests_total", "Requests by route and status.", ["route", "status"]
+)
+CALLBACK_LATENCY = Histogram(
+    "dash_callback_duration_seconds", "Callback latency by output.", ["output"]
+)
+CALLBACK_BYTES = Histogram(
+    "dash_callback_response_bytes",
+    "Callback response bytes (as sent) by output.",
+    ["output"],
+    BYTES_BUCKETS,
+)
+PAGE_VIEWS = Counter(
+    "dash_display_page_total", "display_page calls by pathname.", ["pathname"]
+)
+
+
+def figure_cache():
+    return {(result,): registry.cache_stats[result] for result in ("hit", "miss")}
+
+
+def hit_ratio():
+    hits, misses = registry.cache_stats["hit"], registry.cache_stats["miss"]
+    return round(hits / (hits + misses), 6) if hits + misses else 0
+
+
+METRICS = [
+    REQUEST_LATENCY,
+    REQUEST_BYTES,
+    REQUESTS,
+    CALLBACK_LATENCY,
+    CALLBACK_BYTES,
+    PAGE_VIEWS,
+    Collected(
+        "dash_figure_cache_requests_total",
+        "Page lookups answered from the built figures (hit) or building them (miss).",
+        figure_cache,
+        ["result"],
+        kind="counter",
+    ),
+    Collected("dash_figure_cache_hit_ratio", "Share of figure cache hits.", hit_ratio),
+    Collected(
+        "process_resident_memory_bytes", "Resident memory of the worker.", rss_bytes
+    ),
+    Collected("process_pid", "Pid of the worker answering the scrape.", os.getpid),
+]
+
+
+""" FLASK HOOKS """
+
+
+def before_request():
+    flask.g.metrics_start = time.perf_counter()
+
+
+def after_request(response):
+    start = flask.g.pop("metrics_start", None)
+    if start is None:
+        return response
+    elapsed = time.perf_counter() - start
+    request = flask.request
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    size = response.content_length
+    if size is None and not response.direct_passthrough:
+        size = len(response.get_data())
+    REQUEST_LATENCY.observe(elapsed, route, request.method)
+    REQUEST_BYTES.observe(size or 0, route, request.method)
+    REQUESTS.inc(route, str(response.status_code))
+    if request.path.endswith(CALLBACK_URL):
+        # dash has already parsed the body, get_json returns its cached copy
+        body = request.get_json(silent=True) or {}
+        output = str(body.get("output", "unknown"))
+        CALLBACK_LATENCY.observe(elapsed, output)
+        CALLBACK_BYTES.observe(size or 0, output)
+        if output in (DISPLAY_PAGE, routing.FETCH_OUTPUT):
+            value = (body.get("inputs") or [{}])[0].get("value")
+            # client routing fetches pages by {"pathname", "version"}
+            pathname = value.get("pathname") if isinstance(value, dict) else value
+            # "/" and unknown pathnames show the default page
+            if pathname not in registry.pages:
+                pathname = registry.DEFAULT_PAGE
+            PAGE_VIEWS.inc(pathname)
+    return response
+
+
+def serve():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.lines())
+    return flask.Response("\n".join(lines) + "\n", mimetype="text/plain; version=0.0.4")
+
+
+# registered before the compression layer, whose after_request then runs
+# first: sizes are the bytes sent and latencies include the compression
+def init_app(server):
+    if not ENABLED:
+        return
+    server.before_request(before_request)
+    server.after_request(after_request)
+    server.add_url_rule("/metrics", "metrics", serve)
@@ -5,362 +5,275 @@ import dash_core_components as dcc
 import dash_html_components as html
 import pathlib
 from app import app
-from .utils import update_figure as update_fig, header_md, DEFAULT_STYLE
+from .utils import header_md, DEFAULT_STYLE
+from .registry import FigureSet
+from . import specs
 
-# get relative data folder
-PATH = pathlib.Path(__file__).parent
-DATA_PATH = PATH.joinpath("../datasets").resolve()
+# figure builders of this page, run on first visit
+figures = FigureSet()
 
-# figure update with specified margin
-def update_figure(figure, title):
-    return update_fig(figure, title, margin=dict(l=30, r=30, t=120, b=50))
 
+# page margin, under the figures' own
+DEFAULTS = {"layout": {"margin": dict(l=30, r=30, t=120, b=50)}}
 
-""" DATASETS AND FIGURES CODE"""
 
-# GDP Dataset
-df = pd.read_csv(DATA_PATH.joinpath("gdp_dash.csv"))
+""" DATASETS AND FIGURES CODE"""
 
-# Figure 1
-fig = px.bar(
-    df,
-    x="quarter",
-    y="OBS_VALUE",
-    color="year",
-    barmode="group",
-    text="metavoli",
-    color_discrete_sequence=px.colors.qualitative.Set2,
-    labels={
-        "value": "Τιμή",
-        "OBS_VALUE": "",
-        "klados": "Κατηγορία",
-        "year": "Ημερομηνία",
+# figure specs of this page, built by apps/specs.py
+SPECS = {
+    # GDP Dataset
+    "fig": {
+        "dataset": "gdp_dash.csv",
+        "chart": "bar",
+        "columns": {
+            "x": "quarter",
+            "y": "OBS_VALUE",
+            "color": "year",
+            "text": "metavoli",
+        },
+        "options": {
+            "barmode": "group",
+            "color_discrete_sequence": px.colors.qualitative.Set2,
+        },
+        "labels": {
+            "value": "Τιμή",
+            "OBS_VALUE": "",
+            "klados": "Κατηγορία",
+            "year": "Ημερομηνία",
+        },
+        "title": '<span style="font-size: 15px;"> ΑΕΠ (εκατ. ευρώ) & τριμηνιαία μεταβολή ανά έτος (%)</span>',
+        # replace "k" suffix with simple comma when hovering
+        "layout": {"yaxis": {"tickformat": ",.0f"}},
+        "traces": {"hovertemplate": "%{y}"},
+        # legend names
+        "data": [{"name": "2019"}, {"name": "2020"}, {"name": "2021"}],
     },
-)
-# automated figure modifications
-update_figure(
-    fig,
-    '<span style="font-size: 15px;"> ΑΕΠ (εκατ. ευρώ) & τριμηνιαία μεταβολή ανά έτος (%)</span>',
-)
-# legend names
-fig.data[0].name = "2019"
-fig.data[1].name = "2020"
-fig.data[2].name = "2021"
-# hover info modifications
-fig.update_traces(hovertemplate="<br>".join(["%{y}"]))
-# replace "k" suffix with simple comma when hovering
-fig.update_layout(yaxis=dict(tickformat=",.0f"))
-
-
-# Expenditure Dataset
-df = pd.read_csv(DATA_PATH.joinpath("expenditure_dash.csv"))
-
-# Figure 2
-fig_2 = px.bar(
-    df,
-    y="value",
-    x="freq;unit;na_item;geo\TIME_PERIOD",
-    color="date",
-    barmode="group",
-    text="metavoli",
-    color_discrete_sequence=px.colors.qualitative.Dark2,
-    labels={
-        "index_value": "Τιμή",
-        "date": "Ημερομηνία",
-        "component": "Κατηγορία",
-        "value": "",
+    # Expenditure Dataset
+    "fig_2": {
+        "dataset": "expenditure_dash.csv",
+        "chart": "bar",
+        "columns": {
+            "y": "value",
+            "x": "freq;unit;na_item;geo\\TIME_PERIOD",
+            "color": "date",
+            "text": "metavoli",
+        },
+        "options": {
+            "barmode": "group",
+            "color_discrete_sequence": px.colors.qualitative.Dark2,
+        },
+        "labels": {
+            "index_value": "Τιμή",
+            "date": "Ημερομηνία",
+            "component": "Κατηγορία",
+            "value": "",
+        },
+        "title": '<span style="font-size: 15px;">Δαπάνες ανά κατηγορία & ετήσια μεταβολή (%) </span><span style="font-size: 12px;"> (2015=100)</span>',
+        # make space for explanation / annotation
+        "layout": {
+            "margin": dict(l=10, r=10, t=100, b=120),
+            "paper_bgcolor": "White",
+        },
+        "traces": {"hovertemplate": "%{y}"},
+        "data": [{"name": "2019"}, {"name": "2020"}],
+        "note": {
+            "text": 'Η αξία της παραγωγής μπορεί να εκφραστεί ως το σύνολο της δαπάνης των τελικών αγαθών και υπηρεσιών, επομένως, το ΑΕΠ<br>μπορεί να υπολογιστεί αθροίζοντας όλες τις κατηγορίες δαπανών επί της εγχώριας παραγωγής.<br>•Iδιωτικής κατανάλωσης C: δαπάνες αγαθών και υπηρεσιών για την άμεση ικανοποίηση ατομικών αναγκών.<br>•Επενδυτικές I: δαπάνες νοικοκυριών για κατοικίες, δαπάνες επιχειρήσεων για κεφαλαιουχικά αγαθά, μεταβολές αποθεμάτων και αποσβέσεις.<br>•Κρατικές, για αγορά αγαθών G: αγαθά και υπηρεσίες παραγόμενα από την κυβέρνηση και αγορές αυτών από την κυβέρνηση, που παρέχονται<br>στα νοικοκυριά ως κοινωνικές μεταβιβάσεις σε είδος.<br>•Καθαρές των ξένων για αγορά εγχώριων αγαθών X-M: εξαγωγές μείον εισαγωγές αγαθών και υπηρεσιών.<br>Οπότε, το ΑΕΠ βγαίνει από τον τύπο: ΑΕΠ = C + I + G + (X – M)<br>Πηγή:<a href="https://www.investopedia.com/terms/g/gdp.asp">Fernando (2021)</a> · <a href="http://hdl.handle.net/11419/1560">Κυρίκος (2015)</a>, Δεδομένα: <a href="https://ec.europa.eu/eurostat/databrowser/view/nama_10_gdp/default/table?lang=en">Eurostat (2021)</a>',
+            "size": 8,
+        },
     },
-)
-# automated figure modifications
-update_figure(
-    fig_2,
-    '<span style="font-size: 15px;">Δαπάνες ανά κατηγορία & ετήσια μεταβολή (%) </span><span style="font-size: 12px;"> (2015=100)</span>',
-)
-# legend names
-fig_2.data[0].name = "2019"
-fig_2.data[1].name = "2020"
-# hover info modifications
-fig_2.update_traces(hovertemplate="<br>".join(["%{y}"]))
-# make space for explanation / annotation
-fig_2.update_layout(margin=dict(l=10, r=10, t=100, b=120), paper_bgcolor="White")
-# annotation text
-note = 'Η αξία της παραγωγής μπορεί να εκφραστεί ως το σύνολο της δαπάνης των τελικών αγαθών και υπηρεσιών, επομένως, το ΑΕΠ<br>μπορεί να υπολογιστεί αθροίζοντας όλες τις κατηγορίες δαπανών επί της εγχώριας παραγωγής.<br>•Iδιωτικής κατανάλωσης C: δαπάνες αγαθών και υπηρεσιών για την άμεση ικανοποίηση ατομικών αναγκών.<br>•Επενδυτικές I: δαπάνες νοικοκυριών για κατοικίες, δαπάνες επιχειρήσεων για κεφαλαιουχικά αγαθά, μεταβολές αποθεμάτων και αποσβέσεις.<br>•Κρατικές, για αγορά αγαθών G: αγαθά και υπηρεσίες παραγόμενα από την κυβέρνηση και αγορές αυτών από την κυβέρνηση, που παρέχονται<br>στα νοικοκυριά ως κοινωνικές μεταβιβάσεις σε είδος.<br>•Καθαρές των ξένων για αγορά εγχώριων αγαθών X-M: εξαγωγές μείον εισαγωγές αγαθών και υπηρεσιών.<br>Οπότε, το ΑΕΠ βγαίνει από τον τύπο: ΑΕΠ = C + I + G + (X – M)<br>Πηγή:<a href="https://www.investopedia.com/terms/g/gdp.asp">Fernando (2021)</a> · <a href="http://hdl.handle.net/11419/1560">Κυρίκος (2015)</a>, Δεδομένα: <a href="https://ec.europa.eu/eurostat/databrowser/view/nama_10_gdp/default/table?lang=en">Eurostat (2021)</a>'
-# annotation addition
-fig_2.add_annotation(
-    showarrow=False,
-    text=note,
-    font=dict(size=8),
-    xref="x domain",
-    x=0.5,
-    yref="y domain",
-    y=-0.5,
-    align="left",
-)
-
-
-# Income Dataset
-df = pd.read_csv(DATA_PATH.joinpath("income_dash.csv"))
-
-# Figure 3
-fig_3 = px.bar(
-    df,
-    y="OBS_VALUE",
-    x="na_item",
-    color="TIME_PERIOD",
-    barmode="group",
-    text="metavoli",
-    color_discrete_sequence=px.colors.qualitative.Pastel1,
-    labels={
-        "index_value": "Τιμή",
-        "date": "Ημερομηνία",
-        "component": "Κατηγορία",
-        "OBS_VALUE": "",
+    # Income Dataset
+    "fig_3": {
+        "dataset": "income_dash.csv",
+        "chart": "bar",
+        "columns": {
+            "y": "OBS_VALUE",
+            "x": "na_item",
+            "color": "TIME_PERIOD",
+            "text": "metavoli",
+        },
+        "options": {
+            "barmode": "group",
+            "color_discrete_sequence": px.colors.qualitative.Pastel1,
+        },
+        "labels": {
+            "index_value": "Τιμή",
+            "date": "Ημερομηνία",
+            "component": "Κατηγορία",
+            "OBS_VALUE": "",
+        },
+        "title": '<span style="font-size: 13px;">Εισοδήματα παραγωγικών συντελεστών & μεταβολή (%)</span><br><span style="font-size: 11px;">(εκατ. ευρώ σε τρέχουσες τιμές)</span>',
+        # make space for explanation / annotation & specify legend position
+        "layout": {
+            "margin": dict(l=100, r=100, t=30, b=150),
+            "paper_bgcolor": "White",
+            "legend": dict(yanchor="top", y=0.97, xanchor="center", x=0.50),
+            "yaxis": {"tickformat": ",.0f"},
+        },
+        "traces": {"hovertemplate": "%{y}"},
+        "data": [{"name": "2019"}, {"name": "2020"}],
+        # make x axis tick labels smaller
+        "xaxes": {"tickfont_size": 7},
+        "note": {
+            "text": 'Οι δαπάνες επί της εγχώριας παραγωγής μιας συγκεκριμένης χρονικής περιόδου αναλογούν σε εισοδήματα των παραγωγικών συντελεστών<br>που χρησιμοποιήθηκαν στην παραγωγική διαδικασία. Αυτά είναι:<br>•Ακαθάριστο λειτουργικό πλεόνασμα: πλεόνασμα ή έλλειμμα των παραγωγικών δραστηριοτήτων πριν το πληρωτέο/εισπρακτέο σύνολο<br>των τόκων, ενοικίων ή επιβαρύνσεων των παραγωγικών μονάδων ως δανειζόμενοι ή ιδιοκτήτες περιουσιακών στοιχείων.<br>Αντιπροσωπεύει το εισπρακτέο εισόδημα των μονάδων από την ιδία χρήση των παραγωγικών εγκαταστάσεων που κατέχουν.<br>•Μεικτό εισόδημα: αμοιβή της παρεχόμενης εργασίας από τον ιδιοκτήτη (ή μέλη της οικογένειάς του) μιας μη ανώνυμης εταιρικής επιχείρησης.<br>•Αμοιβές εξαρτημένης εργασίας: συνολική αμοιβή σε μετρητά ή είδος χορηγούμενη από τον εργοδότη στον εργαζόμενο σαν ανταμοιβή για<br>την εργασία που παρασχέθηκε κατά την διάρκεια της ορισμένης περιόδου.<br>•Φόροι & επιδοτήσεις παραγωγής και εισαγωγών: μονομερείς πληρωμές σε μετρητά ή είδος, εισπραττόμενες (φόροι) ή πληρωνόμενες<br>(επιδοτήσεις) από την Γενική Κυβέρνηση ή από οργανισμούς της Ευρωπαϊκής Ένωσης, όσον αφορά την παραγωγή ή εισαγωγή αγαθών<br>και υπηρεσιών, την απασχόληση, την ιδιοκτησία ή τη χρήση γης, κτιρίων ή άλλων περιουσιακών στοιχείων που χρησιμοποιούνται<br>στην παραγωγή.<br>Πηγή:<a href="https://www.statistics.gr/documents/20181/862ae13b-91b9-4141-9c78-2d3a02084cb8">Ελληνική Στατιστική Αρχή (2012)</a> · <a href="http://hdl.handle.net/11419/1560">Κυρίκος (2015)</a>, Δεδομένα: <a href="https://ec.europa.eu/eurostat/databrowser/view/nama_10_gdp/default/table?lang=en">Eurostat (2021)</a>',
+            "size": 7,
+        },
     },
-)
-# automated figure modifications
-update_figure(
-    fig_3,
-    '<span style="font-size: 13px;">Εισοδήματα παραγωγικών συντελεστών & μεταβολή (%)</span><br><span style="font-size: 11px;">(εκατ. ευρώ σε τρέχουσες τιμές)</span>',
-)
-# legend names
-fig_3.data[0].name = "2019"
-fig_3.data[1].name = "2020"
-# hover info modifications
-fig_3.update_traces(hovertemplate="<br>".join(["%{y}"]))
-# make space for explanation / annotation & specify legend position
-fig_3.update_layout(
-    margin=dict(l=100, r=100, t=30, b=150),
-    paper_bgcolor="White",
-    legend=dict(yanchor="top", y=0.97, xanchor="center", x=0.50),
-    yaxis=dict(tickformat=",.0f"),
-)
-
-# make x axis tick labels smaller
-fig_3.update_xaxes(tickfont_size=7)
-# annotation text
-note = 'Οι δαπάνες επί της εγχώριας παραγωγής μιας συγκεκριμένης χρονικής περιόδου αναλογούν σε εισοδήματα των παραγωγικών συντελεστών<br>που χρησιμοποιήθηκαν στην παραγωγική διαδικασία. Αυτά είναι:<br>•Ακαθάριστο λειτουργικό πλεόνασμα: πλεόνασμα ή έλλειμμα των παραγωγικών δραστηριοτήτων πριν το πληρωτέο/εισπρακτέο σύνολο<br>των τόκων, ενοικίων ή επιβαρύνσεων των παραγωγικών μονάδων ως δανειζόμενοι ή ιδιοκτήτες περιουσιακών στοιχείων.<br>Αντιπροσωπεύει το εισπρακτέο εισόδημα των μονάδων από την ιδία χρήση των παραγωγικών εγκαταστάσεων που κατέχουν.<br>•Μεικτό εισόδημα: αμοιβή της παρεχόμενης εργασίας από τον ιδιοκτήτη (ή μέλη της οικογένειάς του) μιας μη ανώνυμης εταιρικής επιχείρησης.<br>•Αμοιβές εξαρτημένης εργασίας: συνολική αμοιβή σε μετρητά ή είδος χορηγούμενη από τον εργοδότη στον εργαζόμενο σαν ανταμοιβή για<br>την εργασία που παρασχέθηκε κατά την διάρκεια της ορισμένης περιόδου.<br>•Φόροι & επιδοτήσεις παραγωγής και εισαγωγών: μονομερείς πληρωμές σε μετρητά ή είδος, εισπραττόμενες (φόροι) ή πληρωνόμενες<br>(επιδοτήσεις) από την Γενική Κυβέρνηση ή από οργανισμούς της Ευρωπαϊκής Ένωσης, όσον αφορά την παραγωγή ή εισαγωγή αγαθών<br>και υπηρεσιών, την απασχόληση, την ιδιοκτησία ή τη χρήση γης, κτιρίων ή άλλων περιουσιακών στοιχείων που χρησιμοποιούνται<br>στην παραγωγή.<br>Πηγή:<a href="https://www.statistics.gr/documents/20181/862ae13b-91b9-4141-9c78-2d3a02084cb8">Ελληνική Στατιστική Αρχή (2012)</a> · <a href="http://hdl.handle.net/11419/1560">Κυρίκος (2015)</a>, Δεδομένα: <a href="https://ec.europa.eu/eurostat/databrowser/view/nama_10_gdp/default/table?lang=en">Eurostat (2021)</a>'
-# annotation addition
-fig_3.add_annotation(
-    showarrow=False,
-    text=note,
-    font=dict(size=7),
-    xref="x domain",
-    x=0.5,
-    yref="y domain",
-    y=-0.5,
-    align="left",
-)
-
-
-# HICP Dataset
-df = pd.read_csv(DATA_PATH.joinpath("hicp_dash.csv"))
-
-# Figure 4
-fig_4 = px.line(
-    df,
-    y="index_value",
-    x="date",
-    color_discrete_sequence=["rgb(102, 197, 204)"],
-    labels={"index_value": "Τιμή", "date": "Ημερομηνία"},
-)
-# automated figure modifications
-update_figure(
-    fig_4,
-    '<span style="font-size: 13px;">Εξέλιξη Εναρμονισμένου Δείκτη Τιμών Καταναλωτή (ετήσιος ρυθμός μεταβολής %)</span>',
-)
-# add markers to line
-fig_4.data[0].update(mode="markers+lines")
-# make space for explanation / annotation
-fig_4.update_layout(margin=dict(l=10, r=10, t=50, b=160), paper_bgcolor="White")
-# annotation text
-note = 'Ο Εν.ΔΤΚ περιλαμβάνει περίπου 700 αγαθά και υπηρεσίες και αντιπροσωπεύει τη μέση δαπάνη των νοικοκυριών<br>στην ευρωζήνη, για ένα καλάθι ειδών. Σκοπός αποτελεί η διατήρηση του σε επίπεδα κάτω, αλλά κοντά,<br>του 2% μεσοπρόθεσμα.<br>Πηγή:<a href="https://www.ecb.europa.eu/ecb/educational/hicp/html/index.el.html">European Central Bank (2021)</a>, Δεδομένα: <a href="https://ec.europa.eu/eurostat/databrowser/view/prc_hicp_manr/default/table?lang=en">Eurostat (2021)</a>'
-# annotation addition
-fig_4.add_annotation(
-    showarrow=False,
-    text=note,
-    font=dict(size=10),
-    xref="x domain",
-    x=0.5,
-    yref="y domain",
-    y=-0.5,
-    align="left",
-)
-
-
-# HICP Components Dataset
-df = pd.read_csv(DATA_PATH.joinpath("components_dash.csv"))
-
-# Figure 5
-fig_5 = px.bar(
-    df,
-    x="freq;unit;coicop;geo\TIME_PERIOD",
-    y="metavoli ",
-    color="freq;unit;coicop;geo\TIME_PERIOD",
-    color_discrete_sequence=px.colors.qualitative.Dark24,
-    labels={"metavoli ": ""},
-)
-# automated figure modifications
-update_figure(
-    fig_5,
-    '<span style="font-size: 14px;">Μεταβολή μέσου Εν.ΔΤΚ 2020 ανά κατηγορία</span>',
-)
-# show x-axis label for each sub-plot
-fig_5.update_xaxes(
-    matches=None,
-    showticklabels=True,
-    visible=True,
-    showgrid=True,
-    gridcolor="LightGrey",
-    tickfont=dict(family="Arial", color="black", size=11),
-)
-fig_5.update_yaxes(showgrid=True, gridcolor="LightGrey")
-# hide legend
-fig_5.layout.showlegend = False
-
-
-# Unemployment Dataset
-df = pd.read_csv(DATA_PATH.joinpath("unemployment_dash.csv"))
-
-# Figure 6
-fig_6 = px.line(
-    df,
-    x="date",
-    y="index_value",
-    labels={"index_value": "", "age": "Ηλικιακή ομάδα"},
-    color="age",
-    color_discrete_sequence=[
-        "rgb(102, 197, 204)",
-        "rgb(82,188,163)",
-        "rgb(29,105,150)",
-    ],
-)
-# automated figure modifications
-update_figure(fig_6, "Εξέλιξη ποσοστού ανεργίας (%)")
-fig_6.data[0].showlegend = True
-# add markers to line
-fig_6.data[0].update(mode="markers+lines")
-# legend names
-fig_6.data[0].name = "Σύνολο"
-fig_6.data[1].name = "25-74"
-fig_6.data[2].name = "15-24"
-
-
-# Current Account Dataset
-df = pd.read_csv(DATA_PATH.joinpath("current_account_dash.csv"))
-
-# Figure 7
-fig_7 = px.bar(
-    df,
-    x="TIME_PERIOD",
-    y="OBS_VALUE",
-    color="bop_item",
-    color_discrete_sequence=px.colors.qualitative.Set2,
-    labels={"OBS_VALUE": "Τιμή", "bop_item": "Κατηγορία", "TIME_PERIOD": "Ημερομηνία"},
-)
-# automated figure modifications
-update_figure(
-    fig_7,
-    '<span style="font-size: 15px;"> Ισοζύγιο τρεχουσών συναλλαγών (εκατ. ευρώ)</span>',
-)
-# fix date format
-fig_7.update_xaxes(type="category")
-# adjust bar chart width
-for data in fig_7.data:
-    data["width"] = 0.3
-# make space for explanation / annotation
-fig_7.update_layout(
-    margin=dict(l=20, r=50, t=120, b=130),
-    paper_bgcolor="White",
-    yaxis=dict(tickformat=",.0f"),
-)
-# annotation text
-note = 'Ισοζύγιο πληρωμών: στατιστικός πίνακας καταγραφής του σύνολο των οικονομικών συναλλαγών μεταξύ των κατοίκων<br>της χώρας και του υπόλοιπου κόσμου κατά τη διάρκεια ενός συγκεκριμένου χρονικού διαστήματος, συνήθως ενός έτους.<br>Βασικές κατηγορίες συναλλαγών είναι οι συναλλαγές σε αγαθά, υπηρεσίες, πρωτογενή εισοδήματα και δευτερογενή<br>εισοδήματα, το άθροισμα των ισοζυγίων των οποίων συνιστά το ισοζύγιο τρεχουσών συναλλαγών.<br>Πηγή:<a href="https://www.bankofgreece.gr/statistika/ekswterikos-tomeas/isozygio-plhrwmwn">Τράπεζα της Ελλάδος (χ.χ)</a>, Δεδομένα: <a href="https://ec.europa.eu/eurostat/databrowser/view/tipsbp14/default/table?lang=en">Eurostat (2021)</a>'
-# annotation addition
-fig_7.add_annotation(
-    showarrow=False,
-    text=note,
-    font=dict(size=10),
-    xref="x domain",
-    x=0.5,
-    yref="y domain",
-    y=-0.5,
-    align="left",
-)
-
-
-# XAE Dataset
-df = pd.read_csv(DATA_PATH.joinpath("xae_dash.csv"))
-
-# Figure 8
-fig_8 = px.bar(
-    df,
-    x="year",
-    y="value",
-    color="klados",
-    barmode="group",
-    color_discrete_sequence=px.colors.qualitative.Set2,
-    text="value",
-    labels={"value": "Τιμή", "klados": "Κατηγορία", "year": "Ημερομηνία"},
-)
-update_figure(
-    fig_8, '<span style="font-size: 15px;">Ξένες άμεσες επενδύσεις (εκατ. ευρώ)</span>'
-)
-# adjust bar chart width
-for data in fig_8.data:
-    data["width"] = 0.3
-# fix date format
-fig_8.update_xaxes(type="category")
-# text outside chart
-fig_8.update_traces(textposition="inside")
-# hover info modifications
-fig_8.update_traces(hovertemplate="<br>".join(["%{y}"]))
+    # HICP Dataset
+    "fig_4": {
+        "dataset": "hicp_dash.csv",
+        "chart": "line",
+        "columns": {"y": "index_value", "x": "date"},
+        "options": {"color_discrete_sequence": ["rgb(102, 197, 204)"]},
+        "labels": {"index_value": "Τιμή", "date": "Ημερομηνία"},
+        "title": '<span style="font-size: 13px;">Εξέλιξη Εναρμονισμένου Δείκτη Τιμών Καταναλωτή (ετήσιος ρυθμός μεταβολής %)</span>',
+        # make space for explanation / annotation
+        "layout": {"margin": dict(l=10, r=10, t=50, b=160), "paper_bgcolor": "White"},
+        # add markers to line
+        "data": [{"mode": "markers+lines"}],
+        "note": {
+            "text": 'Ο Εν.ΔΤΚ περιλαμβάνει περίπου 700 αγαθά και υπηρεσίες και αντιπροσωπεύει τη μέση δαπάνη των νοικοκυριών<br>στην ευρωζήνη, για ένα καλάθι ειδών. Σκοπός αποτελεί η διατήρηση του σε επίπεδα κάτω, αλλά κοντά,<br>του 2% μεσοπρόθεσμα.<br>Πηγή:<a href="https://www.ecb.europa.eu/ecb/educational/hicp/html/index.el.html">European Central Bank (2021)</a>, Δεδομένα: <a href="https://ec.europa.eu/eurostat/databrowser/view/prc_hicp_manr/default/table?lang=en">Eurostat (2021)</a>',
+            "size": 10,
+        },
+    },
+    # HICP Components Dataset
+    "fig_5": {
+        "dataset": "components_dash.csv",
+        "chart": "bar",
+        "columns": {
+            "x": "freq;unit;coicop;geo\\TIME_PERIOD",
+            "y": "metavoli",
+            "color": "freq;unit;coicop;geo\\TIME_PERIOD",
+        },
+        "options": {"color_discrete_sequence": px.colors.qualitative.Dark24},
+        "labels": {"metavoli": ""},
+        "title": '<span style="font-size: 14px;">Μεταβολή μέσου Εν.ΔΤΚ 2020 ανά κατηγορία</span>',
+        # hide legend
+        "layout": {"showlegend": False},
+        # show x-axis label for each sub-plot
+        "xaxes": {
+            "matches": None,
+            "showticklabels": True,
+            "visible": True,
+            "showgrid": True,
+            "gridcolor": "LightGrey",
+            "tickfont": dict(family="Arial", color="black", size=11),
+        },
+        "yaxes": {"showgrid": True, "gridcolor": "LightGrey"},
+    },
+    # Unemployment Dataset
+    "fig_6": {
+        "dataset": "unemployment_dash.csv",
+        "chart": "line",
+        "columns": {"x": "date", "y": "index_value", "color": "age"},
+        "options": {
+            "color_discrete_sequence": [
+                "rgb(102, 197, 204)",
+                "rgb(82,188,163)",
+                "rgb(29,105,150)",
+            ]
+        },
+        "labels": {"index_value": "", "age": "Ηλικιακή ομάδα"},
+        "title": "Εξέλιξη ποσοστού ανεργίας (%)",
+        # legend names, markers on the first line
+        "data": [
+            {"showlegend": True, "mode": "markers+lines", "name": "Σύνολο"},
+            {"name": "25-74"},
+            {"name": "15-24"},
+        ],
+    },
+    # Current Account Dataset
+    "fig_7": {
+        "dataset": "current_account_dash.csv",
+        "chart": "bar",
+        "columns": {"x": "TIME_PERIOD", "y": "OBS_VALUE", "color": "bop_item"},
+        "options": {"color_discrete_sequence": px.colors.qualitative.Set2},
+        "labels": {
+            "OBS_VALUE": "Τιμή",
+            "bop_item": "Κατηγορία",
+            "TIME_PERIOD": "Ημερομηνία",
+        },
+        "title": '<span style="font-size: 15px;"> Ισοζύγιο τρεχουσών συναλλαγών (εκατ. ευρώ)</span>',
+        # make space for explanation / annotation
+        "layout": {
+            "margin": dict(l=20, r=50, t=120, b=130),
+            "paper_bgcolor": "White",
+            "yaxis": {"tickformat": ",.0f"},
+        },
+        # adjust bar chart width
+        "traces": {"width": 0.3},
+        # fix date format
+        "xaxes": {"type": "category"},
+        "note": {
+            "text": 'Ισοζύγιο πληρωμών: στατιστικός πίνακας καταγραφής του σύνολο των οικονομικών συναλλαγών μεταξύ των κατοίκων<br>της χώρας και του υπόλοιπου κόσμου κατά τη διάρκεια ενός συγκεκριμένου χρονικού διαστήματος, συνήθως ενός έτους.<br>Βασικές κατηγορίες συναλλαγών είναι οι συναλλαγές σε αγαθά, υπηρεσίες, πρωτογενή εισοδήματα και δευτερογενή<br>εισοδήματα, το άθροισμα των ισοζυγίων των οποίων συνιστά το ισοζύγιο τρεχουσών συναλλαγών.<br>Πηγή:<a href="https://www.bankofgreece.gr/statistika/ekswterikos-tomeas/isozygio-plhrwmwn">Τράπεζα της Ελλάδος (χ.χ)</a>, Δεδομένα: <a href="https://ec.europa.eu/eurostat/databrowser/view/tipsbp14/default/table?lang=en">Eurostat (2021)</a>',
+            "size": 10,
+        },
+    },
+    # XAE Dataset
+    "fig_8": {
+        "dataset": "xae_dash.csv",
+        "chart": "bar",
+        "columns": {"x": "year", "y": "value", "color": "klados", "text": "value"},
+        "options": {
+            "barmode": "group",
+            "color_discrete_sequence": px.colors.qualitative.Set2,
+        },
+        "labels": {"value": "Τιμή", "klados": "Κατηγορία", "year": "Ημερομηνία"},
+        "title": '<span style="font-size: 15px;">Ξένες άμεσες επενδύσεις (εκατ. ευρώ)</span>',
+        # bar width, text inside the bars & hover info modifications
+        "traces": {"width": 0.3, "textposition": "inside", "hovertemplate": "%{y}"},
+        # fix date format
+        "xaxes": {"type": "category"},
+    },
+}
+specs.register(figures, __name__, SPECS, DEFAULTS)
 
 
 """ LAYOUT CODE """
 
 
-layout = html.Div(
-    children=[
-        html.Br(),
-        header_md,
-        html.Br(),
-        html.Div(
-            [
-                html.Div(
-                    children=[
-                        html.H4(
-                            "ΟΙΚΟΝΟΜΙΚΕΣ ΕΞΕΛΙΞΕΙΣ",
-                            style={
-                                "font-family": "arial",
-                                "fontSize": 22,
-                                "textAlign": "center",
-                            },
-                        ),
-                        html.Br(),
-                        dcc.Markdown(
-                            "Πως εξελίχθηκαν βασικά οικονομικά μεγέθη της οικονομίας όπως το ΑΕΠ, η ανεργία και ο πληθωρισμός. Ακόμη, απεικονίζονται το ισοζύγιο τρεχουσών συναλλαγών και οι ξένες άμεσες επενδύσεις, προκειμένου να εξεταστεί το σύνολο των οικονομικών συναλλαγών των Ελλήνων κατοίκων με τον υπόλοιπο κόσμο και η πρόθεση ξένων επενδυτών να αποκτήσουν διαρκές συμφέρον σε επιχειρήσεις της χώρας.",
-                            style={
-                                "font-family": "arial",
-                                "width": "100%",
-                                "height": 25,
-                                "textAlign": "center",
-                                "border": "none",
-                                "resize": "none",
-                            },
-                        ),
-                        html.Br(),
-                        html.Br(),
-                        dcc.Graph(figure=fig, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_2, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_3, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_4, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_5, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_6, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_7, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_8, style=DEFAULT_STYLE),
-                    ]
-                ),
-            ]
-        ),
-    ]
-)
+def make_layout(figs):
+    return html.Div(
+        children=[
+            html.Br(),
+            header_md,
+            html.Br(),
+            html.Div(
+                [
+                    html.Div(
+                        children=[
+                            html.H4(
+                                "ΟΙΚΟΝΟΜΙΚΕΣ ΕΞΕΛΙΞΕΙΣ",
+                                style={
+                                    "font-family": "arial",
+                                    "fontSize": 22,
+                                    "textAlign": "center",
+                                },
+                            ),
+                            html.Br(),
+                            dcc.Markdown(
+                                "Πως εξελίχθηκαν βασικά οικονομικά μεγέθη της οικονομίας όπως το ΑΕΠ, η ανεργία και ο πληθωρισμός. Ακόμη, απεικονίζονται το ισοζύγιο τρεχουσών συναλλαγών και οι ξένες άμεσες επενδύσεις, προκειμένου να εξεταστεί το σύνολο των οικονομικών συναλλαγών των Ελλήνων κατοίκων με τον υπόλοιπο κόσμο και η πρόθεση ξένων επενδυτών να αποκτήσουν διαρκές συμφέρον σε επιχειρήσεις της χώρας.",
+                                style={
+                                    "font-family": "arial",
+                                    "width": "100%",
+                                    "height": 25,
+                                    "textAlign": "center",
+                                    "border": "none",
+                                    "resize": "none",
+                                },
+                            ),
+                            html.Br(),
+                            html.Br(),
+                            dcc.Graph(figure=figs["fig"], style=DEFAULT_STYLE),
+                            dcc.Graph(figure=figs["fig_2"], style=DEFAULT_STYLE),
+                            dcc.Graph(figure=figs["fig_3"], style=DEFAULT_STYLE),
+                            dcc.Graph(figure=figs["fig_4"], style=DEFAULT_STYLE),
+                            dcc.Graph(figure=figs["fig_5"], style=DEFAULT_STYLE),
+                            dcc.Graph(figure=figs["fig_6"], style=DEFAULT_STYLE),
+                            dcc.Graph(figure=figs["fig_7"], style=DEFAULT_STYLE),
+                            dcc.Graph(figure=figs["fig_8"], style=DEFAULT_STYLE),
+                        ]
+                    ),
+                ]
+            ),
+        ]
+    )
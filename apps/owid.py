@@ -0,0 +1,219 @@
+import argparse
+import collections
+import hashlib
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from . import datastore, series
+from .utils import DATA_PATH
+
+# the full Our World in Data covid file (hundreds of MB, not in the repo),
+# streamed in chunks into one columnar partition per country:
+#   <store>/owid/<version>/<iso_code>/<column>.npy and meta.json
+# python -m apps.owid [source] [--countries GRC,ITA,...]; the source may be a
+# path or a url. It sits outside the datasets folder, whose csv files are all
+# ingested whole by apps/datastore.py
+SOURCE = os.environ.get(
+    "OWID_SOURCE", str(DATA_PATH.joinpath("owid", "owid-covid-data.csv"))
+)
+STORE_PATH = datastore.STORE_PATH.joinpath("owid")
+META_PATH = STORE_PATH.joinpath("meta.json")
+# rows read at a time: memory stays at one chunk plus one country at the end
+CHUNK_ROWS = int(os.environ.get("OWID_CHUNK_ROWS", 100000))
+
+# the columns read, with their types; any other column is never parsed
+LABELS = {"iso_code": "category", "location": "category", "date": "object"}
+VALUES = {
+    "new_cases": "float64",
+    "new_deaths": "float64",
+    "new_cases_smoothed_per_million": "float64",
+    "new_deaths_smoothed_per_million": "float64",
+}
+# continents and income groups ("OWID_EUR", "OWID_WRL"), left out unless asked
+AGGREGATE_PREFIX = "OWID_"
+
+
+def source_version(source):
+    try:
+        stat = pathlib.Path(source).stat()
+        text = "{}:{}:{}".format(source, stat.st_mtime_ns, stat.st_size)
+    except OSError:  # a url, versioned by the time it was read
+        text = "{}:{}".format(source, time.time())
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+""" INGEST """
+
+
+# rows of the wanted countries in each chunk of the source, appended to one raw
+# file per country and column under `spool`
+def spool_chunks(source, countries, spool):
+    locations = {}
+    chunks = pd.read_csv(
+        source,
+        usecols=list(LABELS) + list(VALUES),
+        dtype=dict(LABELS, **VALUES),
+        chunksize=CHUNK_ROWS,
+    )
+    for chunk in chunks:
+        codes = chunk["iso_code"].astype(str)
+        if countries:
+            keep = codes.isin(countries)
+        else:
+            keep = ~codes.str.startswith(AGGREGATE_PREFIX) & (codes != "nan")
+        chunk, codes = chunk[keep.to_numpy()], codes[keep.to_numpy()]
+        dates = pd.to_datetime(chunk["date"]).to_numpy(dtype="datetime64[ns]")
+        for code, rows in chunk.groupby(codes.to_numpy(), sort=False).indices.items():
+            locations.setdefault(code, str(chunk["location"].iloc[rows[0]]))
+            folder = spool.joinpath(code)
+            folder.mkdir(exist_ok=True)
+            with open(folder.joinpath("date.raw"), "ab") as f:
+                f.write(dates[rows].view(np.int64).tobytes())
+            for column in VALUES:
+                with open(folder.joinpath(column + ".raw"), "ab") as f:
+                    f.write(chunk[column].to_numpy()[rows].tobytes())
+    return locations
+
+
+# one country's raw files as date-sorted .npy columns
+def write_partition(spool_folder, folder):
+    dates = np.fromfile(spool_folder.joinpath("date.raw"), dtype=np.int64)
+    order = np.argsort(dates, kind="stable")
+    dates = dates[order].view("datetime64[ns]")
+    folder.mkdir(parents=True)
+    np.save(folder.joinpath("date.npy"), dates)
+    for column in VALUES:
+        values = np.fromfile(spool_folder.joinpath(column + ".raw"), dtype=np.float64)
+        np.save(folder.joinpath(column + ".npy"), values[order])
+    return dates
+
+
+def write_meta(meta):
+    fd, tmp = tempfile.mkstemp(dir=STORE_PATH, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp, META_PATH)
+
+
+# stream `source` into a new version of the store; `countries` (iso codes)
+# limits it to those, by default every country
+def ingest(source=SOURCE, countries=None):
+    version = source_version(source)
+    STORE_PATH.mkdir(parents=True, exist_ok=True)
+    build = pathlib.Path(tempfile.mkdtemp(prefix=".tmp-", dir=STORE_PATH))
+    spool = build.joinpath(".spool")
+    spool.mkdir()
+    try:
+        locations = spool_chunks(source, set(countries or ()), spool)
+        partitions = {}
+        for code, location in sorted(locations.items()):
+            dates = write_partition(spool.joinpath(code), build.joinpath(code))
+            partitions[code] = {
+                "location": location,
+                "rows": len(dates),
+                "first": str(dates[0].astype("datetime64[D]")),
+                "last": str(dates[-1].astype("datetime64[D]")),
+            }
+        shutil.rmtree(spool)
+        target = STORE_PATH.joinpath(version)
+        shutil.rmtree(target, ignore_errors=True)
+        os.rename(build, target)
+    except BaseException:
+        shutil.rmtree(build, ignore_errors=True)
+        raise
+    meta = {
+        "version": version,
+        "source": str(source),
+        "columns": list(VALUES),
+        "countries": partitions,
+    }
+    write_meta(meta)
+    for path in STORE_PATH.iterdir():
+        if path.is_dir() and path.name != version and not path.name.startswith("."):
+            shutil.rmtree(path, ignore_errors=True)
+    return meta
+
+
+""" READ """
+
+
+def meta():
+    try:
+        return json.loads(META_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def available():
+    return meta() is not None
+
+
+# iso code -> country name of the stored partitions
+def countries():
+    current = meta()
+    if current is None:
+        return {}
+    return {code: entry["location"] for code, entry in current["countries"].items()}
+
+
+# the partition of one country as a series.Table, its columns memory-mapped;
+# only the partitions asked for are ever opened
+PARTITIONS = int(os.environ.get("OWID_PARTITIONS", 32))
+_tables = collections.OrderedDict()
+_lock = threading.Lock()
+
+
+def read_partition(version, code):
+    folder = STORE_PATH.joinpath(version, code)
+    dates = np.load(folder.joinpath("date.npy"), mmap_mode="r")
+    columns = {
+        column: np.load(folder.joinpath(column + ".npy"), mmap_mode="r")
+        for column in VALUES
+    }
+    return series.Table(version, dates, columns)
+
+
+def table(code):
+    current = meta()
+    if current is None or code not in current["countries"]:
+        return None
+    key = (current["version"], code)
+    with _lock:
+        cached = _tables.get(key)
+        if cached is not None:
+            _tables.move_to_end(key)
+            return cached
+    cached = read_partition(*key)
+    with _lock:
+        _tables[key] = cached
+        while len(_tables) > PARTITIONS:
+            _tables.popitem(last=False)
+    return cached
+
+
+# python -m apps.owid [source] [--countries GRC,ITA,...]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Stream the Our World in Data file into per-country partitions"
+    )
+    parser.add_argument("source", nargs="?", default=SOURCE, help="path or url")
+    parser.add_argument("--countries", help="iso codes, comma separated")
+    args = parser.parse_args()
+    codes = [c.strip() for c in (args.countries or "").split(",") if c.strip()]
+    started = time.perf_counter()
+    result = ingest(args.source, codes)
+    print(
+        "{} countries -> {} in {:.1f} s".format(
+            len(result["countries"]),
+            STORE_PATH.joinpath(result["version"]),
+            time.perf_counter() - started,
+        )
+    )
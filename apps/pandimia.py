@@ -1,199 +1,503 @@
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+import dash
 import dash_core_components as dcc
 import dash_html_components as html
 import pathlib
+from dash.dependencies import Input, Output, State, MATCH
 from app import app
 from .utils import update_figure, header_md, DEFAULT_STYLE
+from . import registry
+from .registry import FigureSet
+from . import compact, datastore, derived, owid, resample, series
 
-# get relative data folder
-PATH = pathlib.Path(__file__).parent
-DATA_PATH = PATH.joinpath("../datasets").resolve()
+# figure builders of this page, run on first visit
+figures = FigureSet()
 
 
-"""  DATASETS AND FIGURES """
+# id of the daily charts, rebuilt for the zoomed window of their x-axis and
+# for the date range and resolution picked above them
+def daily_graph_id(name):
+    return {"type": "daily-graph", "name": name}
 
-# Cases Dataset
-df = pd.read_csv(DATA_PATH.joinpath("cases_dash.csv"))
 
-# Figure 1
-fig = px.bar(
-    df,
-    y="new_cases",
-    x="date",
-    labels={"new_cases": "Αριθμός κρουσμάτων", "date": "Ημερομηνία"},
-    color_discrete_sequence=["rgb(102, 197, 204)"],
-)
-# automated Figure 1 modifications
-update_figure(fig, "Ημερήσια κρούσματα COVID-19")
+RANGE_ID = "pandimia-range"
+RESOLUTION_ID = "pandimia-resolution"
+TOTALS_ID = "pandimia-totals"
+COUNTRIES_ID = "pandimia-countries"
+METRIC_ID = "pandimia-metric"
+COMPARISON_ID = "pandimia-comparison"
 
+# countries compared with Greece from the OWID store (apps/owid.py): those
+# picked first, and the per-million columns one can pick between
+COMPARED = ("GRC", "ITA", "ESP", "PRT", "DEU")
+METRICS = (
+    ("new_cases_smoothed_per_million", "Κρούσματα ανά εκατομμύριο κατοίκους"),
+    ("new_deaths_smoothed_per_million", "Θάνατοι ανά εκατομμύριο κατοίκους"),
+)
 
-# Deaths Dataset
-df = pd.read_csv(DATA_PATH.joinpath("deaths_dash.csv"))
+# date index (apps/series.py) of every daily dataset of the page
+DAILY = {
+    "cases_dash": "date",
+    "deaths_dash": "date",
+    "icu_dash": "Date",
+    "tests_dash": "Ημερομηνία",
+    "vaccinations_dash": "Ημερομηνία",
+}
 
-# Figure 2
-fig_2 = px.bar(
-    df,
-    y="new_deaths",
-    x="date",
-    color_discrete_sequence=["rgb(102, 197, 204)"],
-    labels={"new_deaths": "Αριθμός θανάτων", "date": "Date"},
+# totals of the picked range: label, dataset, columns added up
+TOTALS = (
+    ("Κρούσματα", "cases_dash", ("new_cases",)),
+    ("Θάνατοι", "deaths_dash", ("new_deaths",)),
+    ("Τεστ", "tests_dash", ("TEST/ ημέρα", "rapid per day")),
+    ("Εμβολιασμοί", "vaccinations_dash", ("1η δόση (ημέρας)", "2η δόση (ημέρας)")),
 )
-# automated figure 2 modifications
-update_figure(fig_2, "Ημερήσιοι θάνατοι από COVID-19")
 
 
-# ICU Dataset
-icu_df = pd.read_csv(DATA_PATH.joinpath("icu_dash.csv"))
+def table(dataset, extra=None):
+    return series.table(dataset, DAILY[dataset], extra)
 
-# Figure 3
-fig_3 = px.line(
-    x=icu_df["Date"],
-    y=icu_df["timi"],
-    labels=dict(x="Date", y="Αριθμός συνολικών εισαγωγών"),
-    color_discrete_sequence=["rgb(136,204,238)"],
-)
-# automated figure 3 modifications
-update_figure(fig_3, "Εξέλιξη εισαγωγών ΜΕΘ")
 
+# first and last day of the daily datasets
+def date_span():
+    tables = [table(dataset) for dataset in DAILY]
+    return (
+        min(t.first for t in tables if t.first is not None),
+        max(t.last for t in tables if t.last is not None),
+    )
 
-# Tests Dataset
-df = pd.read_csv(DATA_PATH.joinpath("tests_dash.csv"))
 
-# Figure 4
-fig_4 = px.bar(
-    df,
-    x="Ημερομηνία",
-    y=["TEST/ ημέρα", "rapid per day"],
-    labels={"variable": "Είδος τεστ", "value": "Αριθμός τεστ"},
-    color_discrete_sequence=["rgb(0, 150, 100)", "rgb(148,200,500)"],
-)
-# automated figure 3 modifications
-update_figure(fig_4, "Τεστ ανά ημέρα")
-# Labels names
-fig_4.data[0].name = "RT-PCR"
-fig_4.data[1].name = "Rapid"
-# specific legend position
-fig_4.update_layout(legend=dict(yanchor="top", y=1.03, xanchor="center", x=0.50))
-
-
-# Positivity Dataset
-df = pd.read_csv(DATA_PATH.joinpath("thetikotita_dash.csv"))
-
-# Figure 5
-fig_5 = px.line(
-    df,
-    x="Ημερομηνία",
-    y=["Θετικότητα ημέρας_1", "Θετικότητα ΜΟ,  SUM"],
-    labels={"Θετικότητα ημέρας_1": "", "value": "Ποσοστό"},
-    color_discrete_sequence=["rgb(102, 197, 204)", "rgb(0, 150, 100)"],
-)
-update_figure(fig_5, "Ποσοστό θετικότητας (ανά ημέρα & μέσος όρος 7 ημερών)")
-# legend line names
-fig_5["data"][0]["name"] = "Θετικότητα ημέρας"
-fig_5["data"][1]["name"] = "Θετικότητα (μ.ο. 7 ημερών)"
-# specific legend position
-fig_5.update_layout(
-    yaxis=dict(tickformat="%.format.%3f"),
-    legend=dict(yanchor="top", y=1.10, xanchor="center", x=0.50),
-)
-# make space for explanation / annotation
-fig_5.update_layout(margin=dict(l=30, r=30, t=90, b=140), paper_bgcolor="White")
-# annotation text
-note = 'Ποσοστό θετικότητας: το ποσοστό όλων των τεστ που πραγματοποιήθηκαν και είναι θετικά,<br>δηλαδή (θετικά τεστ) / (συνολικά τεστ) x 100%. Το ποσοστό θετικότητας είναι υψηλό όταν ο αριθμός των θετικών<br>τεστ είναι πολύ υψηλός ή όταν ο αριθμός των συνολικών τεστ είναι πολύ χαμηλός.<br>Πηγή:<a href="https://www.jhsph.edu/covid-19/articles/covid-19-testing-understanding-the-percent-positive.html"> Dowdy, D. & D’Souza, G. (2020)</a>, Δεδομένα: <a href="https://docs.google.com/spreadsheets/d/14rKl4TAM05YWj94u3rAkS2PKTSIqYzdCeuXVMtV6ptM/edit#gid=784106715">covid_19gr @nyrros. (2020)</a>'
-# annotation addition
-fig_5.add_annotation(
-    showarrow=False,
-    text=note,
-    font=dict(size=10),
-    xref="x domain",
-    x=0.5,
-    yref="y domain",
-    y=-0.5,
-    align="left",
-)
+# totals of the range from `start` to `end`, each from the prefix sums
+def period_totals(start=None, end=None):
+    parts = []
+    for label, dataset, columns in TOTALS:
+        index = table(dataset)
+        rows = index.rows(start, end)
+        total = sum(index.total(column, rows)[0] for column in columns)
+        parts.append("{}: {:,.0f}".format(label, total).replace(",", "."))
+    return "Σύνολα περιόδου · " + " · ".join(parts)
 
 
-# Vaccinations Dataset
-df = pd.read_csv(DATA_PATH.joinpath("vaccinations_dash.csv"))
+# totals to date and the change of the last 7 days against the 7 before,
+# from the cumulative and week-over-week metrics (apps/derived.py)
+def latest_totals():
+    parts = []
+    for label, dataset, columns in TOTALS:
+        date_column = DAILY[dataset]
+        total = derived.series(dataset, date_column, "cumulative", columns)
+        change = derived.series(dataset, date_column, "week_over_week", columns)
+        text = "{}: {:,.0f}".format(label, total.iloc[-1]).replace(",", ".")
+        if pd.notna(change.iloc[-1]):
+            percent = "{:+.1f}".format(change.iloc[-1] * 100).replace(".", ",")
+            text += " (εβδομάδα: {}%)".format(percent)
+        parts.append(text)
+    return "Μέχρι σήμερα · " + " · ".join(parts)
 
 
-# Figure 6
-fig_6 = px.bar(
-    df,
-    x="Ημερομηνία",
-    y=["1η δόση (ημέρας)", "2η δόση (ημέρας)"],
-    labels={
-        "Ημερομηνία": "Date",
-        "1η δόση (ημέρας)": "1st Dose",
-        "2η δόση (ημέρας)": "2nd Dose",
-        "value": "Αιρθμός εμβολιασμών",
-    },
-    color_discrete_sequence=["rgb(0, 150, 300)", "rgb(148,200,500)"],
-)
-# add 7-week average trace
-fig_6.add_trace(
-    go.Scatter(
-        x=df["Ημερομηνία"],
-        y=df["m.o. week"],
-        mode="lines",
-        marker=dict(color="rgb(208,100,700)"),
+# one line per country of `codes`, only their partitions of the store are read
+def build_comparison(codes, metric, window=None, rule=None):
+    names = owid.countries()
+    fig = go.Figure()
+    note = ""
+    for code in codes:
+        index = owid.table(code)
+        if index is None:
+            continue
+        df, note = resample.view(index, "date", window, rule)
+        fig.add_trace(
+            go.Scatter(x=df["date"], y=df[metric], mode="lines", name=names[code])
+        )
+    update_figure(fig, resample.title(dict(METRICS)[metric], note))
+    resample.keep_window(fig, window)
+    return fig
+
+
+"""  DATASETS AND FIGURES """
+
+
+@figures.add("fig", "cases_dash.csv")
+def build_fig(window=None, rule=None):
+    # Cases Dataset, weekly averages for long spans, daily rows inside a
+    # zoomed window, or the resolution picked
+    df, note = resample.view(table("cases_dash"), "date", window, rule)
+
+    # Figure 1
+    fig = px.bar(
+        df,
+        y="new_cases",
+        x="date",
+        labels={"new_cases": "Αριθμός κρουσμάτων", "date": "Ημερομηνία"},
+        color_discrete_sequence=["rgb(102, 197, 204)"],
     )
-)
-# automated figure update
-update_figure(fig_6, "Ημερήσιοι εμβολιασμοί")
-# more modifications
-fig_6.data[2].name = "Μέσος όρος 7 ημερών"
-# specific legend position & smaller legend title & content
-fig_6.update_layout(
-    legend=dict(yanchor="top", y=1.09, xanchor="center", x=0.50, font=dict(size=10)),
-    legend_title=dict(font=dict(size=10)),
-)
+    # automated Figure 1 modifications
+    update_figure(fig, resample.title("Ημερήσια κρούσματα COVID-19", note))
+    resample.keep_window(fig, window)
+    return fig
+
+
+@figures.add("fig_2", "deaths_dash.csv")
+def build_fig_2(window=None, rule=None):
+    # Deaths Dataset, weekly averages for long spans, daily rows inside a
+    # zoomed window, or the resolution picked
+    df, note = resample.view(table("deaths_dash"), "date", window, rule)
+
+    # Figure 2
+    fig_2 = px.bar(
+        df,
+        y="new_deaths",
+        x="date",
+        color_discrete_sequence=["rgb(102, 197, 204)"],
+        labels={"new_deaths": "Αριθμός θανάτων", "date": "Date"},
+    )
+    # automated figure 2 modifications
+    update_figure(fig_2, resample.title("Ημερήσιοι θάνατοι από COVID-19", note))
+    resample.keep_window(fig_2, window)
+    return fig_2
+
+
+@figures.add("fig_3", "icu_dash.csv")
+def build_fig_3(window=None, rule=None):
+    # ICU Dataset, daily unless a range or a resolution is picked
+    icu_df, note = resample.view(table("icu_dash"), "Date", window, rule or "D")
+
+    # Figure 3
+    fig_3 = px.line(
+        x=icu_df["Date"],
+        y=icu_df["timi"],
+        labels=dict(x="Date", y="Αριθμός συνολικών εισαγωγών"),
+        color_discrete_sequence=["rgb(136,204,238)"],
+    )
+    # automated figure 3 modifications
+    update_figure(fig_3, resample.title("Εξέλιξη εισαγωγών ΜΕΘ", note))
+    resample.keep_window(fig_3, window)
+    return fig_3
+
+
+@figures.add("fig_4", "tests_dash.csv")
+def build_fig_4(window=None, rule=None):
+    # Tests Dataset, weekly averages for long spans, daily rows inside a
+    # zoomed window, or the resolution picked
+    df, note = resample.view(table("tests_dash"), "Ημερομηνία", window, rule)
+
+    # Figure 4
+    fig_4 = px.bar(
+        df,
+        x="Ημερομηνία",
+        y=["TEST/ ημέρα", "rapid per day"],
+        labels={"variable": "Είδος τεστ", "value": "Αριθμός τεστ"},
+        color_discrete_sequence=["rgb(0, 150, 100)", "rgb(148,200,500)"],
+    )
+    # automated figure 3 modifications
+    update_figure(fig_4, resample.title("Τεστ ανά ημέρα", note))
+    # Labels names
+    fig_4.data[0].name = "RT-PCR"
+    fig_4.data[1].name = "Rapid"
+    # specific legend position
+    fig_4.update_layout(legend=dict(yanchor="top", y=1.03, xanchor="center", x=0.50))
+    resample.keep_window(fig_4, window)
+    return fig_4
+
+
+@figures.add("fig_5", "thetikotita_dash.csv", "cases_dash.csv", "tests_dash.csv")
+def build_fig_5():
+    # Positivity Dataset
+    df = datastore.load("thetikotita_dash.csv")
+    # 7-day positivity: cases over tests of the 7 days up to each day, to 3
+    # decimals like the daily positivity of the csv
+    weekly = derived.positivity()
+    df["Θετικότητα μ.ο. 7 ημερών"] = (
+        weekly.reindex(df["Ημερομηνία"].to_numpy()).round(3).to_numpy()
+    )
+
+    # Figure 5
+    fig_5 = px.line(
+        df,
+        x="Ημερομηνία",
+        y=["Θετικότητα ημέρας_1", "Θετικότητα μ.ο. 7 ημερών"],
+        labels={"Θετικότητα ημέρας_1": "", "value": "Ποσοστό"},
+        color_discrete_sequence=["rgb(102, 197, 204)", "rgb(0, 150, 100)"],
+    )
+    update_figure(fig_5, "Ποσοστό θετικότητας (ανά ημέρα & μέσος όρος 7 ημερών)")
+    # legend line names
+    fig_5["data"][0]["name"] = "Θετικότητα ημέρας"
+    fig_5["data"][1]["name"] = "Θετικότητα (μ.ο. 7 ημερών)"
+    # specific legend position
+    fig_5.update_layout(
+        yaxis=dict(tickformat="%.format.%3f"),
+        legend=dict(yanchor="top", y=1.10, xanchor="center", x=0.50),
+    )
+    # make space for explanation / annotation
+    fig_5.update_layout(margin=dict(l=30, r=30, t=90, b=140), paper_bgcolor="White")
+    # annotation text
+    note = 'Ποσοστό θετικότητας: το ποσοστό όλων των τεστ που πραγματοποιήθηκαν και είναι θετικά,<br>δηλαδή (θετικά τεστ) / (συνολικά τεστ) x 100%. Το ποσοστό θετικότητας είναι υψηλό όταν ο αριθμός των θετικών<br>τεστ είναι πολύ υψηλός ή όταν ο αριθμός των συνολικών τεστ είναι πολύ χαμηλός.<br>Πηγή:<a href="https://www.jhsph.edu/covid-19/articles/covid-19-testing-understanding-the-percent-positive.html"> Dowdy, D. & D’Souza, G. (2020)</a>, Δεδομένα: <a href="https://docs.google.com/spreadsheets/d/14rKl4TAM05YWj94u3rAkS2PKTSIqYzdCeuXVMtV6ptM/edit#gid=784106715">covid_19gr @nyrros. (2020)</a>'
+    # annotation addition
+    fig_5.add_annotation(
+        showarrow=False,
+        text=note,
+        font=dict(size=10),
+        xref="x domain",
+        x=0.5,
+        yref="y domain",
+        y=-0.5,
+        align="left",
+    )
+    return fig_5
+
+
+# 7-day average of all doses, computed from the daily doses
+def weekly_doses(df):
+    average = derived.series(
+        "vaccinations_dash.csv",
+        "Ημερομηνία",
+        "rolling_mean",
+        ("1η δόση (ημέρας)", "2η δόση (ημέρας)"),
+    )
+    return {"m.o. week": average.to_numpy()}
+
+
+@figures.add("fig_6", "vaccinations_dash.csv")
+def build_fig_6(window=None, rule=None):
+    # Vaccinations Dataset with the 7-day average, weekly averages for long
+    # spans, daily rows inside a zoomed window, or the resolution picked
+    index = table("vaccinations_dash", extra=weekly_doses)
+    df, note = resample.view(index, "Ημερομηνία", window, rule)
+
+    # Figure 6
+    fig_6 = px.bar(
+        df,
+        x="Ημερομηνία",
+        y=["1η δόση (ημέρας)", "2η δόση (ημέρας)"],
+        labels={
+            "Ημερομηνία": "Date",
+            "1η δόση (ημέρας)": "1st Dose",
+            "2η δόση (ημέρας)": "2nd Dose",
+            "value": "Αιρθμός εμβολιασμών",
+        },
+        color_discrete_sequence=["rgb(0, 150, 300)", "rgb(148,200,500)"],
+    )
+    # add 7-week average trace
+    fig_6.add_trace(
+        go.Scatter(
+            x=df["Ημερομηνία"],
+            y=df["m.o. week"],
+            mode="lines",
+            marker=dict(color="rgb(208,100,700)"),
+        )
+    )
+    # automated figure update
+    update_figure(fig_6, resample.title("Ημερήσιοι εμβολιασμοί", note))
+    # more modifications
+    fig_6.data[2].name = "Μέσος όρος 7 ημερών"
+    # specific legend position & smaller legend title & content
+    fig_6.update_layout(
+        legend=dict(
+            yanchor="top", y=1.09, xanchor="center", x=0.50, font=dict(size=10)
+        ),
+        legend_title=dict(font=dict(size=10)),
+    )
+    resample.keep_window(fig_6, window)
+    return fig_6
 
 
 """ LAYOUT """
 
-layout = html.Div(
-    children=[
-        html.Br(),
-        header_md,
-        html.Br(),
+
+# date range and resolution of the daily charts, with the totals of the range
+def controls():
+    first, last = date_span()
+    return html.Div(
+        [
+            dcc.DatePickerRange(
+                id=RANGE_ID,
+                min_date_allowed=first.date(),
+                max_date_allowed=last.date(),
+                start_date=first.date(),
+                end_date=last.date(),
+                display_format="DD/MM/YYYY",
+                first_day_of_week=1,
+            ),
+            dcc.RadioItems(
+                id=RESOLUTION_ID,
+                options=[
+                    {"label": label, "value": value}
+                    for value, label in resample.CHOICES
+                ],
+                value="auto",
+                labelStyle={"display": "inline-block", "margin": "0 8px"},
+            ),
+            html.Div(
+                period_totals(),
+                id=TOTALS_ID,
+                style={"font-family": "arial", "fontSize": 13},
+            ),
+            html.Div(latest_totals(), style={"font-family": "arial", "fontSize": 13}),
+        ],
+        style={"textAlign": "center", "margin-bottom": 10},
+    )
+
+
+# country selector and comparison chart, filled by update_comparison; left
+# out while there is no OWID store
+def comparison_section():
+    names = owid.countries()
+    if not names:
+        return []
+    return [
         html.Div(
             [
-                html.Div(
-                    children=[
-                        html.H4(
-                            "ΕΞΕΛΙΞΗ ΤΗΣ ΠΑΝΔΗΜΙΑΣ ΣΤΗΝ ΕΛΛΑΔΑ",
-                            style={
-                                "resize": "none",
-                                "font-family": "arial",
-                                "fontSize": 22,
-                                "textAlign": "center",
-                            },
-                        ),
-                        html.Br(),
-                        dcc.Markdown(
-                            "Η εξέλιξη της πανδημίας στη χώρα, συμπεριλαμβανομένων των κρουσμάτων, θανάτων νοσούντων, εισαγωγών σε ΜΕΘ, τεστ & θετικότητας αυτών, και των εμβολιασμών.",
-                            style={
-                                "font-family": "arial",
-                                "width": "100%",
-                                "height": 5,
-                                "textAlign": "center",
-                                "border": "none",
-                            },
-                        ),
-                        html.Br(),
-                        html.Br(),
-                        dcc.Graph(figure=fig, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_2, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_3, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_4, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_5, style=DEFAULT_STYLE),
-                        dcc.Graph(figure=fig_6, style=DEFAULT_STYLE),
-                    ]
+                dcc.Dropdown(
+                    id=COUNTRIES_ID,
+                    options=[
+                        {"label": name, "value": code}
+                        for code, name in sorted(names.items(), key=lambda c: c[1])
+                    ],
+                    value=[code for code in COMPARED if code in names],
+                    multi=True,
                 ),
-            ]
+                dcc.RadioItems(
+                    id=METRIC_ID,
+                    options=[
+                        {"label": label, "value": value} for value, label in METRICS
+                    ],
+                    value=METRICS[0][0],
+                    labelStyle={"display": "inline-block", "margin": "0 8px"},
+                ),
+            ],
+            style={"textAlign": "center", "margin": "10px 10%"},
         ),
+        dcc.Graph(id=COMPARISON_ID, style=DEFAULT_STYLE),
     ]
+
+
+def make_layout(figs):
+    return html.Div(
+        children=[
+            html.Br(),
+            header_md,
+            html.Br(),
+            html.Div(
+                [
+                    html.Div(
+                        children=[
+                            html.H4(
+                                "ΕΞΕΛΙΞΗ ΤΗΣ ΠΑΝΔΗΜΙΑΣ ΣΤΗΝ ΕΛΛΑΔΑ",
+                                style={
+                                    "resize": "none",
+                                    "font-family": "arial",
+                                    "fontSize": 22,
+                                    "textAlign": "center",
+                                },
+                            ),
+                            html.Br(),
+                            dcc.Markdown(
+                                "Η εξέλιξη της πανδημίας στη χώρα, συμπεριλαμβανομένων των κρουσμάτων, θανάτων νοσούντων, εισαγωγών σε ΜΕΘ, τεστ & θετικότητας αυτών, και των εμβολιασμών.",
+                                style={
+                                    "font-family": "arial",
+                                    "width": "100%",
+                                    "height": 5,
+                                    "textAlign": "center",
+                                    "border": "none",
+                                },
+                            ),
+                            html.Br(),
+                            html.Br(),
+                            controls(),
+                            dcc.Graph(
+                                id=daily_graph_id("fig"),
+                                figure=figs["fig"],
+                                style=DEFAULT_STYLE,
+                            ),
+                            dcc.Graph(
+                                id=daily_graph_id("fig_2"),
+                                figure=figs["fig_2"],
+                                style=DEFAULT_STYLE,
+                            ),
+                            dcc.Graph(
+                                id=daily_graph_id("fig_3"),
+                                figure=figs["fig_3"],
+                                style=DEFAULT_STYLE,
+                            ),
+                            dcc.Graph(
+                                id=daily_graph_id("fig_4"),
+                                figure=figs["fig_4"],
+                                style=DEFAULT_STYLE,
+                            ),
+                            dcc.Graph(figure=figs["fig_5"], style=DEFAULT_STYLE),
+                            dcc.Graph(
+                                id=daily_graph_id("fig_6"),
+                                figure=figs["fig_6"],
+                                style=DEFAULT_STYLE,
+                            ),
+                            *comparison_section(),
+                        ]
+                    ),
+                ]
+            ),
+        ]
+    )
+
+
+""" CALLBACKS """
+
+
+# the picked range, None when it is the whole span
+def picked_window(start_date, end_date):
+    first, last = date_span()
+    start = pd.Timestamp(start_date) if start_date else first
+    end = pd.Timestamp(end_date) if end_date else last
+    if start <= first and end >= last:
+        return None
+    return start, end
+
+
+# daily detail for the zoomed window, within the picked range and at the
+# picked resolution; the stored figure when nothing is picked or zoomed
+@app.callback(
+    Output(daily_graph_id(MATCH), "figure"),
+    [
+        Input(daily_graph_id(MATCH), "relayoutData"),
+        Input(RANGE_ID, "start_date"),
+        Input(RANGE_ID, "end_date"),
+        Input(RESOLUTION_ID, "value"),
+    ],
+    [State(daily_graph_id(MATCH), "id")],
+    prevent_initial_call=True,
+)
+def update_daily_graph(relayout, start_date, end_date, resolution, graph_id):
+    window = picked_window(start_date, end_date)
+    triggered = dash.callback_context.triggered[0]["prop_id"]
+    if triggered.endswith(".relayoutData"):
+        # zooming back out shows the picked range again
+        window = resample.relayout_window(relayout) or window
+    rule = None if resolution == "auto" else resolution
+    name = graph_id["name"]
+    if window is None and rule is None:
+        return registry.get_page("/apps/pandimia").figures()[name].value
+    return compact.encode_figure(figures[name][0](window, rule))
+
+
+@app.callback(
+    Output(TOTALS_ID, "children"),
+    [Input(RANGE_ID, "start_date"), Input(RANGE_ID, "end_date")],
+    prevent_initial_call=True,
+)
+def update_totals(start_date, end_date):
+    return period_totals(start_date, end_date)
+
+
+# the picked countries within the picked range and resolution
+@app.callback(
+    Output(COMPARISON_ID, "figure"),
+    [
+        Input(COUNTRIES_ID, "value"),
+        Input(METRIC_ID, "value"),
+        Input(RANGE_ID, "start_date"),
+        Input(RANGE_ID, "end_date"),
+        Input(RESOLUTION_ID, "value"),
+    ],
 )
+def update_comparison(codes, metric, start_date, end_date, resolution):
+    window = picked_window(start_date, end_date)
+    rule = None if resolution == "auto" else resolution
+    return compact.encode_figure(build_comparison(codes or [], metric, window, rule))
@@ -0,0 +1,179 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import compact, datastore, figstore
+
+ROOT = pathlib.Path(__file__).parent.joinpath("..").resolve()
+# figures built at deploy time (python -m apps.prerender): index.json and the
+# data file it points into, holding every figure with its gzip/br variants
+ARTIFACTS_PATH = pathlib.Path(
+    os.environ.get("PRERENDER_PATH", ROOT.joinpath("build", "figures"))
+)
+INDEX_PATH = ARTIFACTS_PATH.joinpath("index.json")
+
+# code the figures are built by (the pages, their specs and the eurostat
+# extracts live in apps/) and the pinned libraries, e.g. plotly; a change
+# makes every artifact stale
+SOURCES = ("app.py", "index.py", "requirements.txt", "apps/*.py")
+VARIANTS = ("json", "gzip", "brotli")
+
+
+def source_hash():
+    digest = hashlib.sha1()
+    for path in sorted(path for pattern in SOURCES for path in ROOT.glob(pattern)):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+# settings the stored bytes depend on besides the code, e.g. FIGURE_ENCODING;
+# artifacts built with other settings are stale too
+def settings():
+    return {
+        "binary": compact.BINARY,
+        "binary_min_length": compact.MIN_LENGTH,
+        "gzip_level": figstore.GZIP_LEVEL,
+        "brotli_quality": figstore.BROTLI_QUALITY if figstore.brotli else None,
+    }
+
+
+""" BUILD """
+
+
+# one figure, built and encoded in a worker process: its key and the
+# (json, gzip, brotli) variants
+def build_figure(pathname, name):
+    from . import registry
+
+    builder = registry.get_page(pathname).figure_set[name][0]
+    blob = figstore.Blob(figstore.dumps(compact.encode_figure(builder())))
+    return blob.key, (blob.json, blob.gzip, blob.brotli)
+
+
+def build(workers=None):
+    from . import registry
+
+    started = time.perf_counter()
+    tasks = {}
+    for pathname in registry.PAGES:
+        # imported and ingested here, before the workers are forked
+        figure_set = registry.get_page(pathname).figure_set
+        for name, (builder, datasets) in figure_set.items():
+            tasks[pathname, name] = {d: datastore.version(d) for d in datasets}
+
+    figures, chunks, offset = {}, [], 0
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {key: pool.submit(build_figure, *key) for key in tasks}
+        for (pathname, name), future in futures.items():
+            key, variants = future.result()
+            entry = {"datasets": tasks[pathname, name], "key": key}
+            for variant, data in zip(VARIANTS, variants):
+                if data is not None:
+                    entry[variant] = [offset, len(data)]
+                    chunks.append(data)
+                    offset += len(data)
+            figures.setdefault(pathname, {})[name] = entry
+
+    data = b"".join(chunks)
+    # a new data file per build, so workers still reading the previous index
+    # keep finding their figures
+    data_name = "figures-{}.bin".format(hashlib.sha1(data).hexdigest()[:12])
+    ARTIFACTS_PATH.mkdir(parents=True, exist_ok=True)
+    ARTIFACTS_PATH.joinpath(data_name).write_bytes(data)
+    index = {
+        "source": source_hash(),
+        "settings": settings(),
+        "data": data_name,
+        "figures": figures,
+    }
+    tmp = INDEX_PATH.with_suffix(".tmp")
+    tmp.write_text(json.dumps(index, indent=1, ensure_ascii=False))
+    os.replace(tmp, INDEX_PATH)
+    for path in ARTIFACTS_PATH.glob("figures-*.bin"):
+        if path.name != data_name:
+            path.unlink()
+    return len(tasks), len(data), time.perf_counter() - started
+
+
+""" LOAD """
+
+_lock = threading.Lock()
+_artifacts = None
+
+
+def _open():
+    try:
+        index = json.loads(INDEX_PATH.read_text(encoding="utf-8"))
+        if index["source"] != source_hash() or index.get("settings") != settings():
+            return None, None
+        with open(ARTIFACTS_PATH.joinpath(index["data"]), "rb") as f:
+            # read-only, the pages are shared by the workers mapping the file;
+            # the figures are memoryviews of it, copied only when sent
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return index, memoryview(mapped)
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+
+# the index and the mapped data file, opened once per process; (None, None)
+# without artifacts or when the code or the settings changed since the build
+def artifacts():
+    global _artifacts
+    with _lock:
+        if _artifacts is None:
+            _artifacts = _open()
+        return _artifacts
+
+
+# prebuilt figures of a page (name -> figstore.Blob) whose datasets did not
+# change since the build, put in the figure store
+def load(pathname, names):
+    index, data = artifacts()
+    if index is None:
+        return {}
+    figures = {}
+    for name, entry in index["figures"].get(pathname, {}).items():
+        datasets = entry["datasets"]
+        if name not in names or any(
+            datastore.version(d) != version for d, version in datasets.items()
+        ):
+            continue
+        stored = figstore.get(entry["key"])
+        if stored is not None:
+            figures[name] = stored
+            continue
+        # slices of the mapped file, not copies
+        variants = {
+            v: data[entry[v][0] : entry[v][0] + entry[v][1]]
+            for v in VARIANTS
+            if v in entry
+        }
+        blob = figstore.Blob(
+            variants["json"],
+            gzipped=variants.get("gzip"),
+            brotlied=variants.get("brotli"),
+            key=entry["key"],
+        )
+        figures[name] = figstore.add(blob)
+    return figures
+
+
+# python -m apps.prerender [--workers N]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build the figures of every page in parallel"
+    )
+    parser.add_argument("--workers", type=int, help="processes (default one per cpu)")
+    args = parser.parse_args()
+    count, size, elapsed = build(args.workers)
+    print(
+        "{} figures, {} bytes -> {} in {:.1f} s".format(
+            count, size, ARTIFACTS_PATH, elapsed
+        )
+    )
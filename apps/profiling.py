@@ -0,0 +1,208 @@
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pathlib
+import threading
+import time
+import tracemalloc
+
+import flask
+
+# DASH_PROFILE=1 records the wall time and the memory allocated by every
+# library import, dataset load, figure build and page render of the worker
+ENABLED = os.environ.get("DASH_PROFILE", "") not in ("", "0")
+# where the startup report is written, with the optional snapshots
+REPORT_PATH = pathlib.Path(
+    os.environ.get(
+        "DASH_PROFILE_DIR",
+        pathlib.Path(__file__).parent.joinpath("..", "build", "profile"),
+    )
+)
+# DASH_PROFILE_CPROFILE=1 also runs cProfile over the startup (startup.prof),
+# DASH_PROFILE_SNAPSHOT=1 dumps a tracemalloc snapshot (startup.tracemalloc)
+CPROFILE = os.environ.get("DASH_PROFILE_CPROFILE", "") not in ("", "0")
+SNAPSHOT = os.environ.get("DASH_PROFILE_SNAPSHOT", "") not in ("", "0")
+# frames kept per allocation, more makes the snapshot more useful and slower
+TRACE_FRAMES = int(os.environ.get("DASH_PROFILE_FRAMES", 1))
+# the report endpoint answers only requests carrying this token, when set
+ADMIN_TOKEN = os.environ.get("DASH_ADMIN_TOKEN", "")
+
+# libraries whose import time is worth knowing, imported by start()
+LIBRARIES = ("numpy", "pandas", "plotly.express", "dash")
+
+_entries = []
+_lock = threading.Lock()
+# open records of the current thread, for the peak memory of nested records
+_local = threading.local()
+_started = None
+_profiler = None
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+# wall time and memory of the block, as an entry of the report; peaks of
+# nested records are carried over to the records around them
+@contextlib.contextmanager
+def record(kind, name):
+    if _started is None:
+        yield
+        return
+    stack = _stack()
+    frame = {"carry": 0}
+    if stack:
+        stack[-1]["carry"] = max(stack[-1]["carry"], tracemalloc.get_traced_memory()[1])
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    stack.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        stack.pop()
+        after, peak = tracemalloc.get_traced_memory()
+        peak = max(frame["carry"], peak)
+        if stack:
+            stack[-1]["carry"] = max(stack[-1]["carry"], peak)
+        entry = {
+            "kind": kind,
+            "name": name,
+            "at_ms": round((start - _started) * 1000, 1),
+            "ms": round(elapsed * 1000, 2),
+            "allocated_kb": round((after - current) / 1024, 1),
+            "peak_kb": round((peak - current) / 1024, 1),
+            "depth": len(stack),
+        }
+        with _lock:
+            _entries.append(entry)
+
+
+# decorator recording every call, named by `label` of its first argument
+def timed(kind, label=str):
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(name, *args, **kwargs):
+            with record(kind, label(name)):
+                return function(name, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# start recording; called before the app and its libraries are imported
+def start():
+    global _started, _profiler
+    if not ENABLED or _started is not None:
+        return
+    _started = time.perf_counter()
+    tracemalloc.start(TRACE_FRAMES)
+    if CPROFILE:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    for library in LIBRARIES:
+        with record("import", library):
+            __import__(library)
+
+
+""" REPORT """
+
+
+def report():
+    with _lock:
+        entries = list(_entries)
+    totals = {}
+    for entry in entries:
+        if entry["depth"] == 0:
+            total = totals.setdefault(entry["kind"], {"count": 0, "ms": 0.0})
+            total["count"] += 1
+            total["ms"] = round(total["ms"] + entry["ms"], 2)
+    return {
+        "enabled": ENABLED,
+        "pid": os.getpid(),
+        "uptime_ms": (
+            round((time.perf_counter() - _started) * 1000, 1) if _started else None
+        ),
+        "traced_kb": (
+            round(tracemalloc.get_traced_memory()[0] / 1024, 1)
+            if tracemalloc.is_tracing()
+            else None
+        ),
+        "totals": totals,
+        "entries": entries,
+    }
+
+
+def text_report(data=None):
+    data = data or report()
+    lines = [
+        "startup profile (pid {}, {} ms since start, {} kB traced)".format(
+            data["pid"], data["uptime_ms"], data["traced_kb"]
+        ),
+        "",
+        "{:<10} {:<34} {:>10} {:>10} {:>12} {:>10}".format(
+            "kind", "name", "at ms", "ms", "allocated kB", "peak kB"
+        ),
+    ]
+    for entry in data["entries"]:
+        lines.append(
+            "{:<10} {:<34} {:>10} {:>10} {:>12} {:>10}".format(
+                entry["kind"],
+                "  " * entry["depth"] + entry["name"],
+                entry["at_ms"],
+                entry["ms"],
+                entry["allocated_kb"],
+                entry["peak_kb"],
+            )
+        )
+    lines.append("")
+    for kind, total in data["totals"].items():
+        lines.append(
+            "{:<10} {:>4} x {:>10} ms".format(kind, total["count"], total["ms"])
+        )
+    return "\n".join(lines) + "\n"
+
+
+# write the report (and the snapshots) once startup is over, e.g. after the
+# warm-up of the pages
+def finish():
+    global _profiler
+    if not ENABLED or _started is None:
+        return None
+    REPORT_PATH.mkdir(parents=True, exist_ok=True)
+    if _profiler is not None:
+        _profiler.disable()
+        _profiler.dump_stats(str(REPORT_PATH.joinpath("startup.prof")))
+        _profiler = None
+    if SNAPSHOT:
+        tracemalloc.take_snapshot().dump(
+            str(REPORT_PATH.joinpath("startup.tracemalloc"))
+        )
+    data = report()
+    REPORT_PATH.joinpath("startup.json").write_text(json.dumps(data, indent=2))
+    REPORT_PATH.joinpath("startup.txt").write_text(text_report(data))
+    return REPORT_PATH
+
+
+""" ADMIN ENDPOINT """
+
+
+# /_admin/profile (json) and /_admin/profile?format=text, live for the worker
+# answering the request
+def serve():
+    if ADMIN_TOKEN and flask.request.args.get("token") != ADMIN_TOKEN:
+        flask.abort(403)
+    if flask.request.args.get("format") == "text":
+        return flask.Response(text_report(), mimetype="text/plain")
+    return flask.jsonify(report())
+
+
+def init_app(server):
+    if ENABLED:
+        server.add_url_rule("/_admin/profile", "profile_report", serve)
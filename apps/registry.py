@@ -0,0 +1,237 @@
+import collections
+import hashlib
+import importlib
+import os
+import pathlib
+import sys
+import threading
+
+from . import datastore, figstore, images, prerender, profiling
+
+# pages served by display_page, pathname -> page module
+PAGES = {
+    "/apps/arxiki": "apps.arxiki",
+    "/apps/pandimia": "apps.pandimia",
+    "/apps/oikonomia": "apps.oikonomia",
+    "/apps/koinwnia": "apps.koinwnia",
+}
+DEFAULT_PAGE = "/apps/arxiki"
+# "<pathname>/lite": the page with its graphs as server-rendered images
+LITE_SUFFIX = "/lite"
+
+
+def dataset_name(name):
+    return pathlib.Path(name).stem
+
+
+# figure builders of a page, name -> (builder, dataset files it reads)
+class FigureSet(dict):
+    def add(self, name, *datasets):
+        def decorator(builder):
+            self[name] = (builder, tuple(dataset_name(d) for d in datasets))
+            return builder
+
+        return decorator
+
+    def build(self, names=None):
+        names = self if names is None else names
+        figures = {}
+        for name in names:
+            builder = self[name][0]
+            label = "{}.{}".format(builder.__module__.rpartition(".")[2], name)
+            with profiling.record("figure", label):
+                figures[name] = builder()
+        return figures
+
+    # names of the figures reading any of `datasets`
+    def depending_on(self, datasets):
+        datasets = {dataset_name(d) for d in datasets}
+        return [name for name, (builder, deps) in self.items() if datasets & set(deps)]
+
+
+def store(figures):
+    return {name: figstore.put(figure) for name, figure in figures.items()}
+
+
+# lookups of the page figures: "hit" when already built, "miss" when built then
+cache_stats = collections.Counter()
+
+
+# built state of a page: stored figures (name -> figstore.Blob), the layout
+# made of their refs, the encoded display_page response and the data version
+# it was built from, swapped as a whole on rebuilds
+PageState = collections.namedtuple(
+    "PageState", ["figures", "children", "response", "version"]
+)
+
+
+# a page whose module is imported and whose figures are built on first visit,
+# then kept serialized in the figure store for the lifetime of the worker
+class Page:
+    def __init__(self, pathname, module_name):
+        self.pathname = pathname
+        self.module_name = module_name
+        self._lock = threading.Lock()
+        self._state = None
+
+    @property
+    def module(self):
+        if self.module_name in sys.modules:
+            return sys.modules[self.module_name]
+        with profiling.record("import", self.module_name):
+            return importlib.import_module(self.module_name)
+
+    @property
+    def figure_set(self):
+        return getattr(self.module, "figures", FigureSet())
+
+    @property
+    def built(self):
+        return self._state is not None
+
+    # version of the data shown, from the versions of the datasets it reads
+    def data_version(self):
+        datasets = sorted({d for _, deps in self.figure_set.values() for d in deps})
+        text = ",".join(datastore.version(d) for d in datasets)
+        return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+    # data version the page is answered with: the built state's, which lags
+    # data_version() until the watcher rebuilds it, or the one it would be
+    # built from
+    def served_version(self):
+        state = self._state
+        return state.version if state is not None else self.data_version()
+
+    def _built_state(self):
+        if self._state is None:
+            with self._lock:
+                if self._state is None:
+                    cache_stats["miss"] += 1
+                    with profiling.record("page", self.pathname):
+                        # taken first, a dataset changing meanwhile is rebuilt
+                        version = self.data_version()
+                        figures = self._load_or_build()
+                        self._state = self._render(figures, version)
+                    return self._state
+        cache_stats["hit"] += 1
+        return self._state
+
+    def state(self):
+        return self._built_state()
+
+    # figures prebuilt at deploy time (apps/prerender.py) when still current,
+    # the others built here
+    def _load_or_build(self):
+        figure_set = self.figure_set
+        figures = prerender.load(self.pathname, figure_set)
+        missing = [name for name in figure_set if name not in figures]
+        if missing:
+            figures.update(store(figure_set.build(missing)))
+        return figures
+
+    def make_layout(self, figs):
+        return self.module.make_layout(figs)
+
+    def _render(self, figures, version):
+        refs = {name: blob.ref for name, blob in figures.items()}
+        children = self.make_layout(refs)
+        response = figstore.render(
+            {"response": {"page-content": {"children": children}}, "multi": True},
+            figures.values(),
+        )
+        figstore.retain(figures.values())
+        return PageState(figures, children, response, version)
+
+    def figures(self):
+        return self._built_state().figures
+
+    def layout(self):
+        figures = {name: blob.value for name, blob in self.figures().items()}
+        return self.make_layout(figures)
+
+    # display_page response for this page, encoded once
+    def response(self):
+        return self._built_state().response
+
+    # rebuild the figures reading any of `datasets` and swap in the new state;
+    # requests keep being answered from the previous state meanwhile, which
+    # renders from its own figures
+    def rebuild(self, datasets):
+        state = self._state
+        names = self.figure_set.depending_on(datasets) if state else []
+        if names:
+            version = self.data_version()
+            figures = dict(state.figures)
+            figures.update(store(self.figure_set.build(names)))
+            self._state = self._render(figures, version)
+            figstore.release(state.figures.values())
+        return names
+
+
+# a page shown with images (apps/images.py) instead of interactive graphs, for
+# slow devices; it shares the figures of `page`
+class LitePage(Page):
+    def __init__(self, page):
+        super().__init__(page.pathname + LITE_SUFFIX, page.module_name)
+        self.page = page
+
+    def _load_or_build(self):
+        return self.page.figures()
+
+    def make_layout(self, figs):
+        layout = self.module.make_layout(figs)
+        figures = self.page.figures()
+        return images.lite_layout(layout, self.page.pathname, figs, figures)
+
+    # rendered again with the figures the page has just rebuilt
+    def rebuild(self, datasets):
+        names = self.figure_set.depending_on(datasets) if self._state else []
+        if names:
+            state, replaced = self.page.state(), self._state
+            self._state = self._render(state.figures, state.version)
+            figstore.release(replaced.figures.values())
+        return names
+
+
+pages = {pathname: Page(pathname, name) for pathname, name in PAGES.items()}
+lite_pages = [LitePage(page) for page in pages.values()]
+pages.update((page.pathname, page) for page in lite_pages)
+
+
+def get_page(pathname):
+    return pages.get(pathname, pages[DEFAULT_PAGE])
+
+
+def get_layout(pathname):
+    return get_page(pathname).layout()
+
+
+# rebuild, in every built page, the figures that read any of `datasets`
+def rebuild(datasets):
+    rebuilt = {}
+    for pathname, page in pages.items():
+        names = page.rebuild(datasets)
+        if names:
+            rebuilt[pathname] = names
+    return rebuilt
+
+
+# build pages ahead of the first visit, e.g. before gunicorn forks its workers;
+# `pathnames` may be "all", a comma separated string or a list of pathnames
+def warm_up(pathnames="all"):
+    if isinstance(pathnames, str):
+        if pathnames.strip().lower() == "all":
+            pathnames = list(pages)
+        else:
+            pathnames = [p.strip() for p in pathnames.split(",") if p.strip()]
+    for pathname in pathnames:
+        response = get_page(pathname).response()
+        # compressed once here too, instead of once per worker
+        response.gzip, response.brotli
+
+
+# optional warm-up hook, enabled through the DASH_WARMUP environment variable
+def warm_up_from_env():
+    pathnames = os.environ.get("DASH_WARMUP", "")
+    if pathnames:
+        warm_up(pathnames)
@@ -0,0 +1,78 @@
+import pandas as pd
+from dash.exceptions import PreventUpdate
+
+# most points a daily chart sends, whatever the date span it shows
+MAX_POINTS = 200
+
+# resolutions from finest to coarsest: pandas rule, days per point, note
+RESOLUTIONS = (
+    ("D", 1, ""),
+    ("W-MON", 7, "μέσος όρος εβδομάδας"),
+    ("MS", 30.4, "μέσος όρος μήνα"),
+)
+ZOOM_HINT = "μεγεθύνετε για ημερήσια στοιχεία"
+
+
+# finest resolution that keeps the span under MAX_POINTS
+def resolution(start, end):
+    days = (pd.Timestamp(end) - pd.Timestamp(start)).days + 1
+    for rule, period, note in RESOLUTIONS:
+        if days / period <= MAX_POINTS:
+            return rule, note
+    return rule, note
+
+
+# the choices of the resolution selector, "auto" picks it from the span shown
+CHOICES = (
+    ("auto", "Αυτόματη ανάλυση"),
+    ("D", "Ημερήσια"),
+    ("W-MON", "Εβδομαδιαία"),
+    ("MS", "Μηνιαία"),
+)
+NOTES = {rule: note for rule, _, note in RESOLUTIONS}
+
+
+# rows of a series.Table inside `window` (whole series when None), as a frame
+# with the dates in `date_column`: day by day, or averaged per week or month
+# with a `rule`, by default the finest resolution that keeps the span under
+# MAX_POINTS; returns (frame, note)
+def view(table, date_column, window=None, rule=None):
+    rows = table.rows(*window) if window is not None else table.rows()
+    if rows.stop <= rows.start:
+        return table.frame(date_column, rows), ""
+    auto = rule in (None, "auto")
+    if auto:
+        rule, note = resolution(table.dates[rows.start], table.dates[rows.stop - 1])
+    else:
+        note = NOTES[rule]
+    df = table.frame(date_column, rows, rule, "mean")
+    if not note or not auto:
+        return df, note
+    return df, "{} · {}".format(note, ZOOM_HINT)
+
+
+# title with the resolution note of the view underneath
+def title(text, note):
+    if not note:
+        return text
+    return '{}<br><span style="font-size: 11px;">({})</span>'.format(text, note)
+
+
+# x-axis window of a relayoutData event, None when zoomed back out; events
+# that do not change the x-axis range are not answered
+def relayout_window(relayout):
+    relayout = relayout or {}
+    if relayout.get("xaxis.autorange"):
+        return None
+    if "xaxis.range[0]" in relayout and "xaxis.range[1]" in relayout:
+        return relayout["xaxis.range[0]"], relayout["xaxis.range[1]"]
+    if "xaxis.range" in relayout:
+        return tuple(relayout["xaxis.range"][:2])
+    raise PreventUpdate
+
+
+# keep the x-axis on the zoomed window once the figure is replaced
+def keep_window(figure, window):
+    if window is not None:
+        figure.update_xaxes(range=list(window))
+    return figure
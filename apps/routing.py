@@ -0,0 +1,136 @@
+import hashlib
+import os
+
+import dash_core_components as dcc
+from dash.dependencies import ClientsideFunction, Input, Output, State
+from dash.exceptions import PreventUpdate
+
+from . import figstore, prerender, registry
+
+# ROUTING_MODE=client: the browser fetches each page once per version and
+# keeps it in a dcc.Store, navigation swaps page-content locally
+# (assets/page_cache.js); "server" answers every navigation with display_page
+MODE = os.environ.get("ROUTING_MODE", "server")
+CLIENT = MODE == "client"
+# seconds between two checks of the page versions, 0 checks on page load only
+VERSION_POLL = float(os.environ.get("ROUTING_VERSION_POLL", 60))
+# where the pages are kept: "memory" (the tab, until reload), "session" or
+# "local" (browser storage, across reloads)
+STORAGE = os.environ.get("ROUTING_STORAGE", "session")
+
+VERSIONS_ID = "page-versions"
+CACHE_ID = "page-cache"
+REQUEST_ID = "page-request"
+FETCHED_ID = "page-fetched"
+POLL_ID = "page-versions-poll"
+# callback output of the page fetches, next to display_page's
+FETCH_OUTPUT = FETCHED_ID + ".data"
+
+# the code the pages are made by, a deploy invalidates the kept pages
+CODE_VERSION = prerender.source_hash()
+
+
+def version(data_version):
+    text = CODE_VERSION + data_version
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+# version of every page as fetch_page answers it, with the page shown for
+# unknown pathnames
+def versions():
+    return {
+        "default": registry.DEFAULT_PAGE,
+        "pages": {
+            pathname: version(page.served_version())
+            for pathname, page in registry.pages.items()
+        },
+    }
+
+
+# the stores of the index layout, none in server mode; the versions are those
+# of the moment the layout is served
+def controls():
+    if not CLIENT:
+        return []
+    components = [
+        dcc.Store(id=VERSIONS_ID, data=versions()),
+        dcc.Store(id=CACHE_ID, storage_type=STORAGE),
+        dcc.Store(id=REQUEST_ID),
+        dcc.Store(id=FETCHED_ID),
+    ]
+    if VERSION_POLL:
+        components.append(dcc.Interval(id=POLL_ID, interval=VERSION_POLL * 1000))
+    return components
+
+
+# the fetch response of a page, encoded once per built state of the page
+_responses = {}
+
+
+def fetched_response(pathname):
+    page = registry.get_page(pathname)
+    state = page.state()
+    cached = _responses.get(page.pathname)
+    if cached is None or cached[0] is not state:
+        data = {
+            "pathname": page.pathname,
+            "version": version(state.version),
+            "children": state.children,
+        }
+        response = figstore.render(
+            {"response": {FETCHED_ID: {"data": data}}, "multi": True},
+            state.figures.values(),
+        )
+        cached = _responses[page.pathname] = (state, response)
+    return cached[1]
+
+
+""" CALLBACKS """
+
+
+def init_app(app):
+    # the kept page when current, otherwise a request for it
+    app.clientside_callback(
+        ClientsideFunction("page_cache", "show"),
+        [Output("page-content", "children"), Output(REQUEST_ID, "data")],
+        [
+            Input("url", "pathname"),
+            Input(VERSIONS_ID, "data"),
+            Input(CACHE_ID, "data"),
+        ],
+        [State(REQUEST_ID, "data")],
+    )
+    # a fetched page added to the kept ones
+    app.clientside_callback(
+        ClientsideFunction("page_cache", "keep"),
+        Output(CACHE_ID, "data"),
+        [Input(FETCHED_ID, "data")],
+        [State(CACHE_ID, "data"), State(VERSIONS_ID, "data")],
+        prevent_initial_call=True,
+    )
+
+    # fetches are answered with the pre-encoded page
+    @figstore.encoded_callback(
+        app,
+        Output(FETCHED_ID, "data"),
+        [Input(REQUEST_ID, "data")],
+        prevent_initial_call=True,
+    )
+    def fetch_page(request):
+        return fetched_response((request or {}).get("pathname"))
+
+    if not VERSION_POLL:
+        return
+
+    # new versions only, unchanged ones would redraw the page shown
+    @app.callback(
+        Output(VERSIONS_ID, "data"),
+        [Input(POLL_ID, "n_intervals")],
+        [State(VERSIONS_ID, "data")],
+        prevent_initial_call=True,
+    )
+    def poll_versions(n_intervals, known):
+        current = versions()
+        if current == known:
+            raise PreventUpdate
+        return current
@@ -0,0 +1,131 @@
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from . import datastore
+
+# daily datasets indexed by date: the dates sorted once, and per numeric
+# column the prefix sums and counts of its present values, so that the total
+# or the average of any date range is two binary searches and a subtraction,
+# and any slice is a binary search plus the rows it returns. Tables are built
+# once per dataset version and shared by every request.
+
+
+class Table:
+    def __init__(self, version, dates, columns):
+        self.version = version
+        self.dates = dates
+        self.columns = columns
+        self.sums = {}
+        self.counts = {}
+        for name, values in columns.items():
+            present = ~np.isnan(values)
+            self.sums[name] = np.concatenate(
+                ([0.0], np.cumsum(np.where(present, values, 0.0)))
+            )
+            self.counts[name] = np.concatenate(([0], np.cumsum(present)))
+
+    @property
+    def first(self):
+        return pd.Timestamp(self.dates[0]) if len(self.dates) else None
+
+    @property
+    def last(self):
+        return pd.Timestamp(self.dates[-1]) if len(self.dates) else None
+
+    # rows from `start` to `end` included (None for open ends)
+    def rows(self, start=None, end=None):
+        first = 0 if start is None else self.dates.searchsorted(_date(start), "left")
+        last = (
+            len(self.dates)
+            if end is None
+            else self.dates.searchsorted(_date(end), "right")
+        )
+        return slice(first, max(first, last))
+
+    # sum and count of the present values of `name` in `rows`
+    def total(self, name, rows):
+        sums, counts = self.sums[name], self.counts[name]
+        return (
+            sums[rows.stop] - sums[rows.start],
+            int(counts[rows.stop] - counts[rows.start]),
+        )
+
+    def mean(self, name, rows):
+        total, count = self.total(name, rows)
+        return total / count if count else np.nan
+
+    # start of every `rule` period ("W-MON", "MS") the rows fall in, and the
+    # row each period begins at, the last entry closing the last period
+    def periods(self, rule, rows):
+        offset = to_offset(rule)
+        first = offset.rollback(pd.Timestamp(self.dates[rows.start]).normalize())
+        labels = pd.date_range(
+            first, pd.Timestamp(self.dates[rows.stop - 1]), freq=rule
+        )
+        edges = labels.append(pd.DatetimeIndex([labels[-1] + offset]))
+        positions = self.dates.searchsorted(edges.to_numpy())
+        return labels, np.clip(positions, rows.start, rows.stop)
+
+    # a DataFrame of `rows` with its dates in `date_column`, per day or as the
+    # "sum" or "mean" of every `rule` period (periods without values are NaN)
+    def frame(self, date_column, rows=slice(None), rule=None, how="mean", names=None):
+        names = list(self.columns) if names is None else names
+        rows = slice(*rows.indices(len(self.dates)))
+        if rule is None or rule == "D" or rows.stop <= rows.start:
+            data = {date_column: self.dates[rows]}
+            data.update((name, self.columns[name][rows]) for name in names)
+            return pd.DataFrame(data)
+        labels, positions = self.periods(rule, rows)
+        data = {date_column: labels}
+        for name in names:
+            sums = np.diff(self.sums[name][positions])
+            counts = np.diff(self.counts[name][positions])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                values = sums / counts if how == "mean" else sums
+            data[name] = np.where(counts > 0, values, np.nan)
+        return pd.DataFrame(data)
+
+
+def _date(value):
+    return np.datetime64(pd.Timestamp(value), "ns")
+
+
+# a Table of the numeric columns of `dataset`, the rows without a date left out;
+# `extra` (a function of the loaded frame) adds computed columns
+def read_table(dataset, date_column, version, extra=None):
+    df = datastore.load(dataset)
+    dates = df[date_column].to_numpy(dtype="datetime64[ns]")
+    present = ~np.isnat(dates)
+    order = np.argsort(dates[present], kind="stable")
+    columns = {
+        name: df[name].to_numpy(dtype=np.float64)
+        for name in df.columns
+        if name != date_column and pd.api.types.is_numeric_dtype(df[name])
+    }
+    if extra is not None:
+        columns.update(
+            (name, np.asarray(values, dtype=np.float64))
+            for name, values in extra(df).items()
+        )
+    columns = {name: values[present][order] for name, values in columns.items()}
+    return Table(version, dates[present][order], columns)
+
+
+_tables = {}
+_lock = threading.Lock()
+
+
+def table(dataset, date_column, extra=None):
+    dataset = datastore.dataset_name(dataset)
+    key = (dataset, date_column, extra)
+    version = datastore.version(dataset)
+    with _lock:
+        current = _tables.get(key)
+    if current is None or current.version != version:
+        current = read_table(dataset, date_column, version, extra)
+        with _lock:
+            _tables[key] = current
+    return current
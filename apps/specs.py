@@ -0,0 +1,139 @@
+import collections
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from . import datastore, surveys
+from .utils import FIGURE_LAYOUT, FIGURE_TRACES
+
+# figures described as data instead of code; a spec is a dict of
+#   dataset   csv the figure reads (or values: its columns, inline, or survey:
+#             a question of apps/surveys.py)
+#   chart     plotly express function, a key of CHARTS
+#   columns   column arguments (x, y, color, text)
+#   facet     {"col", "wrap", "row_spacing"}, facet titles lose their "name="
+#   options   other plotly express arguments (barmode, colors, height, width)
+#   labels    column labels
+#   title     figure title
+#   layout    layout on top of the shared styling (margin, legend, hovermode)
+#   traces    updates of every trace
+#   data      updates of single traces, in trace order (names, modes)
+#   xaxes     updates of every x axis, yaxes of every y axis
+#   note      {"text", "size"} explanatory note under the chart
+# page defaults (e.g. the page margin) are merged under every spec of the page
+CHARTS = {"bar": px.bar, "line": px.line}
+FACET_ARGUMENTS = {
+    "col": "facet_col",
+    "wrap": "facet_col_wrap",
+    "row_spacing": "facet_row_spacing",
+}
+NOTE = dict(
+    showarrow=False, xref="x domain", x=0.5, yref="y domain", y=-0.5, align="left"
+)
+
+# built figures by the hash of their spec and of the data they read, so an
+# unchanged spec over an unchanged csv is not built twice
+CACHE_SIZE = int(os.environ.get("FIGURE_SPEC_CACHE", 128))
+
+_cache = collections.OrderedDict()
+_lock = threading.Lock()
+
+
+# nested dicts merged, later values winning
+def merge(*dicts):
+    merged = {}
+    for values in dicts:
+        for key, value in (values or {}).items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                value = merge(merged[key], value)
+            merged[key] = value
+    return merged
+
+
+def data_frame(spec):
+    if "values" in spec:
+        return pd.DataFrame(spec["values"])
+    if "survey" in spec:
+        return surveys.frame(spec["survey"])
+    return datastore.load(spec["dataset"])
+
+
+# dataset a spec reads, None for inline values
+def dataset(spec):
+    return spec.get("dataset") or spec.get("survey")
+
+
+# hash of a spec and of the version of its dataset
+def spec_key(spec):
+    version = datastore.version(dataset(spec)) if dataset(spec) else None
+    text = json.dumps([spec, version], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def make_figure(spec):
+    arguments = dict(spec.get("columns", {}), **spec.get("options", {}))
+    for key, value in spec.get("facet", {}).items():
+        arguments[FACET_ARGUMENTS[key]] = value
+    figure = CHARTS[spec["chart"]](
+        data_frame(spec), labels=spec.get("labels", {}), **arguments
+    )
+    if "facet" in spec:
+        # "date=2021-01" -> "2021-01"
+        for annotation in figure.layout.annotations:
+            annotation.text = annotation.text.split("=")[1]
+    # the shared styling and the figure's own layout in one update
+    figure.update_layout(
+        merge(FIGURE_LAYOUT, {"title_text": spec.get("title")}, spec.get("layout"))
+    )
+    figure.update_traces(merge(FIGURE_TRACES, spec.get("traces")))
+    for trace, update in zip(figure.data, spec.get("data", [])):
+        trace.update(update)
+    if "xaxes" in spec:
+        figure.update_xaxes(spec["xaxes"])
+    if "yaxes" in spec:
+        figure.update_yaxes(spec["yaxes"])
+    if "note" in spec:
+        note = spec["note"]
+        figure.add_annotation(NOTE, text=note["text"], font=dict(size=note["size"]))
+    return figure
+
+
+# the figure of a spec, from the cache while the spec and its data are the
+# same; a copy, so callers may change it
+def build(spec, defaults=None):
+    spec = merge(defaults, spec)
+    key = spec_key(spec)
+    with _lock:
+        figure = _cache.get(key)
+        if figure is not None:
+            _cache.move_to_end(key)
+    if figure is None:
+        figure = make_figure(spec)
+        with _lock:
+            _cache[key] = figure
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+    return go.Figure(figure)
+
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+
+# add the builders of `specs` (name -> spec) to the FigureSet of a page
+def register(figures, module, specs, defaults=None):
+    for name, spec in specs.items():
+        datasets = [dataset(spec)] if dataset(spec) else []
+
+        def builder(spec=spec):
+            return build(spec, defaults)
+
+        builder.__module__ = module
+        builder.__name__ = "build_" + name
+        figures.add(name, *datasets)(builder)
@@ -0,0 +1,205 @@
+import functools
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from . import datastore
+
+# the diaNEOsis survey answers of every erwtisi_*.csv in one long table with
+# the columns of FIELDS, labels stored once as pandas categoricals; any
+# question can be compared across waves or regions with one pivot() call
+FIELDS = ("question", "item", "answer", "wave", "region", "value")
+
+# question (its dataset) -> ({field: dataset column}, wave of single-wave files)
+SURVEYS = {
+    "erwtisi_6_apr20": (
+        {"item": "erwtisi", "answer": "vathmos", "value": "timi"},
+        "Apr-20",
+    ),
+    "erwtisi_5_apr20": ({"answer": "apantisi", "value": "timi"}, "Apr-20"),
+    "erwtisi_11_sept20": (
+        {"item": "erwtisi", "answer": "apantisi", "value": "vathmos"},
+        "Sep-20",
+    ),
+    "erwtisi_19_sept20": (
+        {"item": "apantisi", "answer": "vathmos", "wave": "date", "value": "timi"},
+        None,
+    ),
+    "erwtisi_13_dash": ({"answer": "apantisi", "value": "timi"}, "Dec-20"),
+    "erwtisi_14_dash": ({"answer": "apantisi", "value": "timi"}, "Dec-20"),
+    "erwtisi_4_jan21": (
+        {"item": "apantisi", "wave": "date", "value": "timi"},
+        None,
+    ),
+    "erwtisi_7_jan21": (
+        {"answer": "apantisi", "wave": "date", "value": "timi"},
+        None,
+    ),
+    "erwtisi_7_march21": (
+        {"item": "erwtisi", "answer": "vathmos", "wave": "date", "value": "timi"},
+        None,
+    ),
+    "erwtisi_14_march21": (
+        {"answer": "apantisi", "region": "perifereia", "value": "timi"},
+        "Mar-21",
+    ),
+    "erwtisi_1_dash": ({"answer": "apantisi", "wave": "date", "value": "timi"}, None),
+    "erwtisi_2": ({"answer": "apantisi", "wave": "date", "value": "value"}, None),
+    "erwtisi_8_dash": ({"item": "foreas", "wave": "date", "value": "timi"}, None),
+    "erwtisi_19": ({"answer": "apantisi", "wave": "date", "value": "timi"}, None),
+    "erwtisi_32": ({"answer": "apantisi", "wave": "date", "value": "timi"}, None),
+}
+# waves are labelled "Apr-20"; their categories are ordered by date
+WAVE_FORMAT = "%b-%y"
+
+
+def version():
+    text = ",".join(datastore.version(question) for question in SURVEYS)
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def read_question(question):
+    fields, wave = SURVEYS[question]
+    df = datastore.load(question)
+    data = {"question": np.full(len(df), question, dtype=object)}
+    for field in FIELDS[1:-1]:
+        if field in fields:
+            # labels as stripped text, e.g. the answers "1".."5" of a scale
+            data[field] = df[fields[field]].astype(str).str.strip().to_numpy()
+        else:
+            data[field] = np.full(len(df), wave if field == "wave" else None)
+    data["value"] = df[fields["value"]].to_numpy(dtype=np.float64)
+    return pd.DataFrame(data)
+
+
+def categorical(values, field):
+    if field != "wave":
+        return pd.Categorical(values)
+    waves = pd.unique(values[pd.notna(values)])
+    order = sorted(waves, key=lambda wave: pd.to_datetime(wave, format=WAVE_FORMAT))
+    return pd.Categorical(values, categories=order, ordered=True)
+
+
+# all the answers, with the rows of each question, built once per version
+class Store:
+    def __init__(self, version, df, rows):
+        self.version = version
+        self.df = df
+        self.rows = rows
+
+
+def read_store(store_version):
+    frames = [read_question(question) for question in SURVEYS]
+    rows, start = {}, 0
+    for question, frame in zip(SURVEYS, frames):
+        rows[question] = slice(start, start + len(frame))
+        start += len(frame)
+    df = pd.concat(frames, ignore_index=True)
+    for field in FIELDS[:-1]:
+        df[field] = categorical(df[field].to_numpy(dtype=object), field)
+    return Store(store_version, df, rows)
+
+
+_store = None
+_lock = threading.Lock()
+
+
+def store():
+    global _store
+    current = version()
+    if _store is None or _store.version != current:
+        loaded = read_store(current)
+        with _lock:
+            _store = loaded
+    return _store
+
+
+""" QUERIES """
+
+
+# rows of `question` (a name or a list of names, None for all) whose fields
+# match `filters`, e.g. wave="Mar-21" or region=["Αττική", "Κρήτη"]
+def query(question=None, **filters):
+    current = store()
+    if isinstance(question, str):
+        df = current.df.iloc[current.rows[question]]
+    else:
+        df = current.df
+        if question is not None:
+            filters["question"] = question
+    mask = np.ones(len(df), dtype=bool)
+    for field, value in filters.items():
+        values = value if isinstance(value, (list, tuple, set)) else [value]
+        mask &= df[field].isin(values).to_numpy()
+    return df[mask]
+
+
+def _frozen(filters):
+    return tuple(
+        sorted(
+            (field, tuple(value) if isinstance(value, (list, set)) else value)
+            for field, value in filters.items()
+        )
+    )
+
+
+# fields an answer belongs to: answers of different questions or items are
+# never aggregated together
+SCOPE = ("question", "item")
+
+
+def _fields(labels):
+    return list(labels) if isinstance(labels, (list, tuple)) else [labels]
+
+
+@functools.lru_cache(maxsize=256)
+def _pivot(store_version, question, index, columns, aggfunc, filters):
+    df = query(question, **dict(filters))
+    grouped = _fields(index) + _fields(columns)
+    if "answer" in grouped:
+        # the question and item of the answers kept as outer index levels
+        # when the rows hold more than one
+        scope = [f for f in SCOPE if f not in grouped and df[f].nunique() > 1]
+        index = scope + _fields(index) if scope else index
+    return df.pivot_table(
+        index=index, columns=columns, values="value", aggfunc=aggfunc, observed=True
+    )
+
+
+# `question` as a table of `index` labels (rows) by `columns` labels, e.g. the
+# answers by wave or by region; cached per data version, a copy is returned.
+# Grouped by answer, rows of several questions or items are indexed by those
+# too, e.g. (item, answer), instead of being averaged together
+def pivot(question, index="answer", columns="wave", aggfunc="mean", **filters):
+    if isinstance(question, list):
+        question = tuple(question)
+    if isinstance(index, list):
+        index = tuple(index)
+    if isinstance(columns, list):
+        columns = tuple(columns)
+    table = _pivot(version(), question, index, columns, aggfunc, _frozen(filters))
+    return table.copy()
+
+
+# one answer (or item) of one or more questions across the waves
+def compare(question, across="wave", by="answer", **filters):
+    return pivot(question, index=by, columns=across, **filters)
+
+
+# the rows of `question` under the column names of its dataset, for the
+# figure specs of apps/specs.py
+def frame(question):
+    fields, _ = SURVEYS[question]
+    current = store()
+    df = current.df.iloc[current.rows[question]]
+    data = {
+        column: (
+            df[field].to_numpy()
+            if field == "value"
+            else df[field].astype(object).to_numpy()
+        )
+        for field, column in fields.items()
+    }
+    return pd.DataFrame(data)
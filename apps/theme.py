@@ -0,0 +1,60 @@
+import json
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# the plotly template of the dashboard: plotly's own with the styling shared by
+# every figure; it is the default, so plotly express builds on it
+NAME = "dashboard"
+# trace types of the dashboard, whose defaults the template keeps: the full
+# plotly template is copied and validated several times per figure built
+TRACE_TYPES = ("bar", "scatter")
+
+plotly_template = pio.templates["plotly"]
+template = go.layout.Template(
+    layout=plotly_template.layout,
+    data={kind: plotly_template.data[kind] for kind in TRACE_TYPES},
+)
+template.layout.update(
+    title_x=0.5,
+    font=dict(size=12),
+    plot_bgcolor="white",
+    hovermode="x unified",
+    legend=dict(orientation="h", y=1, yanchor="bottom", x=0.5, xanchor="center"),
+)
+pio.templates[NAME] = template
+pio.templates.default = NAME
+
+# templates sent once with the page (see init_app) instead of in every figure
+TEMPLATES = {NAME: template.to_plotly_json()}
+
+
+# plotly JSON of a figure with its template replaced by the template name when
+# it is one of TEMPLATES; assets/figure_decode.js puts the template back
+def reference(figure):
+    layout = figure.get("layout", {})
+    for name, value in TEMPLATES.items():
+        if layout.get("template") == value:
+            layout["template"] = name
+    return figure
+
+
+# the other way round, for renderers without assets/figure_decode.js
+def resolve(figure):
+    layout = figure.get("layout", {})
+    if layout.get("template") in TEMPLATES:
+        layout["template"] = TEMPLATES[layout["template"]]
+    return figure
+
+
+def script():
+    return "<script>window.dashFigureTemplates = {};</script>".format(
+        json.dumps(TEMPLATES, separators=(",", ":")).replace("</", "<\\/")
+    )
+
+
+# the templates as an inline script of the index page, ahead of the graphs
+def init_app(app):
+    app.index_string = app.index_string.replace(
+        "{%scripts%}", script() + "\n{%scripts%}", 1
+    )
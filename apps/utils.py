@@ -1,25 +1,31 @@
 import dash_core_components as dcc
+import pathlib
+
+from . import theme  # registers the dashboard template
+
+# get relative data folder
+PATH = pathlib.Path(__file__).parent
+DATA_PATH = PATH.joinpath("../datasets").resolve()
+
+# styling shared by every figure on top of the dashboard template
+# (apps/theme.py): what plotly express sets on the figure itself, and the
+# first axes only, as the template would style every facet's axes
+FIGURE_LAYOUT = dict(
+    xaxis_title="",
+    xaxis=dict(
+        showticklabels=True,
+        tickfont=dict(family="Arial", size=10, color="rgb(82,82,82)"),
+    ),
+    yaxis=dict(gridcolor="rgb(243,243,243)"),
+    legend=dict(title=None),
+)
+FIGURE_TRACES = dict(hovertemplate=None)
+
 
 # automated figure update
 def update_figure(figure, title, margin=None):
-    layout = figure.update_layout(
-        title_text=title,
-        title_x=0.5,
-        font=dict(size=12),
-        xaxis_title="",
-        xaxis=dict(
-            showticklabels=True,
-            tickfont=dict(family="Arial", size=10, color="rgb(82,82,82)"),
-        ),
-        yaxis=dict(gridcolor="rgb(243,243,243)"),
-        plot_bgcolor="white",
-        hovermode="x unified",
-        legend=dict(
-            title=None, orientation="h", y=1, yanchor="bottom", x=0.5, xanchor="center"
-        ),
-        margin=margin,
-    )
-    traces = figure.update_traces(hovertemplate=None)
+    figure.update_layout(FIGURE_LAYOUT, title_text=title, margin=margin)
+    figure.update_traces(FIGURE_TRACES)
     return figure
 
 
@@ -0,0 +1,81 @@
+import logging
+import os
+import threading
+
+from . import eurostat, registry
+from .utils import DATA_PATH
+
+logger = logging.getLogger(__name__)
+
+# seconds between two scans of the datasets folder, 0 disables the watcher
+POLL_INTERVAL = float(os.environ.get("DATASET_POLL_INTERVAL", 60))
+
+
+# (mtime, size) of every csv in the datasets folder
+def scan():
+    snapshot = {}
+    for path in DATA_PATH.glob("*.csv"):
+        try:
+            stat = path.stat()
+        except OSError:  # removed while scanning
+            continue
+        snapshot[path.stem] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+# polls the datasets folder and rebuilds the figures of the changed files in
+# its own thread, so requests keep being served from the current figures
+class DatasetWatcher(threading.Thread):
+    def __init__(self, interval=POLL_INTERVAL):
+        super().__init__(name="dataset-watcher", daemon=True)
+        self.interval = interval
+        self.snapshot = scan()
+        self._stopped = threading.Event()
+
+    def changed(self):
+        snapshot = scan()
+        changed = {
+            name for name, stat in snapshot.items() if self.snapshot.get(name) != stat
+        }
+        self.snapshot = snapshot
+        return changed
+
+    def check(self):
+        try:
+            eurostat.refresh()
+        except Exception:  # a broken download leaves its page dataset as it is
+            logger.exception("refreshing the Eurostat datasets failed")
+        changed = self.changed()
+        if changed:
+            rebuilt = registry.rebuild(changed)
+            logger.info("datasets changed: %s, rebuilt: %s", sorted(changed), rebuilt)
+        return changed
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.check()
+            except Exception:  # keep watching, the current figures stay served
+                logger.exception("rebuilding figures failed")
+
+    def stop(self):
+        self._stopped.set()
+
+
+_watcher = None
+
+
+# start the watcher of this process, unless disabled or already running
+def start(interval=POLL_INTERVAL):
+    global _watcher
+    if interval > 0 and (_watcher is None or not _watcher.is_alive()):
+        _watcher = DatasetWatcher(interval)
+        _watcher.start()
+    return _watcher
+
+
+# stop the watcher of this process, e.g. in the gunicorn master whose figures
+# are only there to be shared with the workers
+def stop():
+    if _watcher is not None:
+        _watcher.stop()
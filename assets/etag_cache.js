@@ -0,0 +1,86 @@
+// Keeps the callback responses that carry an ETag (page navigation and the
+// figures) in the browser's Cache Storage and sends their ETag back with the
+// same request, so a repeat visit is answered with an empty 304 instead of
+// the figures again. Browsers do not revalidate POST requests on their own,
+// and the server only answers a POST with a 304 when X-Dash-Revalidate is
+// set (apps/httpcache.py), as this script does.
+(function () {
+  if (!window.fetch || !window.caches || !window.crypto || !crypto.subtle) {
+    return;
+  }
+  var CACHE_NAME = "dash-callbacks";
+  var MAX_ENTRIES = 50;
+  var send = window.fetch.bind(window);
+
+  function isCallback(input, init) {
+    var url = typeof input === "string" ? input : input.url;
+    return (
+      init && init.method === "POST" && typeof init.body === "string" &&
+      url.indexOf("_dash-update-component") !== -1
+    );
+  }
+
+  // cache key: a GET url made of the hash of the request body
+  function cacheKey(body) {
+    var data = new TextEncoder().encode(body);
+    return crypto.subtle.digest("SHA-1", data).then(function (digest) {
+      var hex = Array.prototype.map
+        .call(new Uint8Array(digest), function (b) {
+          return ("0" + b.toString(16)).slice(-2);
+        })
+        .join("");
+      return location.origin + "/_dash-update-component/cached/" + hex;
+    });
+  }
+
+  function store(cache, key, response) {
+    return cache.put(key, response).then(function () {
+      return cache.keys().then(function (keys) {
+        return Promise.all(
+          keys.slice(0, Math.max(keys.length - MAX_ENTRIES, 0)).map(function (old) {
+            return cache.delete(old);
+          })
+        );
+      });
+    });
+  }
+
+  // the Cache Storage and the cache key, null when unavailable (e.g. on http)
+  function lookup(body) {
+    return Promise.all([caches.open(CACHE_NAME), cacheKey(body)])
+      .then(function (opened) {
+        return opened[1] && { cache: opened[0], key: opened[1] };
+      })
+      .catch(function () {
+        return null;
+      });
+  }
+
+  window.fetch = function (input, init) {
+    if (!isCallback(input, init)) {
+      return send(input, init);
+    }
+    return lookup(init.body).then(function (entry) {
+      if (!entry) {
+        return send(input, init);
+      }
+      return entry.cache.match(entry.key).then(function (cached) {
+        var headers = new Headers(init.headers);
+        if (cached && cached.headers.get("ETag")) {
+          headers.set("If-None-Match", cached.headers.get("ETag"));
+          headers.set("X-Dash-Revalidate", "1");
+        }
+        var request = Object.assign({}, init, { headers: headers });
+        return send(input, request).then(function (response) {
+          if (response.status === 304 && cached) {
+            return cached;
+          }
+          if (response.ok && response.headers.get("ETag")) {
+            store(entry.cache, entry.key, response.clone());
+          }
+          return response;
+        });
+      });
+    });
+  };
+})();
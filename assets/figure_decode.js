@@ -0,0 +1,116 @@
+// Decodes the typed arrays of apps/compact.py ({dtype, bdata} objects, the
+// format of plotly.js >= 2.28) before the bundled plotly.js draws a figure,
+// and puts back the templates that apps/theme.py sends by name.
+(function () {
+  var TYPES = {
+    i1: "Int8Array",
+    u1: "Uint8Array",
+    i2: "Int16Array",
+    u2: "Uint16Array",
+    i4: "Int32Array",
+    u4: "Uint32Array",
+    f4: "Float32Array",
+    f8: "Float64Array",
+  };
+  var PATCHED = ["newPlot", "react", "addTraces", "restyle"];
+
+  function isTyped(value) {
+    return (
+      value !== null &&
+      typeof value === "object" &&
+      typeof value.dtype === "string" &&
+      typeof value.bdata === "string"
+    );
+  }
+
+  function decode(value) {
+    var binary = atob(value.bdata);
+    var bytes = new Uint8Array(binary.length);
+    for (var i = 0; i < binary.length; i++) {
+      bytes[i] = binary.charCodeAt(i);
+    }
+    return new window[TYPES[value.dtype]](bytes.buffer);
+  }
+
+  // copy of a trace (or of a nested object: marker, line, ...) with its
+  // typed arrays decoded; the figure held by dash is left as it is
+  function decodeTrace(trace, depth) {
+    if (!trace || typeof trace !== "object" || Array.isArray(trace) || depth > 3) {
+      return trace;
+    }
+    var copy = {};
+    Object.keys(trace).forEach(function (key) {
+      var value = trace[key];
+      copy[key] = isTyped(value) ? decode(value) : decodeTrace(value, depth + 1);
+    });
+    return copy;
+  }
+
+  // layout with its template name replaced by the template of the page
+  function decodeLayout(layout) {
+    var templates = window.dashFigureTemplates || {};
+    if (
+      !layout ||
+      typeof layout.template !== "string" ||
+      !templates[layout.template]
+    ) {
+      return layout;
+    }
+    return Object.assign({}, layout, { template: templates[layout.template] });
+  }
+
+  // traces, a single trace (restyle) or a whole figure
+  function decodeData(data) {
+    if (Array.isArray(data)) {
+      return data.map(function (trace) {
+        return decodeTrace(trace, 0);
+      });
+    }
+    if (data && typeof data === "object" && Array.isArray(data.data)) {
+      return Object.assign({}, data, {
+        data: decodeData(data.data),
+        layout: decodeLayout(data.layout),
+      });
+    }
+    return decodeTrace(data, 0);
+  }
+
+  function patch(Plotly) {
+    if (!Plotly || Plotly.__typedArrays) {
+      return Plotly;
+    }
+    PATCHED.forEach(function (name) {
+      var original = Plotly[name];
+      if (typeof original !== "function") {
+        return;
+      }
+      Plotly[name] = function (gd, data) {
+        var args = Array.prototype.slice.call(arguments);
+        args[1] = decodeData(data);
+        if ((name === "newPlot" || name === "react") && args.length > 2) {
+          // newPlot(gd, data, layout), react(gd, data, layout)
+          args[2] = decodeLayout(args[2]);
+        }
+        return original.apply(this, args);
+      };
+    });
+    Plotly.__typedArrays = true;
+    return Plotly;
+  }
+
+  if (window.Plotly) {
+    patch(window.Plotly);
+    return;
+  }
+  // plotly.js is loaded on demand by dash, patch it as soon as it is defined
+  var current;
+  Object.defineProperty(window, "Plotly", {
+    configurable: true,
+    get: function () {
+      return current;
+    },
+    set: function (value) {
+      current = patch(value);
+    },
+  });
+})();
@@ -0,0 +1,27 @@
+// Images of the lite pages (apps/images.py) are answered with 503 and
+// Retry-After while they are being rendered: those are loaded again a little
+// later, a few times.
+(function () {
+  var RETRIES = 5;
+  var DELAY = 2000;
+
+  document.addEventListener(
+    "error",
+    function (event) {
+      var image = event.target;
+      if (image.tagName !== "IMG" || image.src.indexOf("/img/") === -1) {
+        return;
+      }
+      var tries = Number(image.dataset.retries || 0);
+      if (tries >= RETRIES) {
+        return;
+      }
+      image.dataset.retries = tries + 1;
+      setTimeout(function () {
+        var src = image.src.replace(/&retry=\d+$/, "");
+        image.src = src + "&retry=" + (tries + 1);
+      }, DELAY * (tries + 1));
+    },
+    true
+  );
+})();
@@ -0,0 +1,51 @@
+// Placeholders of apps/lazy.py: lists the lazy graphs within a screen of the
+// viewport that were not requested yet, for the server to fill them in.
+(function () {
+  // element id dash gives a component with a dict id
+  function stringifyId(id) {
+    var keys = Object.keys(id).sort();
+    return (
+      "{" +
+      keys
+        .map(function (key) {
+          return JSON.stringify(key) + ":" + JSON.stringify(id[key]);
+        })
+        .join(",") +
+      "}"
+    );
+  }
+
+  function nearViewport(id) {
+    var element = document.getElementById(stringifyId(id));
+    if (!element) {
+      return false;
+    }
+    var box = element.getBoundingClientRect();
+    var margin = window.innerHeight;
+    return box.top < window.innerHeight + margin && box.bottom > -margin;
+  }
+
+  window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    lazy_graph: {
+      // outputs: names to fetch now, names requested so far, poll disabled
+      visible: function (n_intervals, ids, requested) {
+        var noUpdate = window.dash_clientside.no_update;
+        var done = requested || [];
+        var batch = ids
+          .filter(function (id) {
+            return done.indexOf(id.name) === -1 && nearViewport(id);
+          })
+          .map(function (id) {
+            return id.name;
+          });
+        if (!batch.length) {
+          // nothing left to fill, e.g. a page without placeholders
+          var finished = done.length >= ids.length;
+          return [noUpdate, noUpdate, finished || noUpdate];
+        }
+        var all = done.concat(batch);
+        return [batch, all, all.length >= ids.length];
+      },
+    },
+  });
+})();
@@ -0,0 +1,57 @@
+// Clientside routing of apps/routing.py (ROUTING_MODE=client): pages are kept
+// in a dcc.Store with the version they were fetched at, and navigating to a
+// kept page whose version is still current swaps page-content without asking
+// the server.
+(function () {
+  // page last put in page-content, not redrawn when the store changes
+  var shown = null;
+
+  function pageOf(pathname, versions) {
+    return versions.pages[pathname] ? pathname : versions["default"];
+  }
+
+  window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    page_cache: {
+      // outputs: page-content children, page to fetch
+      show: function (pathname, versions, cache, request) {
+        var noUpdate = window.dash_clientside.no_update;
+        if (!versions) {
+          return [noUpdate, noUpdate];
+        }
+        var page = pageOf(pathname, versions);
+        var version = versions.pages[page];
+        var kept = cache && cache[page];
+        // the page fetched for this version is shown even when the server
+        // answered with another one, e.g. a page built since
+        var requested =
+          request && request.pathname === page && request.version === version;
+        if (kept && (kept.version === version || requested)) {
+          var key = pathname + "@" + kept.version;
+          if (shown === key) {
+            return [noUpdate, noUpdate];
+          }
+          shown = key;
+          return [kept.children, noUpdate];
+        }
+        if (requested) {
+          return [noUpdate, noUpdate];
+        }
+        return [noUpdate, { pathname: page, version: version }];
+      },
+      // the fetched page added to the kept ones, those of older versions dropped
+      keep: function (fetched, cache, versions) {
+        var kept = {};
+        Object.keys(cache || {}).forEach(function (page) {
+          if (versions && cache[page].version === versions.pages[page]) {
+            kept[page] = cache[page];
+          }
+        });
+        kept[fetched.pathname] = {
+          version: fetched.version,
+          children: fetched.children,
+        };
+        return kept;
+      },
+    },
+  });
+})();
@@ -0,0 +1,347 @@
+import argparse
+import http.client
+import json
+import os
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = pathlib.Path(__file__).parent.joinpath("..").resolve()
+RESULTS_PATH = ROOT.joinpath("benchmarks", "results")
+
+PATHNAMES = ["/apps/arxiki", "/apps/pandimia", "/apps/oikonomia", "/apps/koinwnia"]
+
+# what a browser session asks for: the index, the dash layout/dependencies and
+# the display_page callback of every page
+GET_ROUTES = ["/", "/_dash-layout", "/_dash-dependencies"]
+CALLBACK_URL = "/_dash-update-component"
+
+
+def display_page_body(pathname):
+    return json.dumps(
+        {
+            "output": "page-content.children",
+            "outputs": {"id": "page-content", "property": "children"},
+            "inputs": [{"id": "url", "property": "pathname", "value": pathname}],
+            "changedPropIds": ["url.pathname"],
+        }
+    )
+
+
+def session_requests():
+    requests = [(route, "GET", route, None) for route in GET_ROUTES]
+    for pathname in PATHNAMES:
+        requests.append(
+            (
+                "display_page " + pathname,
+                "POST",
+                CALLBACK_URL,
+                display_page_body(pathname),
+            )
+        )
+    return requests
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return None
+    index = min(int(round(q / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def summary(latencies, sizes, elapsed):
+    return {
+        "requests": len(latencies),
+        "requests_per_s": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "mean_bytes": round(statistics.mean(sizes)),
+    }
+
+
+""" SERVER """
+
+
+# kB of resident memory of a process, from /proc (linux only)
+def rss_kb(pid):
+    try:
+        status = pathlib.Path("/proc", str(pid), "status").read_text()
+    except OSError:
+        return None
+    for line in status.splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1])
+    return None
+
+
+def children(pid):
+    pids = []
+    for stat in pathlib.Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            pids.append(int(stat.parent.name))
+    return pids
+
+
+# gunicorn with the project config, on its own port
+def start_server(port, env):
+    env = dict(os.environ, PORT=str(port), DATASET_POLL_INTERVAL="0", **env)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "index:server"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            sys.exit("gunicorn exited with code {}".format(process.returncode))
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            connection.request("GET", "/_dash-layout")
+            if connection.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    sys.exit("gunicorn did not answer within 120 s")
+
+
+def worker_rss(process):
+    return {
+        "master_kb": rss_kb(process.pid),
+        "workers_kb": [rss_kb(pid) for pid in children(process.pid)],
+    }
+
+
+""" LOAD """
+
+
+def run_session(port, encoding, results, lock):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    headers = {"Accept-Encoding": encoding, "Content-Type": "application/json"}
+    for name, method, url, body in session_requests():
+        start = time.perf_counter()
+        connection.request(method, url, body=body, headers=headers)
+        response = connection.getresponse()
+        size = len(response.read())
+        latency = time.perf_counter() - start
+        if response.status != 200:
+            raise RuntimeError("{} answered {}".format(name, response.status))
+        with lock:
+            results.setdefault(name, []).append((latency, size))
+    connection.close()
+
+
+def load(port, sessions, concurrency, encoding):
+    results, lock = {}, threading.Lock()
+    # one session first, so that pages built on first visit are not measured
+    run_session(port, encoding, {}, lock)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        futures = [
+            pool.submit(run_session, port, encoding, results, lock)
+            for _ in range(sessions)
+        ]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+    routes = {
+        name: summary([l for l, _ in samples], [s for _, s in samples], elapsed)
+        for name, samples in results.items()
+    }
+    everything = [sample for samples in results.values() for sample in samples]
+    total = summary([l for l, _ in everything], [s for _, s in everything], elapsed)
+    total["sessions_per_s"] = round(sessions / elapsed, 2)
+    return {"total": total, "routes": routes}
+
+
+""" MICRO """
+
+
+# time every figure builder of the page modules, `repeat` times each; the
+# first (cold) run reads the datasets, the others hit the warm caches (but not
+# the memoized spec figures, which are cleared so that building is measured)
+def micro(repeat):
+    sys.path.insert(0, str(ROOT))
+    os.chdir(ROOT)
+    from apps import compact, figstore, registry, specs
+
+    figures = {}
+    for pathname in registry.PAGES:
+        page = registry.get_page(pathname)
+        for name, (builder, datasets) in page.figure_set.items():
+            timings = []
+            for _ in range(repeat):
+                specs.clear()
+                start = time.perf_counter()
+                figure = builder()
+                timings.append(time.perf_counter() - start)
+            # encoded as stored and sent by figstore
+            start = time.perf_counter()
+            size = len(figstore.dumps(compact.encode_figure(figure)).encode("utf-8"))
+            encode = time.perf_counter() - start
+            figures["{}:{}".format(page.module_name, name)] = {
+                "datasets": list(datasets),
+                "cold_ms": round(timings[0] * 1000, 2),
+                "warm_median_ms": round(
+                    statistics.median(timings[1:] or timings) * 1000, 2
+                ),
+                "encode_ms": round(encode * 1000, 2),
+                "json_bytes": size,
+            }
+    return {"figures": figures}
+
+
+""" RESULTS """
+
+
+def commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save(mode, result, out):
+    result = dict(
+        result,
+        mode=mode,
+        commit=commit(),
+        time=time.strftime("%Y-%m-%dT%H:%M:%S"),
+        python=platform.python_version(),
+        cpus=os.cpu_count(),
+    )
+    path = pathlib.Path(
+        out or RESULTS_PATH.joinpath("{}-{}.json".format(result["commit"], mode))
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+    print("saved {}".format(path))
+    return path
+
+
+# metrics by route (load) or by figure (micro) of a saved result
+def rows(result):
+    if result["mode"] == "load":
+        return dict(result["routes"], total=result["total"])
+    return result["figures"]
+
+
+# metrics of two saved results side by side, with the relative change
+def compare(before, after):
+    before = json.loads(pathlib.Path(before).read_text())
+    after = json.loads(pathlib.Path(after).read_text())
+    print("{} -> {}".format(before["commit"], after["commit"]))
+    new_rows = rows(after)
+    for name, old in rows(before).items():
+        new = new_rows.get(name, {})
+        print(name)
+        for metric, value in old.items():
+            if isinstance(value, (int, float)) and isinstance(
+                new.get(metric), (int, float)
+            ):
+                change = (new[metric] - value) / value * 100 if value else 0.0
+                print(
+                    "  {:<16} {:>12} {:>12} {:>+8.1f}%".format(
+                        metric, value, new[metric], change
+                    )
+                )
+
+
+def print_load(result):
+    print(
+        "{:<30} {:>8} {:>9} {:>9} {:>9} {:>10}".format(
+            "route", "req/s", "p50 ms", "p95 ms", "p99 ms", "bytes"
+        )
+    )
+    for name, metrics in dict(result["routes"], total=result["total"]).items():
+        print(
+            "{:<30} {:>8} {:>9} {:>9} {:>9} {:>10}".format(
+                name,
+                metrics["requests_per_s"],
+                metrics["p50_ms"],
+                metrics["p95_ms"],
+                metrics["p99_ms"],
+                metrics["mean_bytes"],
+            )
+        )
+    print("rss kB: {}".format(result["rss"]))
+
+
+# python benchmarks/run.py load [--sessions 200] [--concurrency 16]
+# python benchmarks/run.py micro [--repeat 5]
+# python benchmarks/run.py compare before.json after.json
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks of the dashboard")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load_parser = commands.add_parser(
+        "load", help="concurrent sessions against gunicorn"
+    )
+    load_parser.add_argument("--sessions", type=int, default=200)
+    load_parser.add_argument("--concurrency", type=int, default=16)
+    load_parser.add_argument("--port", type=int, default=8050)
+    load_parser.add_argument("--encoding", default="br, gzip", help="Accept-Encoding")
+    load_parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        help="NAME=value for the server, repeatable",
+    )
+    load_parser.add_argument("--out", help="result file")
+
+    micro_parser = commands.add_parser("micro", help="time the figure builders")
+    micro_parser.add_argument("--repeat", type=int, default=5)
+    micro_parser.add_argument("--out", help="result file")
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("before")
+    compare_parser.add_argument("after")
+
+    args = parser.parse_args()
+    if args.command == "load":
+        env = dict(item.split("=", 1) for item in args.env)
+        server = start_server(args.port, env)
+        try:
+            result = load(args.port, args.sessions, args.concurrency, args.encoding)
+            result["rss"] = worker_rss(server)
+        finally:
+            server.terminate()
+            server.wait()
+        result["config"] = {
+            "sessions": args.sessions,
+            "concurrency": args.concurrency,
+            "encoding": args.encoding,
+            "env": env,
+        }
+        print_load(result)
+        save("load", result, args.out)
+    elif args.command == "micro":
+        result = micro(args.repeat)
+        for name, metrics in result["figures"].items():
+            print(
+                "{:<28} cold {:>9} ms  warm {:>9} ms  encode {:>8} ms  {:>9} bytes".format(
+                    name,
+                    metrics["cold_ms"],
+                    metrics["warm_median_ms"],
+                    metrics["encode_ms"],
+                    metrics["json_bytes"],
+                )
+            )
+        save("micro", result, args.out)
+    else:
+        compare(args.before, args.after)
@@ -0,0 +1,267 @@
+import argparse
+import gzip
+import hashlib
+import html
+import json
+import pathlib
+import re
+import shutil
+import textwrap
+
+import plotly.offline
+
+# Connect to the app, its layout and pages
+from index import app
+from apps import assets, compact, datastore, figstore, lazy, registry, theme
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+ROOT = pathlib.Path(__file__).parent
+ASSETS_PATH = ROOT.joinpath("assets")
+OUT_PATH = ROOT.joinpath("build", "static")
+
+# code of the pages, a change re-exports them all
+SOURCES = ("app.py", "index.py", "export.py", "apps/*.py")
+
+VOID_TAGS = {"br", "hr", "img", "input", "source"}
+# components left out: the invisible ones and the controls, which drive
+# callbacks a static page does not have
+SKIPPED = {
+    "Location",
+    "Interval",
+    "Store",
+    "DatePickerRange",
+    "Dropdown",
+    "RadioItems",
+    "Checklist",
+    "Slider",
+    "RangeSlider",
+}
+# dash property -> html attribute
+ATTRIBUTES = {
+    "href": "href",
+    "src": "src",
+    "srcSet": "srcset",
+    "type": "type",
+    "className": "class",
+}
+PIXEL_PROPERTIES = {"font-size", "height", "width", "margin", "padding"}
+
+GRAPH_SCRIPT = """
+document.querySelectorAll("script[data-graph]").forEach(function (data) {
+  var figure = JSON.parse(data.textContent);
+  Plotly.newPlot(data.dataset.graph, figure.data, figure.layout, {responsive: true});
+});
+"""
+
+
+""" RENDERING """
+
+
+def style_css(style):
+    declarations = []
+    for key, value in (style or {}).items():
+        key = re.sub(r"(?<!^)([A-Z])", r"-\1", key).lower()
+        if isinstance(value, (int, float)) and key in PIXEL_PROPERTIES:
+            value = "{}px".format(value)
+        declarations.append("{}: {}".format(key, value))
+    return "; ".join(declarations)
+
+
+# the bold/italic subset of markdown the pages use
+def markdown_html(text):
+    paragraphs = re.split(r"\n\s*\n", textwrap.dedent(text or "").strip())
+    rendered = []
+    for paragraph in paragraphs:
+        paragraph = html.escape(" ".join(paragraph.split()), quote=False)
+        paragraph = re.sub(
+            r"\*\*\*(.+?)\*\*\*", r"<strong><em>\1</em></strong>", paragraph
+        )
+        paragraph = re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", paragraph)
+        rendered.append("<p>{}</p>".format(paragraph))
+    return "".join(rendered)
+
+
+def attributes(props, **extra):
+    attrs = dict(extra)
+    if props.get("style"):
+        attrs["style"] = style_css(props["style"])
+    for name, attribute in ATTRIBUTES.items():
+        if props.get(name):
+            attrs[attribute] = props[name]
+    return "".join(
+        ' {}="{}"'.format(name, html.escape(str(value)))
+        for name, value in attrs.items()
+    )
+
+
+# html for a component tree in its JSON form; graphs are collected as
+# (element id, figstore.Blob) to be plotted by GRAPH_SCRIPT
+def render(node, graphs):
+    if node is None:
+        return ""
+    if isinstance(node, (list, tuple)):
+        return "".join(render(child, graphs) for child in node)
+    if not isinstance(node, dict):
+        return html.escape(str(node), quote=False)
+    kind, props = node["type"], node.get("props", {})
+    if kind == "Graph":
+        element_id = "graph-{}".format(len(graphs))
+        blob = figstore.from_ref(props.get("figure"))
+        if blob is None and lazy.is_lazy(props.get("id")):
+            # static pages have no callbacks, lazy graphs are exported filled in
+            graph_id = props["id"]
+            blob = registry.get_page(graph_id["page"]).figures()[graph_id["name"]]
+        graphs.append((element_id, blob))
+        return "<div{}></div>".format(attributes(props, id=element_id))
+    if kind == "Markdown":
+        return "<div{}>{}</div>".format(
+            attributes(props), markdown_html(props.get("children"))
+        )
+    if kind in SKIPPED:
+        return ""
+    tag = "a" if kind == "Link" else kind.lower()
+    if tag in VOID_TAGS:
+        return "<{}{}>".format(tag, attributes(props))
+    return "<{0}{1}>{2}</{0}>".format(
+        tag, attributes(props), render(props.get("children"), graphs)
+    )
+
+
+# figure JSON inside a <script> element
+def script_json(data):
+    return bytes(data).decode("utf-8").replace("</", "<\\/")
+
+
+def page_html(page, plotly_js):
+    figures = {name: blob.ref for name, blob in page.figures().items()}
+    children = json.loads(figstore.dumps(page.module.make_layout(figures)))
+    layout = app.layout() if callable(app.layout) else app.layout
+    shell = json.loads(figstore.dumps(layout))
+    for child in shell["props"]["children"]:
+        if child["props"].get("id") == "page-content":
+            child["props"]["children"] = children
+    graphs = []
+    body = render(shell, graphs)
+    data = "".join(
+        '<script type="application/json" data-graph="{}">{}</script>'.format(
+            element_id, script_json(blob.json)
+        )
+        for element_id, blob in graphs
+    )
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n"
+        '<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1.0">\n'
+        "<title>{title}</title>\n"
+        '<link rel="icon" href="{favicon}">\n'
+        '<link rel="stylesheet" href="{stylesheet}">\n'
+        "{plotly}\n</head>\n<body>\n{body}\n{data}\n"
+        "{templates}\n<script>{decode}</script>\n<script>{script}</script>\n"
+        "</body>\n</html>\n"
+    ).format(
+        title=html.escape(app.title),
+        favicon=assets.url("favicon.ico", "/assets/favicon.ico"),
+        stylesheet=assets.url("bWLwgP.css", "/assets/bWLwgP.css"),
+        plotly=plotly_js,
+        body=body,
+        data=data,
+        # the templates and typed arrays of the figures, decoded for plotly.js
+        templates=theme.script(),
+        decode=ASSETS_PATH.joinpath("figure_decode.js").read_text(),
+        script=GRAPH_SCRIPT,
+    )
+
+
+""" OUTPUT """
+
+
+# write a file together with its precompressed .gz/.br siblings
+def write(path, data):
+    if path.exists() and path.read_bytes() == data:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    path.with_name(path.name + ".gz").write_bytes(gzip.compress(data, 9))
+    if brotli is not None:
+        path.with_name(path.name + ".br").write_bytes(brotli.compress(data))
+
+
+def page_dir(out, pathname):
+    return out.joinpath(*pathname.strip("/").split("/"))
+
+
+# pages are exported again only when their code or datasets changed
+def fingerprint(page):
+    digest = hashlib.sha1()
+    for path in sorted(path for pattern in SOURCES for path in ROOT.glob(pattern)):
+        digest.update(path.read_bytes())
+    datasets = sorted({d for _, deps in page.figure_set.values() for d in deps})
+    for name in datasets:
+        digest.update("{}={}".format(name, datastore.version(name)).encode())
+    return digest.hexdigest()
+
+
+def export(out=OUT_PATH, inline=False, force=False):
+    out = pathlib.Path(out)
+    manifest_path = out.joinpath("manifest.json")
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError):
+        manifest = {}
+
+    shutil.copytree(ASSETS_PATH, out.joinpath("assets"), dirs_exist_ok=True)
+    if assets.manifest:
+        shutil.copytree(
+            assets.BUILD_PATH,
+            out.joinpath(assets.URL_PREFIX.strip("/")),
+            dirs_exist_ok=True,
+        )
+    if inline:
+        plotly_js = "<script>{}</script>".format(plotly.offline.get_plotlyjs())
+    else:
+        write(out.joinpath("plotly.min.js"), plotly.offline.get_plotlyjs().encode())
+        plotly_js = '<script src="/plotly.min.js"></script>'
+
+    for pathname, page in registry.pages.items():
+        # the lite pages only swap interactive graphs for images, which a
+        # static page has no use for
+        if isinstance(page, registry.LitePage):
+            continue
+        target = page_dir(out, pathname)
+        key = fingerprint(page) + (":inline" if inline else "")
+        if not force and manifest.get(pathname) == key and target.exists():
+            print("{}: unchanged".format(pathname))
+            continue
+        document = page_html(page, plotly_js).encode("utf-8")
+        write(target.joinpath("index.html"), document)
+        # plain plotly JSON for other consumers: the page itself keeps the
+        # compact encoding, decoded by figure_decode.js
+        for name, blob in page.figures().items():
+            figure = figstore.dumps(compact.decode_figure(blob.value))
+            write(target.joinpath("figures", name + ".json"), figure.encode("utf-8"))
+        if pathname == registry.DEFAULT_PAGE:
+            write(out.joinpath("index.html"), document)
+        manifest[pathname] = key
+        print("{}: {} bytes".format(pathname, len(document)))
+
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+
+
+# python export.py [--out build/static] [--inline] [--force]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Export every page as static, precompressed HTML"
+    )
+    parser.add_argument("--out", default=OUT_PATH, help="output folder")
+    parser.add_argument(
+        "--inline", action="store_true", help="inline plotly.js into every page"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="export unchanged pages too"
+    )
+    args = parser.parse_args()
+    export(args.out, inline=args.inline, force=args.force)
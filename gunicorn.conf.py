@@ -0,0 +1,48 @@
+import multiprocessing
+import os
+
+# gunicorn settings (gunicorn -c gunicorn.conf.py index:server); every value
+# can be changed through the environment variable next to it
+
+bind = "0.0.0.0:{}".format(os.environ.get("PORT", 8000))
+
+# gthread: a few threads per worker, so a slow client holds a thread and not a
+# whole worker; gevent: many connections per worker, when gevent is installed
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+if worker_class == "gevent":
+    try:
+        from gevent import monkey
+    except ImportError:
+        worker_class = "gthread"
+    else:
+        # patched before the app is preloaded, not after the fork
+        monkey.patch_all()
+
+cpus = multiprocessing.cpu_count()
+workers = int(os.environ.get("WEB_CONCURRENCY", cpus))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", 1000))
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+
+# the app is imported once in the master and its figures built there, the
+# forked workers share them (copy-on-write) instead of building their own
+preload_app = True
+os.environ.setdefault("DASH_WARMUP", "all")
+
+
+def when_ready(server):
+    from apps import watcher
+
+    # each worker watches the datasets and rebuilds its own copy of the figures
+    watcher.stop()
+    server.log.info(
+        "%s %s worker(s), %s thread(s) each", workers, worker_class, threads
+    )
+
+
+def post_fork(server, worker):
+    from apps import watcher
+
+    watcher.start()
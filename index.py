@@ -1,3 +1,8 @@
+# startup timings and memory when DASH_PROFILE is set, from the first import on
+from apps import profiling
+
+profiling.start()
+
 import dash_core_components as dcc
 import dash_html_components as html
 from dash.dependencies import Input, Output
@@ -6,40 +11,58 @@ from dash.dependencies import Input, Output
 from app import app
 from app import server
 
+# Connect to app pages, built lazily on first visit
+from apps import figstore, registry, routing, watcher
+
+# pages with callbacks of their own are imported up front, their figures are
+# still built on first visit; lazy holds the callbacks of the lazy graphs
+from apps import lazy, pandimia
+
+
+# the index layout; in client routing mode it carries the current page
+# versions, so it is made again for every visitor
+def serve_layout():
+    return html.Div(
+        [
+            dcc.Location(id="url", refresh=False),
+            html.Div(
+                [
+                    dcc.Link("Αρχική  |  ", href="/apps/arxiki"),
+                    dcc.Link("Εξέλιξη Πανδημίας  |  ", href="/apps/pandimia"),
+                    dcc.Link("Οικονομία  |  ", href="/apps/oikonomia"),
+                    dcc.Link("Κοινωνία", href="/apps/koinwnia"),
+                ],
+                className="row",
+            ),
+            html.Div(id="page-content", children=[]),
+        ]
+        + routing.controls()
+    )
+
+
+if routing.CLIENT:
+    app.layout = serve_layout
+    # pages fetched once per version and kept in the browser
+    routing.init_app(app)
+else:
+    app.layout = serve_layout()
+
+    # navigation is answered with the pre-encoded page response
+    @figstore.encoded_callback(
+        app, Output("page-content", "children"), [Input("url", "pathname")]
+    )
+    def display_page(pathname):
+        return registry.get_page(pathname).response()
+
+
+# optional warm-up of the page figures (DASH_WARMUP=all or a list of pathnames)
+registry.warm_up_from_env()
+
+# startup report under build/profile when DASH_PROFILE is set
+profiling.finish()
 
-# Connect to app pages
-from apps import arxiki, koinwnia, oikonomia, pandimia
-
-
-app.layout = html.Div(
-    [
-        dcc.Location(id="url", refresh=False),
-        html.Div(
-            [
-                dcc.Link("Αρχική  |  ", href="/apps/arxiki"),
-                dcc.Link("Εξέλιξη Πανδημίας  |  ", href="/apps/pandimia"),
-                dcc.Link("Οικονομία  |  ", href="/apps/oikonomia"),
-                dcc.Link("Κοινωνία", href="/apps/koinwnia"),
-            ],
-            className="row",
-        ),
-        html.Div(id="page-content", children=[]),
-    ]
-)
-
-
-@app.callback(Output("page-content", "children"), [Input("url", "pathname")])
-def display_page(pathname):
-    if pathname == "/apps/arxiki":
-        return arxiki.layout
-    if pathname == "/apps/pandimia":
-        return pandimia.layout
-    if pathname == "/apps/oikonomia":
-        return oikonomia.layout
-    if pathname == "/apps/koinwnia":
-        return koinwnia.layout
-    else:
-        return arxiki.layout
+# rebuild figures when their datasets change (DATASET_POLL_INTERVAL seconds)
+watcher.start()
 
 
 if __name__ == "__main__":